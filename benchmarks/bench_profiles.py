@@ -0,0 +1,38 @@
+"""Time every extraction profile over the sample PDFs in ``inputs/``.
+
+Usage: python -m benchmarks.bench_profiles [folder] [--repeat N]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from edo_parser.infrastructure.extraction_profiles import PROFILES
+from reader.pdf_reader import PDFReader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction profiles.")
+    parser.add_argument("folder", nargs="?", default="inputs")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    files = sorted(p for p in Path(args.folder).iterdir() if p.suffix.lower() == ".pdf")
+    payloads = [p.read_bytes() for p in files]
+    reader = PDFReader()
+
+    print(f"{len(files)} files x {args.repeat} runs")
+    print(f"{'profile':<10}{'ms/doc':>10}{'chars/doc':>12}")
+    for name in PROFILES:
+        chars = 0
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            for data in payloads:
+                chars += len(reader.read_bytes(data, profile=name))
+        elapsed = time.perf_counter() - started
+        runs = len(payloads) * args.repeat
+        print(f"{name:<10}{elapsed / runs * 1000:>10.2f}{chars // runs:>12}")
+
+
+if __name__ == "__main__":
+    main()
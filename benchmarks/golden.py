@@ -0,0 +1,195 @@
+"""Check extraction against the golden corpus and time it per carrier.
+
+Every sample PDF in ``inputs/`` has its expected normalized records in
+``benchmarks/golden/<file name>.json``. Each run reads the files once, then
+parses every document ``--repeat`` times (segmentation, strategy selection,
+extraction), normalizes the records, diffs them field by field against the
+golden copy and writes one report with the per-carrier latency.
+
+    python -m benchmarks.golden                     # check + report
+    python -m benchmarks.golden --update            # (re)write the golden files
+    python -m benchmarks.golden --against old.json  # also gate on latency
+
+With ``--against`` (a report saved from the code before a change) the run
+fails unless every document is output-identical and no carrier got slower
+than ``--tolerance`` allows, so an optimized path is only accepted when it is
+both faster and unchanged.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from extractor.normalizer import Normalizer
+from extractor.segmenter import DocumentSegment, DocumentSegmenter, merge_records, parse_segment
+from extractor.strategy_factory import StrategyFactory
+from reader.pdf_reader import PDFReader
+from strategy.plugins import builtin_manifest, verify_manifest
+from utils.spatial_index import SpatialIndex
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+DEFAULT_REPORT = Path("bench_output.json")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Golden-corpus accuracy and latency check.")
+    parser.add_argument("folder", nargs="?", default="inputs")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--layout", action="store_true", help="Parse with the word layout (anchor lookups).")
+    parser.add_argument("--update", action="store_true", help="Write the current output as the golden records.")
+    parser.add_argument("--report", default=str(DEFAULT_REPORT), help="Where to write the JSON report.")
+    parser.add_argument("--against", default=None, help="Earlier report to compare per-carrier latency with.")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Allowed slowdown per carrier (0.05 = 5%%).")
+    args = parser.parse_args()
+
+    files = sorted(p for p in Path(args.folder).iterdir() if p.suffix.lower() == ".pdf")
+    reader = PDFReader()
+    segmenter = DocumentSegmenter()
+    documents = []
+    for path in files:
+        data = path.read_bytes()
+        segments = [s for s in segmenter.split(reader.read_pages_bytes(data)) if s.text]
+        layout = reader.read_layout_bytes(data) if args.layout else None
+        documents.append((path, segments, layout))
+
+    if args.update:
+        GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+        for path, segments, layout in documents:
+            _, records = _parse(segments, layout)
+            payload = {"file": path.name, "carriers": _carriers(segments), "records": Normalizer.apply(records)}
+            _golden_path(path).write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"[OK] wrote {len(documents)} golden files to {GOLDEN_DIR}")
+        return 0
+
+    report = run(documents, repeat=max(args.repeat, 1))
+    # Matching reads the manifest, so a keyword edited only in the class is ignored.
+    report["manifest_drift"] = verify_manifest(builtin_manifest())
+    for problem in report["manifest_drift"]:
+        print(f"[ERROR] {problem}")
+    failed = report["mismatches"] > 0 or bool(report["manifest_drift"])
+    if args.against:
+        report["regressions"] = compare(report, json.loads(Path(args.against).read_text(encoding="utf-8")), args.tolerance)
+        failed = failed or bool(report["regressions"])
+    Path(args.report).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    _print_report(report)
+    print(f"report written to {args.report}")
+    return 1 if failed else 0
+
+
+def run(documents: List[tuple], repeat: int) -> Dict[str, Any]:
+    """Parse, diff and time every ``(path, segments, layout)``; returns the report."""
+    files: Dict[str, Any] = {}
+    carriers: Dict[str, Dict[str, Any]] = {}
+    mismatches = 0
+    for path, segments, layout in documents:
+        carrier = "+".join(_carriers(segments)) or "none"
+        seconds = 0.0
+        records: List[Dict[str, str]] = []
+        for _ in range(repeat):
+            elapsed, records = _parse(segments, layout)
+            seconds += elapsed
+        actual = Normalizer.apply(records)
+        expected = _load_golden(path)
+        diffs = diff_records(expected, actual) if expected is not None else [{"error": "no golden file"}]
+        mismatches += 1 if diffs else 0
+        mean_ms = seconds * 1000 / repeat
+        files[path.name] = {"carrier": carrier, "mean_ms": round(mean_ms, 3), "identical": not diffs, "diffs": diffs}
+        stats = carriers.setdefault(carrier, {"documents": 0, "total_ms": 0.0})
+        stats["documents"] += 1
+        stats["total_ms"] += mean_ms
+    for stats in carriers.values():
+        stats["mean_ms"] = round(stats["total_ms"] / stats["documents"], 3)
+        stats["total_ms"] = round(stats["total_ms"], 3)
+    return {
+        "documents": len(documents),
+        "repeat": repeat,
+        "mismatches": mismatches,
+        "carriers": dict(sorted(carriers.items())),
+        "files": files,
+    }
+
+
+def diff_records(expected: Dict[str, Any], actual: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Field-level differences between the golden records and ``actual``."""
+    wanted: List[Dict[str, str]] = expected.get("records") or []
+    diffs: List[Dict[str, Any]] = []
+    if len(wanted) != len(actual):
+        diffs.append({"field": "(records)", "expected": len(wanted), "actual": len(actual)})
+    for index, (want, got) in enumerate(zip(wanted, actual)):
+        for field in sorted(set(want) | set(got)):
+            if want.get(field) != got.get(field):
+                diffs.append({"record": index, "field": field, "expected": want.get(field), "actual": got.get(field)})
+    return diffs
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Carriers whose mean latency grew by more than ``tolerance`` over ``baseline``."""
+    regressions: List[Dict[str, Any]] = []
+    for carrier, stats in report["carriers"].items():
+        before = (baseline.get("carriers") or {}).get(carrier)
+        if not before or not before.get("mean_ms"):
+            continue
+        ratio = stats["mean_ms"] / before["mean_ms"]
+        stats["speedup"] = round(1 / ratio, 3) if ratio else None
+        if ratio > 1 + tolerance:
+            regressions.append({"carrier": carrier, "before_ms": before["mean_ms"], "after_ms": stats["mean_ms"]})
+    return regressions
+
+
+# ---------------- internal helpers ----------------
+
+
+def _parse(segments: List[DocumentSegment], layout: Optional[SpatialIndex]) -> tuple:
+    """Same path as ``parse_segments`` without an executor, timed."""
+    started = time.perf_counter()
+    results = [
+        parse_segment(s.text, layout.for_pages(s.start_page, s.stop_page) if layout is not None else None)
+        for s in segments
+    ]
+    records = results[0] if len(results) == 1 else merge_records(results)
+    return time.perf_counter() - started, records
+
+
+def _carriers(segments: List[DocumentSegment]) -> List[str]:
+    names: List[str] = []
+    for segment in segments:
+        name = StrategyFactory.match_first(segment.text).name
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def _golden_path(pdf: Path) -> Path:
+    return GOLDEN_DIR / f"{pdf.name}.json"
+
+
+def _load_golden(pdf: Path) -> Optional[Dict[str, Any]]:
+    path = _golden_path(pdf)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"{report['documents']} files x {report['repeat']} runs")
+    print(f"{'carrier':<14}{'docs':>6}{'ms/doc':>10}{'speedup':>10}")
+    for carrier, stats in report["carriers"].items():
+        speedup = f"{stats['speedup']:.2f}x" if stats.get("speedup") else "-"
+        print(f"{carrier:<14}{stats['documents']:>6}{stats['mean_ms']:>10.3f}{speedup:>10}")
+    for name, entry in report["files"].items():
+        if not entry["identical"]:
+            print(f"[ERROR] {name}: {len(entry['diffs'])} field difference(s)")
+            for diff in entry["diffs"][:5]:
+                print(f"        {diff}")
+    for regression in report.get("regressions", []):
+        print(f"[SLOW] {regression['carrier']}: {regression['before_ms']} ms -> {regression['after_ms']} ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
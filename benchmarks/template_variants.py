@@ -0,0 +1,110 @@
+"""Check that the template cache routes documents to the right strategy.
+
+For every sample PDF in ``inputs/`` the text is rewritten into same-layout
+variants with every digit randomized (new containers, PINs, dates). The
+cache learns the original and is looked up with each variant: the layout
+should be recognised, and the remembered strategy must be the one normal
+selection picks. Then every document is looked up as if its fingerprint had
+been learned from each other carrier (a collision): StrategyFactory.remembered
+must refuse a carrier whose keywords are not in the document.
+
+    python -m benchmarks.template_variants            # exits 1 on a wrong route
+    python -m benchmarks.template_variants --digits 5 # more randomized copies
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from extractor.segmenter import DocumentSegmenter
+from extractor.strategy_factory import StrategyFactory
+from extractor.template_cache import TemplateCache
+from reader.pdf_reader import PDFReader
+from strategy.plugins import builtin_manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Template cache routing on same-layout variants and collisions.")
+    parser.add_argument("folder", nargs="?", default="inputs")
+    parser.add_argument("--digits", type=int, default=3, help="Digit-randomized copies per document.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    reader = PDFReader()
+    segmenter = DocumentSegmenter()
+    texts: List[Tuple[str, str]] = []
+    for path in sorted(p for p in Path(args.folder).iterdir() if p.suffix.lower() == ".pdf"):
+        for index, segment in enumerate(segmenter.split(reader.read_pages_bytes(path.read_bytes()))):
+            if segment.text:
+                texts.append((f"{path.name}#{index}", segment.text))
+
+    report = run(texts, digits=args.digits, seed=args.seed)
+    print(
+        f"{report['documents']} documents, {report['lookups']} variant lookups: {report['hits']} hits, "
+        f"{report['misses']} misses; {report['collisions']} simulated collisions, "
+        f"{report['refused']} refused; {len(report['wrong'])} wrong"
+    )
+    for wrong in report["wrong"][:20]:
+        print(
+            f"[ERROR] {wrong['document']} ({wrong['case']}): "
+            f"routed to {wrong['routed']}, selection picks {wrong['selected']}"
+        )
+    return 1 if report["wrong"] else 0
+
+
+def run(texts: List[Tuple[str, str]], digits: int = 3, seed: int = 7) -> Dict[str, Any]:
+    """Variant lookups and simulated collisions for every text; collect routes selection would not take."""
+    rng = random.Random(seed)
+    carriers = [entry.name for entry in builtin_manifest()]
+    lookups = hits = misses = collisions = refused = 0
+    wrong: List[Dict[str, str]] = []
+    for name, text in texts:
+        selected = StrategyFactory.match_first(text).name
+        cache = TemplateCache(None)
+        cache.learn(text, selected)
+        for index in range(digits):
+            variant = "".join(rng.choice("0123456789") if c.isdigit() else c for c in text)
+            lookups += 1
+            _, known = cache.lookup(variant)
+            routed = StrategyFactory.remembered(known, variant) if known else None
+            if routed is None:
+                misses += 1
+                continue
+            hits += 1
+            if routed.name != StrategyFactory.match_first(variant).name:
+                wrong.append({"document": name, "case": f"digits{index}", "routed": routed.name, "selected": selected})
+        for other in carriers:
+            if other == selected:
+                continue
+            collisions += 1
+            routed = StrategyFactory.remembered(other, text)
+            if routed is None:
+                refused += 1
+            elif not _names_carrier(routed, text):
+                wrong.append({"document": name, "case": "collision", "routed": routed.name, "selected": selected})
+    return {
+        "documents": len(texts),
+        "lookups": lookups,
+        "hits": hits,
+        "misses": misses,
+        "collisions": collisions,
+        "refused": refused,
+        "wrong": wrong,
+    }
+
+
+# ---------------- internal helpers ----------------
+
+
+def _names_carrier(strategy, text: str) -> bool:
+    # A collision may only route to a carrier the document itself names.
+    upper = text.upper()
+    return any(keyword.upper() in upper for keyword in strategy.keywords)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,9 @@
 """EDO parser package."""
 
+from edo_parser.core.batch import BatchRun, BatchStats
+from edo_parser.infrastructure.text_cache import TextCache
+from edo_parser.readers.cached_reader import CachingDocumentReader
 from edo_parser.readers.factory import DocumentReaderFactory
 from edo_parser.readers.pdf_reader import PdfDocumentReader
 
-__all__ = ["DocumentReaderFactory", "PdfDocumentReader"]
+__all__ = ["BatchRun", "BatchStats", "CachingDocumentReader", "DocumentReaderFactory", "PdfDocumentReader", "TextCache"]
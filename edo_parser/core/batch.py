@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Generic, Iterable, Iterator, Optional, TypeVar, Union
+
+T = TypeVar("T")
+E = TypeVar("E", bound=Exception)
+
+
+@dataclass
+class BatchStats:
+    """Aggregate throughput of one batch run (updated while results stream in)."""
+
+    documents: int = 0
+    failures: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return self.documents - self.failures
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.documents} docs ({self.failures} failed) in {self.elapsed_seconds:.2f}s"
+            f" = {self.docs_per_second:.1f} docs/s"
+        )
+
+
+class BatchRun(Generic[T, E]):
+    """Iterates per-document results in completion order; errors are yielded, not raised.
+
+    Work is submitted to ``executor`` when given (the caller owns it), otherwise
+    to a private thread pool, or a process pool with ``processes=True`` (the
+    callable must then be picklable). ``stats`` reflects everything yielded so far.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[Path], T],
+        sources: Iterable[Path],
+        to_error: Callable[[Path, Exception], E],
+        *,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        processes: bool = False,
+    ):
+        self._fn = fn
+        self._sources = [Path(source) for source in sources]
+        self._to_error = to_error
+        self._executor = executor
+        self._max_workers = max_workers
+        self._processes = processes
+        self._lock = threading.Lock()
+        self.stats = BatchStats()
+        self._results = self._run()
+
+    def __iter__(self) -> Iterator[Union[T, E]]:
+        return self._results
+
+    def __next__(self) -> Union[T, E]:
+        return next(self._results)
+
+    def _run(self) -> Iterator[Union[T, E]]:
+        if not self._sources:
+            return
+        owned = self._executor is None
+        if owned:
+            pool_type = ProcessPoolExecutor if self._processes else ThreadPoolExecutor
+            executor: Executor = pool_type(max_workers=self._max_workers)
+        else:
+            executor = self._executor  # type: ignore[assignment]
+
+        started = time.perf_counter()
+        futures: Dict[Future, Path] = {}
+        try:
+            futures = {executor.submit(self._fn, source): source for source in self._sources}
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    result: Union[T, E] = future.result()
+                    failed = False
+                except Exception as exc:
+                    result = self._to_error(source, exc)
+                    failed = True
+                with self._lock:
+                    self.stats.documents += 1
+                    self.stats.failures += int(failed)
+                    self.stats.elapsed_seconds = time.perf_counter() - started
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
+            if owned:
+                executor.shutdown(wait=True)
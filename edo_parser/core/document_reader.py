@@ -3,6 +3,11 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from edo_parser.core.batch import BatchRun
 
 
 @dataclass(frozen=True)
@@ -16,10 +21,21 @@ class DocumentContent:
 class DocumentReadError(RuntimeError):
     """Raised when a document cannot be read or parsed."""
 
+    #: Set on errors collected by ``read_many`` so each one names its document.
+    source: Optional[Path] = None
+
+
+class ImageOnlyDocumentError(DocumentReadError):
+    """Raised when a document has no text layer (e.g. a scan) and needs OCR."""
+
 
 class DocumentReader(ABC):
     """Base contract for document readers."""
 
+    #: Sniffed content types (e.g. "application/pdf") this reader handles;
+    #: lets DocumentReaderFactory dispatch without calling ``supports``.
+    content_types: Tuple[str, ...] = ()
+
     @abstractmethod
     def read(self, source: Path) -> DocumentContent:
         """Extract raw text from the given document path."""
@@ -27,3 +43,36 @@ class DocumentReader(ABC):
     @abstractmethod
     def supports(self, source: Path) -> bool:
         """Return True when the reader can handle the given file."""
+
+    def read_many(
+        self,
+        sources: Iterable[Path],
+        *,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        processes: bool = False,
+    ) -> "BatchRun[DocumentContent, DocumentReadError]":
+        """Read many documents concurrently, yielding results as they complete.
+
+        Failures are yielded as ``DocumentReadError`` values (with ``source``
+        set) instead of aborting the batch; ``.stats`` on the returned run
+        reports aggregate throughput.
+        """
+        from edo_parser.core.batch import BatchRun
+
+        return BatchRun(
+            self.read,
+            sources,
+            _as_read_error,
+            executor=executor,
+            max_workers=max_workers,
+            processes=processes,
+        )
+
+
+def _as_read_error(source: Path, exc: Exception) -> DocumentReadError:
+    error = exc if isinstance(exc, DocumentReadError) else DocumentReadError(f"Failed to read {source}: {exc}")
+    if error is not exc:
+        error.__cause__ = exc
+    error.source = source
+    return error
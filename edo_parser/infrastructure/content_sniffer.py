@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+PDF = "application/pdf"
+PNG = "image/png"
+JPEG = "image/jpeg"
+TIFF = "image/tiff"
+GIF = "image/gif"
+ZIP = "application/zip"
+OLE = "application/x-ole-storage"
+EMAIL = "message/rfc822"
+
+# Header signatures checked at offset 0, most common first.
+_SIGNATURES: Tuple[Tuple[bytes, str], ...] = (
+    (b"%PDF-", PDF),
+    (b"\x89PNG\r\n\x1a\n", PNG),
+    (b"\xff\xd8\xff", JPEG),
+    (b"II*\x00", TIFF),
+    (b"MM\x00*", TIFF),
+    (b"GIF87a", GIF),
+    (b"GIF89a", GIF),
+    (b"PK\x03\x04", ZIP),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", OLE),
+)
+_EMAIL_HEADERS = (b"received:", b"from:", b"return-path:", b"mime-version:", b"message-id:", b"delivered-to:")
+
+# Used only when the header cannot be read (missing or empty file).
+SUFFIX_TYPES: Dict[str, str] = {
+    ".pdf": PDF,
+    ".png": PNG,
+    ".jpg": JPEG,
+    ".jpeg": JPEG,
+    ".tif": TIFF,
+    ".tiff": TIFF,
+    ".gif": GIF,
+    ".eml": EMAIL,
+    ".msg": OLE,
+}
+
+HEADER_BYTES = 1024
+
+
+def sniff_bytes(head: bytes) -> Optional[str]:
+    """Content type from the first bytes of a file, or None when unknown."""
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    # Acrobat accepts "%PDF-" anywhere in the first 1024 bytes (junk before the header).
+    if b"%PDF-" in head[:HEADER_BYTES]:
+        return PDF
+    first_line = head.lstrip().split(b"\n", 1)[0].lower()
+    if first_line.startswith(_EMAIL_HEADERS):
+        return EMAIL
+    return None
+
+
+def sniff_content_type(source: Path) -> Optional[str]:
+    """Sniff ``source`` by its header bytes; the suffix decides only when there are none."""
+    path = Path(source)
+    try:
+        with path.open("rb") as stream:
+            head = stream.read(HEADER_BYTES)
+    except OSError:
+        head = b""
+    if not head:
+        return SUFFIX_TYPES.get(path.suffix.lower())
+    return sniff_bytes(head)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    """Named set of PyMuPDF ``get_text`` options.
+
+    ``flags`` lists PyMuPDF ``TEXT_*`` constant names; ``None`` keeps the toolkit
+    defaults. ``max_pages`` and ``clip_top`` (fraction of the page height, from
+    the top) narrow the area that is decoded at all.
+    """
+
+    name: str
+    mode: str = "text"
+    flags: Optional[Tuple[str, ...]] = None
+    sort: bool = False
+    max_pages: Optional[int] = None
+    clip_top: Optional[float] = None
+
+    def page_text(self, page: Any) -> str:
+        """Extract one page according to this profile."""
+        options: Dict[str, Any] = {"sort": self.sort}
+        flags = self._resolve_flags()
+        if flags is not None:
+            options["flags"] = flags
+        if self.clip_top is not None:
+            rect = page.rect
+            options["clip"] = (rect.x0, rect.y0, rect.x1, rect.y0 + rect.height * self.clip_top)
+
+        if self.mode == "words":
+            return self._join_words(page.get_text("words", **options))
+        return page.get_text("text", **options)
+
+    def _resolve_flags(self) -> Optional[int]:
+        if self.flags is None:
+            return None
+        import fitz  # PyMuPDF
+
+        value = 0
+        for flag in self.flags:
+            value |= getattr(fitz, flag)
+        return value
+
+    @staticmethod
+    def _join_words(words: List[tuple]) -> str:
+        """Rebuild text lines from ``(x0, y0, x1, y1, word, block, line, word_no)`` tuples."""
+        lines: Dict[Tuple[int, int], List[tuple]] = {}
+        for word in words:
+            lines.setdefault((word[5], word[6]), []).append(word)
+        ordered = sorted(lines.values(), key=lambda ws: (round(min(w[1] for w in ws)), min(w[0] for w in ws)))
+        return "\n".join(" ".join(w[4] for w in sorted(ws, key=lambda w: w[0])) for ws in ordered)
+
+
+PROFILES: Dict[str, ExtractionProfile] = {
+    # PyMuPDF defaults; what the readers have always used.
+    "default": ExtractionProfile("default"),
+    # Header of page 1 only, minimal flags; enough to identify the carrier.
+    "fast": ExtractionProfile("fast", flags=("TEXT_MEDIABOX_CLIP",), max_pages=1, clip_top=0.4),
+    # Reading order rebuilt from coordinates for multi-column templates.
+    "layout": ExtractionProfile("layout", flags=("TEXT_MEDIABOX_CLIP",), sort=True),
+    # One text line per PDF line, rebuilt from word boxes for layout-aware strategies.
+    "words": ExtractionProfile("words", mode="words", flags=("TEXT_MEDIABOX_CLIP",)),
+}
+
+
+def get_profile(profile: "str | ExtractionProfile | None") -> ExtractionProfile:
+    if profile is None:
+        return PROFILES["default"]
+    if isinstance(profile, ExtractionProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError as exc:
+        raise ValueError(f"Unknown extraction profile: {profile}") from exc
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+def fitz_document_is_image_only(doc: Any) -> bool:
+    """Return True when no page of a PyMuPDF document references a font.
+
+    Only the page resource dictionaries are inspected, nothing is decoded, so
+    this costs well under a millisecond even for multi-page scans. A page
+    without font resources has no text layer, whatever images it carries.
+    """
+    for page in doc:
+        if page.get_fonts():
+            return False
+    return True
+
+
+def pypdf_reader_is_image_only(reader: Any) -> bool:
+    """PyPDF2 counterpart of ``fitz_document_is_image_only``."""
+    for page in reader.pages:
+        if _resources_have_fonts(page.get("/Resources"), depth=0):
+            return False
+    return True
+
+
+def _resources_have_fonts(resources: Any, *, depth: int) -> bool:
+    if resources is None:
+        return False
+    resources = resources.get_object()
+    if resources.get("/Font"):
+        return True
+    if depth >= 2:
+        return False
+    xobjects = resources.get("/XObject")
+    if not xobjects:
+        return False
+    for ref in xobjects.get_object().values():
+        xobject = ref.get_object()
+        if xobject.get("/Subtype") == "/Form" and _resources_have_fonts(xobject.get("/Resources"), depth=depth + 1):
+            return True
+    return False
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_DIR = Path(".cache") / "text"
+
+
+class TextCache:
+    """Compressed on-disk store for extracted document text.
+
+    Entries are keyed by the SHA-256 of the source bytes plus a namespace that
+    identifies the extractor (backend name and version), so switching backends
+    never serves stale text. Once the store grows past ``max_bytes`` the least
+    recently used entries are evicted.
+    """
+
+    _FORMAT_VERSION = 1
+    _SUFFIX = ".txt.z"
+    _CHUNK_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        root: Path | str = DEFAULT_CACHE_DIR,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        compression_level: int = 6,
+    ):
+        self._root = Path(root)
+        self._max_bytes = max_bytes
+        self._level = compression_level
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @classmethod
+    def content_key(cls, source: Path) -> str:
+        digest = hashlib.sha256()
+        with Path(source).open("rb") as stream:
+            for chunk in iter(lambda: stream.read(cls._CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def bytes_key(data: bytes) -> str:
+        return hashlib.sha256(data or b"").hexdigest()
+
+    def get(self, key: str, namespace: str) -> Optional[str]:
+        path = self._entry_path(key, namespace)
+        try:
+            payload = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            text = zlib.decompress(payload).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError):
+            with self._lock:
+                self._discard(path)
+                self._size = None
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return text
+
+    def put(self, key: str, namespace: str, text: str) -> None:
+        """Store ``text``; best-effort, a read-only or full cache directory is skipped."""
+        path = self._entry_path(key, namespace)
+        payload = zlib.compress(text.encode("utf-8"), self._level)
+        if len(payload) > self._max_bytes:
+            return
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._lock:
+            # Total before this write: a rescan after it would count the entry twice.
+            size = self._current_size() - self._stat_size(path)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_bytes(payload)
+                os.replace(tmp_path, path)
+            except OSError:
+                self._discard(tmp_path)
+                self._size = None
+                return
+            self._size = size + len(payload)
+            if self._size > self._max_bytes:
+                self._evict()
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._current_size()
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries():
+                self._discard(entry)
+            self._size = 0
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # ---------------- internal helpers ----------------
+
+    def _entry_path(self, key: str, namespace: str) -> Path:
+        bucket = re.sub(r"[^A-Za-z0-9._-]+", "_", f"v{self._FORMAT_VERSION}-{namespace}")
+        return self._root / bucket / key[:2] / f"{key}{self._SUFFIX}"
+
+    def _entries(self):
+        if not self._root.exists():
+            return []
+        return list(self._root.glob(f"*/*/*{self._SUFFIX}"))
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(self._stat_size(entry) for entry in self._entries())
+        return self._size
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the store is back under 90% of the cap."""
+        target = int(self._max_bytes * 0.9)
+        aged = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            aged.append((stat.st_mtime, stat.st_size, entry))
+        aged.sort(key=lambda item: item[0])
+        size = sum(item[1] for item in aged)
+        for _, entry_size, entry in aged:
+            if size <= target:
+                break
+            if self._discard(entry):
+                size -= entry_size
+        self._size = size
+
+    @staticmethod
+    def _stat_size(entry: Path) -> int:
+        try:
+            return entry.stat().st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _discard(entry: Path) -> bool:
+        try:
+            entry.unlink()
+            return True
+        except OSError:
+            return False
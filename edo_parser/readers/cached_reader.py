@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Tuple
+
+from edo_parser.core.document_reader import DocumentContent, DocumentReader
+from edo_parser.infrastructure.text_cache import TextCache
+
+
+class CachingDocumentReader(DocumentReader):
+    """Decorates another reader with a persistent, content-addressed text cache.
+
+    Cache entries are keyed by the file's content hash and the wrapped reader's
+    ``cache_namespace`` (falling back to its class name), so renamed or moved
+    files still hit while a different extractor backend gets its own entries.
+    """
+
+    def __init__(self, inner: DocumentReader, cache: TextCache | None = None, *, namespace: str | None = None):
+        self._inner = inner
+        self._cache = cache or TextCache()
+        self._namespace = namespace or getattr(inner, "cache_namespace", None) or type(inner).__name__
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    @property
+    def content_types(self) -> Tuple[str, ...]:  # type: ignore[override]
+        return tuple(getattr(self._inner, "content_types", ()) or ())
+
+    def supports(self, source: Path) -> bool:
+        return self._inner.supports(source)
+
+    def read(self, source: Path) -> DocumentContent:
+        path = Path(source)
+        if not path.is_file():
+            return self._inner.read(path)
+
+        key = self._cache.content_key(path)
+        cached = self._cache.get(key, self._namespace)
+        if cached is not None:
+            self.hits += 1
+            return DocumentContent(text=cached, source=path)
+
+        self.misses += 1
+        content = self._inner.read(path)
+        self._cache.put(key, self._namespace, content.text)
+        return content
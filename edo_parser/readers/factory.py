@@ -1,27 +1,102 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from edo_parser.core.document_reader import DocumentContent, DocumentReadError, DocumentReader
+from edo_parser.infrastructure.content_sniffer import sniff_content_type
+from edo_parser.infrastructure.text_cache import TextCache
+from edo_parser.readers.cached_reader import CachingDocumentReader
 
 
 class DocumentReaderFactory:
-    """Selects an appropriate reader for a given document."""
+    """Selects an appropriate reader for a given document.
 
-    def __init__(self, readers: Iterable[DocumentReader]):
-        self._readers: List[DocumentReader] = list(readers)
+    Readers that declare ``content_types`` are dispatched through a dict keyed
+    by the sniffed content type (header bytes, not the suffix), so the cost per
+    file does not grow with the number of readers. Readers without declared
+    types are still asked ``supports()`` in registration order. Decisions are
+    cached per path, size and mtime.
+
+    With a ``text_cache`` every registered reader is wrapped in a
+    ``CachingDocumentReader``, so ``read`` serves repeated files from disk.
+    """
+
+    def __init__(
+        self,
+        readers: Iterable[DocumentReader],
+        *,
+        cache_size: int = 4096,
+        text_cache: TextCache | None = None,
+    ):
+        self._readers: List[DocumentReader] = []
+        self._by_type: Dict[str, DocumentReader] = {}
+        self._untyped: List[DocumentReader] = []
+        self._decisions: "OrderedDict[Tuple[str, int, int], DocumentReader]" = OrderedDict()
+        self._cache_size = cache_size
+        self._text_cache = text_cache
+        self._lock = threading.Lock()
+        for reader in readers:
+            self.register(reader)
 
     def register(self, reader: DocumentReader) -> None:
-        if reader not in self._readers:
-            self._readers.append(reader)
+        if reader in self._readers:
+            return
+        self._readers.append(reader)
+        if self._text_cache is not None:
+            reader = CachingDocumentReader(reader, self._text_cache)
+        content_types = tuple(getattr(reader, "content_types", ()) or ())
+        for content_type in content_types:
+            self._by_type.setdefault(content_type, reader)
+        if not content_types:
+            self._untyped.append(reader)
+        with self._lock:
+            self._decisions.clear()
+
+    def content_type(self, source: Path) -> Optional[str]:
+        return sniff_content_type(Path(source))
 
     def get_reader(self, source: Path) -> DocumentReader:
-        for reader in self._readers:
-            if reader.supports(source):
-                return reader
-        raise DocumentReadError(f"No reader available for file: {source}")
+        path = Path(source)
+        key = self._decision_key(path)
+        if key is not None:
+            with self._lock:
+                cached = self._decisions.get(key)
+                if cached is not None:
+                    self._decisions.move_to_end(key)
+                    return cached
+
+        reader = self._select(path)
+        if reader is None:
+            raise DocumentReadError(f"No reader available for file: {source}")
+        if key is not None:
+            with self._lock:
+                self._decisions[key] = reader
+                while len(self._decisions) > self._cache_size:
+                    self._decisions.popitem(last=False)
+        return reader
 
     def read(self, source: Path) -> DocumentContent:
         reader = self.get_reader(source)
         return reader.read(source)
+
+    # ---------------- internal helpers ----------------
+
+    def _select(self, path: Path) -> Optional[DocumentReader]:
+        reader = self._by_type.get(self.content_type(path) or "")
+        if reader is not None:
+            return reader
+        for candidate in self._untyped:
+            if candidate.supports(path):
+                return candidate
+        return None
+
+    @staticmethod
+    def _decision_key(path: Path) -> Optional[Tuple[str, int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return str(path.resolve()), stat.st_size, stat.st_mtime_ns
@@ -1,17 +1,29 @@
 from __future__ import annotations
 from pathlib import Path
-from edo_parser.core.document_reader import DocumentContent, DocumentReadError, DocumentReader
-from edo_parser.infrastructure.pdf_text_extractor import PdfExtractionError, PdfTextExtractor
+from edo_parser.core.document_reader import (
+    DocumentContent,
+    DocumentReadError,
+    DocumentReader,
+    ImageOnlyDocumentError,
+)
+from edo_parser.infrastructure.content_sniffer import PDF, sniff_content_type
+from edo_parser.infrastructure.pdf_text_extractor import ImageOnlyPdfError, PdfExtractionError, PdfTextExtractor
 
 
 class PdfDocumentReader(DocumentReader):
     """Reads textual content from PDF files."""
 
+    content_types = (PDF,)
+
     def __init__(self, extractor: PdfTextExtractor | None = None):
         self._extractor = extractor or PdfTextExtractor()
 
+    @property
+    def cache_namespace(self) -> str:
+        return f"pdf-{self._extractor.backend_id}"
+
     def supports(self, source: Path) -> bool:
-        return source.suffix.lower() == ".pdf"
+        return sniff_content_type(source) == PDF
 
     def read(self, source: Path) -> DocumentContent:
         if not source.exists():
@@ -21,6 +33,8 @@ class PdfDocumentReader(DocumentReader):
 
         try:
             text = self._extractor.extract_text(source)
+        except ImageOnlyPdfError as exc:
+            raise ImageOnlyDocumentError(str(exc)) from exc
         except PdfExtractionError as exc:
             raise DocumentReadError(str(exc)) from exc
 
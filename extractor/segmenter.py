@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import time
+import tracemalloc
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+from extractor.strategy_factory import StrategyFactory
+from utils.parsed_document import ParsedDocument
+from utils.regex_guard import RegexGuard, current_guard, guard_scope
+from utils.regex_utils import RegexUtils
+from utils.spatial_index import SpatialIndex, layout_scope
+
+if TYPE_CHECKING:
+    from extractor.template_cache import TemplateCache
+
+_CONTAINER_FIELDS = ("柜号", "CTN NUMBER")
+# A page only names "its" carrier when the carrier is a clear scoring winner
+# or is named in the page's first lines; a bare keyword further down (a
+# partner line, a container prefix) must not split a document.
+_CARRIER_MIN_CONFIDENCE = 0.6
+_CARRIER_HEADER_LINES = 3
+
+
+@dataclass(frozen=True)
+class DocumentSegment:
+    """A run of consecutive pages that belong to one delivery order."""
+
+    start_page: int
+    stop_page: int
+    text: str
+
+
+class DocumentSegmenter:
+    """Split merged PDFs (several EDOs in one file) at document boundaries.
+
+    A page opens a new segment when
+    - its page counter restarts ("Page 1 of N", "PAGE: 1 OF 2", "Page 1/2"),
+    - the previous page was the last one of its counter ("Page N of N"),
+    - the carrier it is clearly about (named in its first lines, or a
+      confident StrategyFactory.select winner) differs from the current
+      segment's, or
+    - it repeats the header lines of the current segment's first page while
+      the document carries no page counters at all.
+    Page counters override the rest: a counter above 1, or a page the
+    previous counter still expects ("Page 1 of 3" before it), always
+    continues the current segment.
+    """
+
+    _PAGE_OF_RX = RegexUtils.compile(r"\bPAGE\s*:?\s*(\d{1,3})\s*(?:OF|/)\s*(\d{1,3})\b", flags=RegexUtils.IGNORECASE)
+    _DIGIT_RX = RegexUtils.compile(r"\d", flags=0)
+    _HEADER_LINES = 3
+
+    def __init__(self, carrier_of: Optional[Callable[[str], Optional[str]]] = None):
+        self._carrier_of = carrier_of or _carrier_from_keywords
+
+    def split(self, pages: Sequence[str]) -> List[DocumentSegment]:
+        if len(pages) <= 1:
+            return [self._segment(pages, 0, len(pages))]
+
+        boundaries = [0]
+        segment_header = self._header(pages[0])
+        segment_carrier = self._carrier(pages[0])
+        previous_counter = self._page_counter(pages[0])
+        segment_has_counter = previous_counter is not None
+        for index in range(1, len(pages)):
+            page = pages[index]
+            counter = self._page_counter(page)
+            page_number = counter[0] if counter else None
+            carrier = self._carrier(page)
+            if page_number is not None and page_number > 1:
+                starts_new = False
+            elif page_number == 1:
+                starts_new = True
+            elif previous_counter is not None:
+                starts_new = previous_counter[0] == previous_counter[1]
+            elif carrier and segment_carrier and carrier != segment_carrier:
+                starts_new = True
+            else:
+                starts_new = (
+                    not segment_has_counter
+                    and bool(segment_header)
+                    and self._header(page) == segment_header
+                )
+
+            if starts_new:
+                boundaries.append(index)
+                segment_header = self._header(page)
+                segment_carrier = carrier
+                segment_has_counter = counter is not None
+            elif carrier and not segment_carrier:
+                segment_carrier = carrier
+            previous_counter = counter
+
+        boundaries.append(len(pages))
+        return [self._segment(pages, start, stop) for start, stop in zip(boundaries, boundaries[1:])]
+
+    # ---------------- internal helpers ----------------
+
+    @staticmethod
+    def _segment(pages: Sequence[str], start: int, stop: int) -> DocumentSegment:
+        return DocumentSegment(start_page=start, stop_page=stop, text="\n".join(pages[start:stop]).strip())
+
+    def _page_counter(self, page: str) -> Optional[Tuple[int, int]]:
+        """Return ``(page, total)`` from a "Page X of Y" marker, if the page has one."""
+        match = self._PAGE_OF_RX.search(page or "")
+        if not match:
+            return None
+        current, total = int(match.group(1)), int(match.group(2))
+        return (current, total) if 0 < current <= total else None
+
+    def _header(self, page: str) -> Tuple[str, ...]:
+        lines = [line.strip() for line in (page or "").splitlines() if line.strip()]
+        masked = (self._DIGIT_RX.sub("9", line.upper()) for line in lines[: self._HEADER_LINES])
+        return tuple(masked)
+
+    def _carrier(self, page: str) -> Optional[str]:
+        return self._carrier_of(page or "")
+
+
+def _carrier_from_keywords(text: str) -> Optional[str]:
+    """Carrier the page is clearly about, or None when the keywords are only weak evidence."""
+    selection = StrategyFactory.select(text)
+    strategy = selection.strategy
+    if strategy.name not in selection.scores:
+        return None
+    if selection.is_confident(_CARRIER_MIN_CONFIDENCE) or _named_in_header(strategy, text):
+        return strategy.name
+    return None
+
+
+def _named_in_header(strategy, text: str) -> bool:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    header = "\n".join(lines[:_CARRIER_HEADER_LINES]).upper()
+    return any(
+        RegexUtils.search(rf"(?<![A-Z0-9]){RegexUtils.escape(keyword.upper())}(?![A-Z0-9])", header, flags=0)
+        for keyword in strategy.keywords
+    )
+
+
+def parse_segment(
+    text: str,
+    layout: Optional[SpatialIndex] = None,
+    min_confidence: Optional[float] = None,
+    template_cache: Optional["TemplateCache"] = None,
+    regex_guard: Optional[RegexGuard] = None,
+) -> List[Dict[str, str]]:
+    """Match and extract one segment; module-level so process pools can pickle it.
+
+    ``layout`` (the segment's word index) enables anchor lookups in strategies
+    that support them. ``min_confidence`` switches from first-match to scored
+    selection (StrategyFactory.choose) with that confidence threshold.
+    ``template_cache`` skips strategy selection for layouts seen before,
+    extracting with the strategy that won for them last time.
+    ``regex_guard`` bounds the unanchored regex searches made meanwhile.
+    """
+    with guard_scope(regex_guard or current_guard()):
+        return _parse_segment(ParsedDocument.of(text), layout, min_confidence, template_cache)
+
+
+def _parse_segment(
+    document: ParsedDocument,
+    layout: Optional[SpatialIndex],
+    min_confidence: Optional[float],
+    template_cache: Optional["TemplateCache"],
+) -> List[Dict[str, str]]:
+    fingerprint = None
+    if template_cache is not None:
+        fingerprint, known = template_cache.lookup(document)
+        strategy = StrategyFactory.remembered(known, document) if known else None
+        if strategy is not None:
+            return _extract(strategy, document, layout)
+    if min_confidence is None:
+        strategy = StrategyFactory.match_first(document)
+        records = _extract(strategy, document, layout)
+    else:
+        # Verification extracts run under the layout too, so their records
+        # are the ones this segment returns.
+        with layout_scope(layout):
+            selection = StrategyFactory.choose(document, min_confidence=min_confidence)
+        strategy = selection.strategy
+        records = selection.records
+        if records is None:
+            records = _extract(strategy, document, layout)
+    if template_cache is not None:
+        template_cache.learn(document, strategy.name, fingerprint=fingerprint)
+    return records
+
+
+def _extract(strategy, document: ParsedDocument, layout: Optional[SpatialIndex]) -> List[Dict[str, str]]:
+    """Run the chosen strategy and pass its records and CPU time on to its shadow, if any."""
+    with layout_scope(layout):
+        started = time.thread_time()
+        records = strategy.extract(document)
+        seconds = time.thread_time() - started
+    # Allocation tracing (memory_profile) inflates the primary's time several-fold.
+    StrategyFactory.shadow(strategy, document, records, None if tracemalloc.is_tracing() else seconds, layout)
+    return records
+
+
+def parse_segments(
+    segments: Sequence[DocumentSegment],
+    executor: Optional[Executor] = None,
+    layout: Optional[SpatialIndex] = None,
+    min_confidence: Optional[float] = None,
+    template_cache: Optional["TemplateCache"] = None,
+    regex_guard: Optional[RegexGuard] = None,
+) -> List[Dict[str, str]]:
+    """Extract every segment (in parallel when an executor is given) and merge per container.
+
+    The template cache is only consulted in-process; worker processes would
+    each learn into their own copy. Workers get a copy of ``regex_guard``
+    with the same limits; its telemetry stays in the worker.
+    """
+    kept = [segment for segment in segments if segment.text]
+    texts = [segment.text for segment in kept]
+    layouts = [layout.for_pages(s.start_page, s.stop_page) if layout is not None else None for s in kept]
+    if len(texts) == 1:
+        return parse_segment(texts[0], layouts[0], min_confidence, template_cache, regex_guard)
+    if executor is None:
+        results = [
+            parse_segment(text, seg_layout, min_confidence, template_cache, regex_guard)
+            for text, seg_layout in zip(texts, layouts)
+        ]
+    else:
+        count = len(texts)
+        results = list(
+            executor.map(parse_segment, texts, layouts, [min_confidence] * count, [None] * count, [regex_guard] * count)
+        )
+    return merge_records(results)
+
+
+def merge_records(results: Sequence[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    """Merge per-segment records by container; earlier segments win, blanks are filled later."""
+    merged: List[Dict[str, str]] = []
+    by_container: Dict[str, Dict[str, str]] = {}
+    for records in results:
+        for record in records or []:
+            if not isinstance(record, dict):
+                continue
+            container = next((record.get(field) for field in _CONTAINER_FIELDS if record.get(field)), "")
+            key = container.strip().upper()
+            if not key:
+                merged.append(dict(record))
+                continue
+            existing = by_container.get(key)
+            if existing is None:
+                by_container[key] = dict(record)
+                merged.append(by_container[key])
+                continue
+            for field, value in record.items():
+                if value and not existing.get(field):
+                    existing[field] = value
+    return merged
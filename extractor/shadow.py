@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+import tracemalloc
+import zlib
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from strategy.base_strategy import BaseStrategy
+from strategy.plugins import instantiate
+from utils.parsed_document import ParsedDocument
+from utils.spatial_index import SpatialIndex, layout_scope
+
+_MISSING = "<missing>"
+
+
+@dataclass
+class ShadowStats:
+    target: str
+    sample_rate: float
+    sampled: int = 0
+    dropped: int = 0
+    completed: int = 0
+    # Completed runs whose primary was timed (not under allocation tracing).
+    timed: int = 0
+    identical: int = 0
+    mismatched: int = 0
+    errors: int = 0
+    primary_seconds: float = 0.0
+    shadow_seconds: float = 0.0
+    fields: Dict[str, int] = field(default_factory=dict)
+    examples: List[Dict[str, Any]] = field(default_factory=list)
+    last_error: str = ""
+
+
+class ShadowRunner:
+    """Run candidate strategies next to the primary without touching its output.
+
+    ``add`` pairs a carrier with a candidate (``"package.module:ClassName"``)
+    and a sample rate. ``submit`` is handed every primary extraction of that
+    carrier; a sampled document is queued for the candidate in a worker
+    process of its own, at the lowest CPU priority (so it neither holds the
+    GIL nor takes a core the primary wants), and ``submit`` returns at once.
+    Pickling the document for the worker still happens in this process (see
+    StrategyFactory.set_shadow for the cost). When the candidate finishes,
+    its records and latency are compared with the primary's; ``report()``
+    has the result per carrier.
+
+    Latency on both sides is CPU time of the extracting thread
+    (``time.thread_time``), so the worker's low priority and the primary's
+    load do not skew it. Each worker runs a candidate once unrecorded
+    before timing it, and never traces allocations; primaries extracted
+    under allocation tracing are not timed (see ``submit``).
+
+    Sampling is by document content, so a rerun shadows the same documents.
+    When ``max_pending`` documents are already queued further samples are
+    dropped (and counted) rather than queued without bound. Only the process
+    that created the runner submits: copies inherited by forked parse workers
+    do nothing.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 1,
+        max_pending: int = 16,
+        max_examples: int = 5,
+        executor: Optional[Executor] = None,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_examples = max_examples
+        self._executor = executor
+        self._candidates: Dict[str, Tuple[str, float]] = {}
+        self._stats: Dict[str, ShadowStats] = {}
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @property
+    def carriers(self) -> List[str]:
+        return list(self._candidates)
+
+    def add(self, carrier: str, target: str, sample_rate: float = 0.1) -> None:
+        """Shadow ``carrier`` with ``target`` on ``sample_rate`` of its documents."""
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        instantiate(target)  # fail now on a bad target, not in the worker
+        with self._lock:
+            self._candidates = {**self._candidates, carrier: (target, sample_rate)}
+            self._stats[carrier] = ShadowStats(target, sample_rate)
+
+    def remove(self, carrier: str) -> bool:
+        with self._lock:
+            if carrier not in self._candidates:
+                return False
+            self._candidates = {name: c for name, c in self._candidates.items() if name != carrier}
+            return True
+
+    def submit(
+        self,
+        carrier: str,
+        document: str,
+        records: List[Dict[str, str]],
+        seconds: Optional[float],
+        layout: Optional[SpatialIndex] = None,
+    ) -> bool:
+        """Queue ``document`` for the carrier's candidate if it is sampled; never waits for it.
+
+        ``seconds`` is the primary's CPU time, or None when it was not
+        representative; such runs are compared but leave latency out.
+        """
+        candidate = self._candidates.get(carrier)
+        if candidate is None or os.getpid() != self._pid:
+            return False
+        target, sample_rate = candidate
+        if not _sampled(document, sample_rate):
+            return False
+        primary = [dict(record) for record in records or [] if isinstance(record, dict)]
+        with self._lock:
+            stats = self._stats[carrier]
+            if len(self._pending) >= self.max_pending:
+                stats.dropped += 1
+                return False
+            stats.sampled += 1
+            future = self._pool().submit(_run_shadow, target, str(document), layout)
+            self._pending.add(future)
+        future.add_done_callback(lambda done: self._compare(carrier, primary, seconds, done))
+        return True
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued shadow runs; False if some are still running after ``timeout``."""
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def report(self) -> Dict[str, Any]:
+        """Per carrier: sample counts, agreement with the primary and mean latency of both."""
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "carriers": {carrier: _stats_report(stats) for carrier, stats in self._stats.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {carrier: ShadowStats(*candidate) for carrier, candidate in self._candidates.items()}
+
+    def close(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    # ---------------- internal helpers ----------------
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+        return self._executor
+
+    def _compare(
+        self, carrier: str, primary: List[Dict[str, str]], seconds: Optional[float], future: Future
+    ) -> None:
+        error = future.exception() if not future.cancelled() else None
+        with self._lock:
+            self._pending.discard(future)
+            stats = self._stats.get(carrier)
+            if stats is None or future.cancelled():
+                return
+            if error is not None:
+                stats.errors += 1
+                stats.last_error = f"{type(error).__name__}: {error}"
+                return
+            shadow, shadow_seconds = future.result()
+            stats.completed += 1
+            if seconds is not None:
+                stats.timed += 1
+                stats.primary_seconds += seconds
+                stats.shadow_seconds += shadow_seconds
+            diff = _diff_fields(primary, shadow)
+            if not diff:
+                stats.identical += 1
+                return
+            stats.mismatched += 1
+            for name in diff:
+                stats.fields[name] = stats.fields.get(name, 0) + 1
+            if len(stats.examples) < self.max_examples:
+                stats.examples.append(diff)
+
+
+# Candidate instances per worker process, created on first use.
+_WORKER_STRATEGIES: Dict[str, BaseStrategy] = {}
+
+
+def _run_shadow(
+    target: str, text: str, layout: Optional[SpatialIndex]
+) -> Tuple[List[Dict[str, str]], float]:
+    strategy = _WORKER_STRATEGIES.get(target)
+    cold = strategy is None
+    if cold:
+        strategy = _WORKER_STRATEGIES[target] = instantiate(target)
+    with layout_scope(layout):
+        if cold:
+            # Imports, pattern compilation and first-call caches are not the candidate's latency.
+            strategy.extract(ParsedDocument.of(text))
+        document = ParsedDocument.of(text)
+        started = time.thread_time()
+        records = strategy.extract(document)
+        seconds = time.thread_time() - started
+    return [dict(record) for record in records or [] if isinstance(record, dict)], seconds
+
+
+def _init_worker() -> None:
+    # A forked worker inherits the parent's allocation tracing (memory_profile).
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    # Shadow workers only get CPU the primary leaves idle.
+    try:
+        os.nice(19)
+    except (AttributeError, OSError):  # pragma: no cover - not POSIX
+        pass
+
+
+def _sampled(document: str, sample_rate: float) -> bool:
+    if sample_rate >= 1:
+        return True
+    return zlib.crc32(document.encode("utf-8", "surrogatepass")) % 10000 < sample_rate * 10000
+
+
+def _diff_fields(primary: List[Dict[str, str]], shadow: List[Dict[str, str]]) -> Dict[str, List[str]]:
+    """Field -> [primary value, shadow value] for every difference, record by record."""
+    diff: Dict[str, List[str]] = {}
+    if len(primary) != len(shadow):
+        diff["<records>"] = [str(len(primary)), str(len(shadow))]
+    for index, (left, right) in enumerate(zip(primary, shadow)):
+        for name in sorted(set(left) | set(right)):
+            a, b = left.get(name, _MISSING), right.get(name, _MISSING)
+            if a != b:
+                diff.setdefault(name if index == 0 else f"{name}[{index}]", [str(a), str(b)])
+    return diff
+
+
+def _stats_report(stats: ShadowStats) -> Dict[str, Any]:
+    timed = stats.timed or 1
+    primary_ms = stats.primary_seconds * 1000 / timed
+    shadow_ms = stats.shadow_seconds * 1000 / timed
+    return {
+        "target": stats.target,
+        "sample_rate": stats.sample_rate,
+        "sampled": stats.sampled,
+        "dropped": stats.dropped,
+        "completed": stats.completed,
+        "timed": stats.timed,
+        "identical": stats.identical,
+        "mismatched": stats.mismatched,
+        "errors": stats.errors,
+        "last_error": stats.last_error,
+        "primary_mean_ms": round(primary_ms, 3),
+        "shadow_mean_ms": round(shadow_ms, 3),
+        "speedup": round(primary_ms / shadow_ms, 2) if stats.timed and shadow_ms else None,
+        "fields": dict(sorted(stats.fields.items(), key=lambda item: item[1], reverse=True)),
+        "examples": list(stats.examples),
+    }
@@ -1,58 +1,353 @@
-from typing import List
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 from strategy.base_strategy import BaseStrategy
-from strategy.strategy_shippingline.strategy_anl import ANLStrategy
-from strategy.strategy_shippingline.strategy_bal import BALStrategy
-from strategy.strategy_shippingline.strategy_cosco import COSCOStrategy
-from strategy.strategy_shippingline.strategy_evergreen import EvergreenStrategy
-from strategy.strategy_shippingline.strategy_hamburg_sud import HamburgSudStrategy
-from strategy.strategy_shippingline.strategy_hapag_lloyd import HapagLloydStrategy
-from strategy.strategy_shippingline.strategy_hmm import HMMStrategy
-from strategy.strategy_shippingline.strategy_maersk import MAERSKStrategy
-from strategy.strategy_shippingline.strategy_msc import MSCStrategy
-from strategy.strategy_shippingline.strategy_nautical import NauticalStrategy
-from strategy.strategy_shippingline.strategy_one import ONEStrategy
-from strategy.strategy_shippingline.strategy_oocl import OOCLStrategy
-from strategy.strategy_shippingline.strategy_pil import PILStrategy
-from strategy.strategy_shippingline.strategy_quay import QUAYStrategy
-from strategy.strategy_shippingline.strategy_swire import SWIREStrategy
-from strategy.strategy_shippingline.strategy_ts_lines import TSLINEStrategy
-from strategy.strategy_shippingline.strategy_yangming import YANGMINGStrategy
-from strategy.strategy_shippingline.strategy_zim import ZIMStrategy
+from strategy.plugins import (
+    MANIFEST_MODULE,
+    LazyStrategy,
+    StrategyManifestEntry,
+    builtin_manifest,
+    fresh_module,
+    instantiate,
+    manifest_drift,
+    plugin_manifest,
+    publish_module,
+    source_path,
+)
 from strategy.strategy_generic import GenericStrategy
+from extractor.shadow import ShadowRunner
+from extractor.strategy_selection import StrategyScorer, StrategySelection
+from utils.keyword_automaton import KeywordAutomaton
+from utils.parsed_document import ParsedDocument
+from utils.spatial_index import SpatialIndex
+
+_GENERIC_TARGET = "strategy.strategy_generic:GenericStrategy"
+
+
+def _build_automaton(registry: Iterable[LazyStrategy]) -> KeywordAutomaton:
+    return KeywordAutomaton(k for strat in registry for k in list(strat.keywords) + list(strat.negative_keywords))
+
+
+def _source_mtimes(strategies: Iterable[LazyStrategy]) -> Dict[str, float]:
+    modules = {MANIFEST_MODULE, _GENERIC_TARGET.partition(":")[0]}
+    modules.update(strat.entry.target.partition(":")[0] for strat in strategies)
+    sources: Dict[str, float] = {}
+    for module_name in sorted(modules):
+        path = source_path(module_name)
+        mtime = _mtime(path) if path else None
+        if mtime is not None:
+            sources[path] = mtime
+    return sources
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+@dataclass(frozen=True)
+class StrategyRegistry:
+    """One immutable version of the registered carriers.
+
+    StrategyFactory reads ``_state`` once per call, so a document is matched
+    and extracted against a single version even while ``reload`` publishes
+    the next one; strategies it already holds keep running on their own
+    module.
+    """
+
+    version: int
+    strategies: Tuple[LazyStrategy, ...]
+    fallback: BaseStrategy
+    automaton: KeywordAutomaton
+    plugins: Tuple[StrategyManifestEntry, ...] = ()
+    # Source file -> mtime when this version was built (for reload_changed).
+    sources: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        strategies: Iterable[LazyStrategy],
+        fallback: BaseStrategy,
+        plugins: Iterable[StrategyManifestEntry] = (),
+    ) -> "StrategyRegistry":
+        strategies = tuple(strategies)
+        return cls(version, strategies, fallback, _build_automaton(strategies), tuple(plugins), _source_mtimes(strategies))
+
 
 class StrategyFactory:
-    _registry: List[BaseStrategy] = [
-        ANLStrategy(),
-        BALStrategy(),
-        COSCOStrategy(),
-        EvergreenStrategy(),
-        HamburgSudStrategy(),
-        HapagLloydStrategy(),
-        HMMStrategy(),
-        ONEStrategy(),
-        OOCLStrategy(),
-        MAERSKStrategy(),
-        MSCStrategy(),
-        NauticalStrategy(),
-        PILStrategy(),
-        QUAYStrategy(),
-        SWIREStrategy(),
-        TSLINEStrategy(),
-        YANGMINGStrategy(),
-        ZIMStrategy(),
-    ]
-    _fallback = GenericStrategy()
+    # Carriers are matched from their manifest keywords; a carrier module is
+    # imported only once it is selected. Entry-point plugins are discovered
+    # (once) the first time no built-in carrier matches, so the scan of
+    # installed distributions stays off the cold-start path. Every registered
+    # keyword sits in one automaton: a single scan per document replaces
+    # calling each strategy's match() in turn.
+    _state = StrategyRegistry.build(1, (LazyStrategy(entry) for entry in builtin_manifest()), GenericStrategy())
+    _scorer = StrategyScorer()
+    _plugins_checked = False
+    _plugins_lock = threading.Lock()
+    _reload_lock = threading.Lock()
+    # Source mtimes of the last reload_changed that failed; not retried until they change again.
+    _failed_sources: Tuple[Tuple[str, Optional[float]], ...] = ()
+    # Candidate strategies shadowing carriers (set_shadow); None when there are none.
+    _shadow: Optional[ShadowRunner] = None
+
+    @classmethod
+    def version(cls) -> int:
+        return cls._state.version
 
     @classmethod
     def match_first(cls, text: str) -> BaseStrategy:
-        t = (text or "").upper()
-        for strat in cls._registry:
-            try:
-                if strat.match(t):
-                    return strat
-            except Exception:
-                continue
-        return cls._fallback
+        """First strategy in registry order whose keywords are found; same result as calling match() in turn."""
+        upper = ParsedDocument.of(text).upper()
+        state = cls._state
+        strategy = _first_keyword_match(state, upper)
+        if strategy is None and cls._discover_plugins():
+            state = cls._state
+            strategy = _first_keyword_match(state, upper)
+        return strategy.load() if strategy is not None else state.fallback
+
+    @classmethod
+    def match_known(cls, text: str) -> Optional[BaseStrategy]:
+        """Like match_first, but None instead of the generic fallback."""
+        strategy = cls.match_first(text)
+        return None if strategy.name == cls._state.fallback.name else strategy
+
+    @classmethod
+    def named(cls, name: str) -> Optional[BaseStrategy]:
+        """Registered strategy by name (e.g. a carrier given to set_shadow)."""
+        state = cls._state
+        for strat in state.strategies:
+            if strat.name == name:
+                return strat.load()
+        return state.fallback if name == state.fallback.name else None
+
+    @classmethod
+    def remembered(cls, name: str, text: str) -> Optional[BaseStrategy]:
+        """Strategy ``name`` if its keywords are in ``text``, else None.
+
+        Guards a remembered pick (the template cache's) against a layout
+        fingerprint shared with another carrier's template.
+        """
+        state = cls._state
+        found = state.automaton.found(ParsedDocument.of(text).upper())
+        for strat in state.strategies:
+            if strat.name == name:
+                return strat.load() if strat.matches_keywords(found) else None
+        return None
+
+    @classmethod
+    def select(cls, text: str) -> StrategySelection:
+        """Score every carrier from one keyword scan; best strategy, confidence and runner-up."""
+        upper = ParsedDocument.of(text).upper()
+        state = cls._state
+        selection = cls._scorer.select(state.strategies, state.automaton.scan(upper), upper, state.fallback)
+        if selection.strategy is state.fallback and cls._discover_plugins():
+            state = cls._state
+            selection = cls._scorer.select(state.strategies, state.automaton.scan(upper), upper, state.fallback)
+        return StrategySelection(
+            strategy=_loaded(selection.strategy),
+            confidence=selection.confidence,
+            runner_up=_loaded(selection.runner_up) if selection.runner_up is not None else None,
+            scores=selection.scores,
+        )
+
+    @classmethod
+    def choose(cls, text: str, *, min_confidence: float = 0.5) -> StrategySelection:
+        """Scored selection; below ``min_confidence`` the best and runner-up both
+        extract and the one with more filled fields wins (verification path).
+        The winner's records then come back in ``records``."""
+        selection = cls.select(text)
+        if selection.is_confident(min_confidence) or selection.runner_up is None:
+            return selection
+        document = ParsedDocument.of(text)
+        best_records = selection.strategy.extract(document)
+        runner_records = selection.runner_up.extract(document)
+        if _record_quality(runner_records) > _record_quality(best_records):
+            return StrategySelection(
+                strategy=selection.runner_up,
+                confidence=selection.confidence,
+                runner_up=selection.strategy,
+                scores=selection.scores,
+                records=runner_records,
+            )
+        return StrategySelection(
+            strategy=selection.strategy,
+            confidence=selection.confidence,
+            runner_up=selection.runner_up,
+            scores=selection.scores,
+            records=best_records,
+        )
+
+    @classmethod
+    def reload(cls, names: Optional[Iterable[str]] = None) -> int:
+        """Re-read carrier modules and the manifest, then publish them as a new version.
+
+        Only carrier modules that were already imported are executed again,
+        each as a new module object (its dependencies, pandas/fitz included,
+        are not re-imported); the others stay lazy. ``names`` limits this to
+        those carriers (``"GENERIC"`` for the fallback); the manifest is
+        always re-read. If anything fails to load, or a reloaded class no
+        longer agrees with its manifest entry, the exception propagates and the
+        current version stays in place. Returns the published version.
+        """
+        wanted = set(names) if names is not None else None
+        with cls._reload_lock:
+            state = cls._state
+            previous = {strat.name: strat for strat in state.strategies}
+            modules = {MANIFEST_MODULE: fresh_module(MANIFEST_MODULE)}
+            entries = builtin_manifest(modules[MANIFEST_MODULE]) + list(state.plugins)
+            strategies: List[LazyStrategy] = []
+            for entry in entries:
+                old = previous.get(entry.name)
+                if old is not None and old.entry == entry and wanted is not None and entry.name not in wanted:
+                    strategies.append(old)
+                    continue
+                module_name = entry.target.partition(":")[0]
+                if module_name not in sys.modules:
+                    strategies.append(LazyStrategy(entry))
+                    continue
+                if module_name not in modules:
+                    modules[module_name] = fresh_module(module_name)
+                strategy = instantiate(entry.target, modules[module_name])
+                drift = manifest_drift(entry, strategy)
+                if drift:
+                    # Matching only reads the manifest: a keyword changed in
+                    # the class alone would be silently ignored.
+                    raise ValueError("Strategy manifest out of sync: " + "; ".join(drift))
+                strategies.append(LazyStrategy(entry, strategy))
+            fallback = state.fallback
+            if wanted is None or fallback.name in wanted:
+                module_name = _GENERIC_TARGET.partition(":")[0]
+                modules[module_name] = fresh_module(module_name)
+                fallback = instantiate(_GENERIC_TARGET, modules[module_name])
+
+            for module in modules.values():
+                publish_module(module)
+            cls._state = StrategyRegistry.build(state.version + 1, strategies, fallback, state.plugins)
+            return cls._state.version
+
+    @classmethod
+    def reload_changed(cls) -> Optional[Tuple[int, List[str]]]:
+        """Reload the carriers whose source changed since this version was built.
+
+        Returns the new version and the reloaded carrier names (empty when
+        only the manifest changed), or None when nothing changed.
+        """
+        state = cls._state
+        current = tuple((path, _mtime(path)) for path in state.sources)
+        changed_set = {path for path, mtime in current if mtime != state.sources[path]}
+        if not changed_set or current == cls._failed_sources:
+            return None
+        names = [
+            strat.name
+            for strat in state.strategies
+            if source_path(strat.entry.target.partition(":")[0]) in changed_set
+        ]
+        if source_path(_GENERIC_TARGET.partition(":")[0]) in changed_set:
+            names.append(state.fallback.name)
+        try:
+            version = cls.reload(names)
+        except Exception:
+            cls._failed_sources = current
+            raise
+        return version, names
+
+    @classmethod
+    def set_shadow(
+        cls,
+        carrier: str,
+        target: str,
+        *,
+        sample_rate: float = 0.1,
+        runner: Optional[ShadowRunner] = None,
+    ) -> ShadowRunner:
+        """Run ``target`` ("package.module:ClassName") as a shadow of ``carrier``.
+
+        The carrier's output is unchanged: a ``sample_rate`` fraction of its
+        documents is also extracted by the candidate in the background and
+        the two are compared (see ShadowRunner). Returns the runner holding
+        the metrics; ``runner`` replaces the default one on first use.
+
+        Sampled documents (text and, when layouts are on, the layout) are
+        pickled to the shadow worker by the pool's feeder thread, which
+        holds the GIL while it does so. With layouts on, a rate of 1.0 costs
+        the primary about a fifth of its parse time on the sample inputs;
+        keep the rate low in production.
+        """
+        if cls.named(carrier) is None:
+            raise ValueError(f"Unknown carrier '{carrier}'")
+        with cls._reload_lock:
+            if cls._shadow is None:
+                cls._shadow = runner or ShadowRunner()
+            cls._shadow.add(carrier, target, sample_rate)
+            return cls._shadow
+
+    @classmethod
+    def install_shadow(cls, runner: Optional[ShadowRunner]) -> Optional[ShadowRunner]:
+        """Make ``runner`` the active shadow runner (None stops shadowing); returns the one it replaces."""
+        with cls._reload_lock:
+            previous, cls._shadow = cls._shadow, runner
+        return previous
+
+    @classmethod
+    def clear_shadows(cls) -> Optional[ShadowRunner]:
+        """Stop shadowing; returns the detached runner (its metrics, still to be closed)."""
+        return cls.install_shadow(None)
+
+    @classmethod
+    def shadow(
+        cls,
+        strategy: BaseStrategy,
+        document: str,
+        records: List[Dict[str, str]],
+        seconds: Optional[float],
+        layout: Optional[SpatialIndex] = None,
+    ) -> bool:
+        """Hand a primary extraction to the carrier's shadow, if it has one; never waits."""
+        runner = cls._shadow
+        return runner is not None and runner.submit(strategy.name, document, records, seconds, layout)
+
+    @classmethod
+    def _discover_plugins(cls) -> bool:
+        """Append entry-point carriers once per process; True when the registry grew."""
+        with cls._plugins_lock:
+            if cls._plugins_checked:
+                return False
+            cls._plugins_checked = True
+            with cls._reload_lock:
+                state = cls._state
+                plugins = plugin_manifest(strat.name for strat in state.strategies)
+                if not plugins:
+                    return False
+                cls._state = StrategyRegistry.build(
+                    state.version + 1,
+                    state.strategies + tuple(LazyStrategy(entry) for entry in plugins),
+                    state.fallback,
+                    state.plugins + tuple(plugins),
+                )
+            return True
+
+
+def _first_keyword_match(state: StrategyRegistry, upper: str) -> Optional[LazyStrategy]:
+    found = state.automaton.found(upper)
+    for strat in state.strategies:
+        if strat.matches_keywords(found):
+            return strat
+    return None
+
+
+def _loaded(strategy):
+    return strategy.load() if isinstance(strategy, LazyStrategy) else strategy
+
+
+def _record_quality(records: List[Dict[str, str]]) -> int:
+    fields = ("\u67dc\u53f7", "PIN", "\u8fd8\u67dc\u573a")
+    return sum(1 for record in records or [] if isinstance(record, dict) for f in fields if record.get(f))
 
 
 def get_matching_strategy(text: str) -> BaseStrategy:
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from strategy.base_strategy import BaseStrategy
+from utils.keyword_automaton import KeywordHit
+
+
+@dataclass(frozen=True)
+class StrategySelection:
+    """Outcome of scored strategy selection."""
+
+    strategy: BaseStrategy
+    confidence: float
+    runner_up: Optional[BaseStrategy] = None
+    scores: Dict[str, float] = field(default_factory=dict)
+    # What ``strategy`` extracted, when selection already ran it (verification path).
+    records: Optional[List[Dict[str, str]]] = None
+
+    def is_confident(self, threshold: float) -> bool:
+        return self.confidence >= threshold
+
+
+class StrategyScorer:
+    """Scores every carrier from the keyword hits of one scan.
+
+    - each distinct keyword found adds its weight (``keyword_weights`` on the
+      strategy, otherwise longer / multi-word keywords weigh more than bare
+      acronyms such as "HMM" or "ZIM");
+    - a keyword whose first hit lies in the header region counts
+      ``header_boost`` times;
+    - a hit embedded in a longer word counts only ``embedded_factor``;
+    - repeated hits add a small, capped bonus;
+    - every ``negative_keywords`` entry found subtracts ``negative_weight``.
+
+    ``keyword_mode = "all"`` strategies score 0 unless all keywords are found.
+    Confidence is the best score's margin over the runner-up, damped when
+    the best score itself is weak (below ``strong_score``).
+    """
+
+    def __init__(
+        self,
+        *,
+        header_fraction: float = 0.2,
+        header_min_chars: int = 400,
+        header_boost: float = 1.5,
+        embedded_factor: float = 0.3,
+        repeat_bonus: float = 0.1,
+        repeat_cap: float = 1.0,
+        negative_weight: float = 2.0,
+        strong_score: float = 2.0,
+    ):
+        self.header_fraction = header_fraction
+        self.header_min_chars = header_min_chars
+        self.header_boost = header_boost
+        self.embedded_factor = embedded_factor
+        self.repeat_bonus = repeat_bonus
+        self.repeat_cap = repeat_cap
+        self.negative_weight = negative_weight
+        self.strong_score = strong_score
+
+    def score(self, strategy: BaseStrategy, hits_by_keyword: Dict[str, List[int]], text: str) -> float:
+        wanted = [keyword.upper() for keyword in strategy.keywords]
+        if strategy.keyword_mode == "all" and not all(keyword in hits_by_keyword for keyword in wanted):
+            return 0.0
+
+        header_end = max(self.header_min_chars, int(len(text) * self.header_fraction))
+        weights = {key.upper(): value for key, value in getattr(strategy, "keyword_weights", {}).items()}
+        total = 0.0
+        repeats = 0
+        for keyword in wanted:
+            positions = hits_by_keyword.get(keyword)
+            if not positions:
+                continue
+            standalone = [pos for pos in positions if _is_standalone(text, pos, len(keyword))]
+            first = standalone[0] if standalone else positions[0]
+            weight = weights.get(keyword, _default_weight(keyword))
+            if not standalone:
+                weight *= self.embedded_factor
+            if first < header_end:
+                weight *= self.header_boost
+            total += weight
+            repeats += len(standalone) - 1 if standalone else 0
+        if total <= 0:
+            return 0.0
+        total += min(self.repeat_cap, repeats * self.repeat_bonus)
+        for negative in getattr(strategy, "negative_keywords", []) or []:
+            if negative.upper() in hits_by_keyword:
+                total -= self.negative_weight
+        return max(total, 0.0)
+
+    def select(
+        self,
+        strategies: Sequence[BaseStrategy],
+        hits: Sequence[KeywordHit],
+        text: str,
+        fallback: BaseStrategy,
+    ) -> StrategySelection:
+        hits_by_keyword: Dict[str, List[int]] = {}
+        for hit in hits:
+            hits_by_keyword.setdefault(hit.keyword, []).append(hit.position)
+
+        scored = [(self.score(strategy, hits_by_keyword, text), index, strategy) for index, strategy in enumerate(strategies)]
+        scores = {strategy.name: round(value, 3) for value, _, strategy in scored if value > 0}
+        # Highest score first; registry order breaks ties.
+        ranked = sorted((item for item in scored if item[0] > 0), key=lambda item: (-item[0], item[1]))
+        if not ranked:
+            return StrategySelection(strategy=fallback, confidence=0.0, scores=scores)
+
+        best_score, _, best = ranked[0]
+        runner_score, runner = (ranked[1][0], ranked[1][2]) if len(ranked) > 1 else (0.0, None)
+        margin = (best_score - runner_score) / best_score
+        confidence = margin * min(1.0, best_score / self.strong_score)
+        return StrategySelection(strategy=best, confidence=round(confidence, 3), runner_up=runner, scores=scores)
+
+
+def _default_weight(keyword: str) -> float:
+    if " " in keyword.strip():
+        return 1.0 + 0.25 * min(keyword.count(" "), 2)
+    return 0.6 if len(keyword) <= 4 else 0.8
+
+
+def _is_standalone(text: str, position: int, length: int) -> bool:
+    before = text[position - 1] if position > 0 else " "
+    after = text[position + length] if position + length < len(text) else " "
+    return not before.isalnum() and not after.isalnum()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.parsed_document import ParsedDocument
+from utils.text_utils import TextUtils
+
+DEFAULT_TEMPLATE_CACHE = Path(".cache") / "templates.json"
+
+_LABEL_RX = re.compile(r"[A-Z][A-Z /&().'#-]{2,40}:?")
+
+
+class LayoutFingerprint:
+    """Hash of a document's label lines, with values masked out.
+
+    Only short, digit-free, upper-cased lines (and the label part of
+    "Label: value" lines) from the first ``max_lines`` lines are used, so
+    two EDOs rendered from the same carrier template share a fingerprint
+    while different templates almost never do.
+    """
+
+    @staticmethod
+    def labels(document: ParsedDocument, max_lines: int = 40, max_labels: int = 20) -> List[str]:
+        labels: List[str] = []
+        for line in document.upper_lines[:max_lines]:
+            if not line:
+                continue
+            head = line.split(":", 1)[0].strip() if ":" in line else line
+            if len(head.split()) > 5 or not _LABEL_RX.fullmatch(head):
+                continue
+            labels.append(TextUtils.collapse_spaces(head))
+            if len(labels) >= max_labels:
+                break
+        return labels
+
+    @classmethod
+    def of(cls, text: str) -> Optional[str]:
+        labels = cls.labels(ParsedDocument.of(text))
+        if len(labels) < 3:
+            return None
+        return hashlib.sha1("\n".join(labels).encode("utf-8")).hexdigest()
+
+
+class TemplateCache:
+    """Persistent layout fingerprint -> winning strategy cache.
+
+    ``learn`` remembers which strategy extracted a document; ``lookup`` on a
+    document with the same fingerprint names that strategy again, so the
+    caller can skip strategy selection. A fingerprint only covers label
+    lines, so the caller still checks that the strategy's keywords are in
+    the document (StrategyFactory.remembered) before trusting it. The file
+    is rewritten only when a layout is new or its strategy changed.
+    """
+
+    # 3: only the winning strategy is kept; older entries (with field positions) are dropped.
+    _FORMAT_VERSION = 3
+
+    def __init__(self, path: Path | str | None = DEFAULT_TEMPLATE_CACHE, *, max_entries: int = 512):
+        self._path = Path(path) if path is not None else None
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, str] = self._load()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """``(fingerprint, strategy name)`` of the document's layout; the name is None for a new layout."""
+        fingerprint = LayoutFingerprint.of(text)
+        name = self._entries.get(fingerprint) if fingerprint is not None else None
+        with self._lock:
+            if name is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return fingerprint, name
+
+    def learn(self, text: str, strategy_name: str, *, fingerprint: Optional[str] = None) -> bool:
+        """Remember ``strategy_name`` for the layout (``fingerprint`` from ``lookup`` saves recomputing it).
+
+        True when the cache changed and was saved.
+        """
+        fingerprint = fingerprint or LayoutFingerprint.of(text)
+        if fingerprint is None:
+            return False
+        with self._lock:
+            if self._entries.get(fingerprint) == strategy_name:
+                return False
+            self._entries.pop(fingerprint, None)
+            self._entries[fingerprint] = strategy_name
+            while len(self._entries) > self._max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._save()
+        return True
+
+    def forget(self, strategy_names: Sequence[str]) -> int:
+        """Drop the layouts learned from these strategies (e.g. after they were reloaded)."""
+        names = set(strategy_names)
+        with self._lock:
+            stale = [key for key, name in self._entries.items() if name in names]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._save()
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------------- internal helpers ----------------
+
+    def _load(self) -> Dict[str, str]:
+        if self._path is None or not self._path.exists():
+            return {}
+        try:
+            payload = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != self._FORMAT_VERSION:
+            return {}
+        entries = payload.get("entries") or {}
+        return {key: name for key, name in entries.items() if isinstance(name, str)}
+
+    def _save(self) -> None:
+        if self._path is None:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        payload = {"version": self._FORMAT_VERSION, "entries": self._entries}
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self._path)
@@ -1,5 +1,6 @@
 import argparse
 
+from utils.strategy_profile import PROFILER
 from workflow.workflow_manager import WorkflowManager
 
 
@@ -17,10 +18,68 @@ def main():
         action="store_true",
         help="Suppress verbose progress logs.",
     )
+    parser.add_argument(
+        "--memory-profile",
+        action="store_true",
+        help="Trace memory per document and stage (tracemalloc); adds a 'memory' section to the run report.",
+    )
+    parser.add_argument(
+        "--template-cache",
+        action="store_true",
+        help="Reuse the strategy that won for known layouts instead of selecting again (.cache/templates.json).",
+    )
+    parser.add_argument(
+        "--strategy-profile",
+        default=None,
+        metavar="PATH",
+        help="Time strategies and fields (and which fallback tier fired) and write the report as JSON to PATH.",
+    )
+    parser.add_argument(
+        "--regex-budget-ms",
+        type=float,
+        default=None,
+        help="Run unanchored regex searches in bounded windows with this time budget per call.",
+    )
+    parser.add_argument(
+        "--hot-reload",
+        action="store_true",
+        help="Reload carrier strategies whose source changed before each file.",
+    )
+    parser.add_argument(
+        "--shadow",
+        action="append",
+        default=[],
+        metavar="CARRIER=MODULE:CLASS",
+        help="Also run a candidate strategy on sampled documents of CARRIER and compare it (repeatable).",
+    )
+    parser.add_argument(
+        "--shadow-rate",
+        type=float,
+        default=0.1,
+        help="Fraction of a shadowed carrier's documents the candidate runs on (default 0.1).",
+    )
     args = parser.parse_args()
+    shadow = {}
+    for item in args.shadow:
+        carrier, sep, target = item.partition("=")
+        if not sep or ":" not in target:
+            parser.error(f"--shadow expects CARRIER=module:Class, got {item!r}")
+        shadow[carrier.strip()] = target.strip()
 
-    workflow = WorkflowManager(source=args.source, verbose=not args.quiet)
-    results = workflow.run()
+    with WorkflowManager(
+        source=args.source,
+        verbose=not args.quiet,
+        memory_profile=args.memory_profile,
+        template_cache=args.template_cache,
+        strategy_profile=bool(args.strategy_profile),
+        regex_budget_ms=args.regex_budget_ms,
+        hot_reload=args.hot_reload,
+        shadow=shadow,
+        shadow_rate=args.shadow_rate,
+    ) as workflow:
+        results = workflow.run()
+    if args.strategy_profile:
+        PROFILER.dump(args.strategy_profile)
     print(results)
 
 
@@ -1,44 +1,210 @@
 from __future__ import annotations
 
-from typing import List
+import os
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional, Tuple, Union
 import fitz  # PyMuPDF
 
+from edo_parser.infrastructure.extraction_profiles import ExtractionProfile, get_profile
+from edo_parser.infrastructure.pdf_inspection import fitz_document_is_image_only
+from utils.memory_profile import MemoryProfiler
+from utils.spatial_index import SpatialIndex, build_index
+
 
 class PDFReader:
     """Encapsulates PDF → text extraction.
     Upper layers call .read(...) or .read_bytes(...) and receive plain text only.
+
+    ``profile`` selects a named extraction profile ("default", "fast",
+    "layout", "words"); it can also be overridden per call.
+
+    Documents with at least ``parallel_page_threshold`` pages are split into
+    ranges of ``pages_per_chunk`` pages and extracted in parallel, then joined
+    in page order. Pass the pipeline's ``executor`` so page workers count
+    against the pipeline's own concurrency limit (it must not be the pool the
+    caller itself runs in); otherwise the reader owns a process pool capped at
+    ``max_workers``. Set the threshold to 0 to disable page parallelism.
+
+    ``memory_profiler`` (see ``utils.memory_profile``) records the traced
+    memory peak of each PDF stage ("pdf.inspect", "pdf.read", "pdf.layout").
     """
 
-    def read(self, file_path: str) -> str:
+    def __init__(
+        self,
+        profile: str | ExtractionProfile | None = None,
+        *,
+        parallel_page_threshold: int = 24,
+        pages_per_chunk: int = 12,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        memory_profiler: Optional[MemoryProfiler] = None,
+    ):
+        self.profile = get_profile(profile)
+        self.parallel_page_threshold = parallel_page_threshold
+        self.pages_per_chunk = max(1, pages_per_chunk)
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._max_workers = max_workers
+        self.memory = memory_profiler or MemoryProfiler()
+
+    def read(self, file_path: str, profile: str | ExtractionProfile | None = None) -> str:
         """Read text from a local PDF file path."""
         try:
-            with fitz.open(file_path) as doc:
-                return self._extract_text_from_doc(doc)
+            with self.memory.stage("pdf.read"), fitz.open(file_path) as doc:
+                return self._extract(doc, file_path, self._profile(profile))
         except Exception as e:
             print(f"[ERROR] Failed to read PDF from path: {e}")
             return ""
 
-    def read_bytes(self, data: bytes) -> str:
+    def read_bytes(self, data: bytes, profile: str | ExtractionProfile | None = None) -> str:
         """Read text from in-memory PDF bytes (e.g., downloaded via DriveApp)."""
         try:
             if not data:
                 print("[ERROR] Empty PDF data.")
                 return ""
             # filetype 必须给 "pdf"，否则 PyMuPDF 不能正确识别
-            with fitz.open(stream=data, filetype="pdf") as doc:
-                return self._extract_text_from_doc(doc)
+            with self.memory.stage("pdf.read"), fitz.open(stream=data, filetype="pdf") as doc:
+                return self._extract(doc, data, self._profile(profile))
         except Exception as e:
             print(f"[ERROR] Failed to read PDF from bytes: {e}")
             return ""
 
+    def read_pages_bytes(self, data: bytes, profile: str | ExtractionProfile | None = None) -> List[str]:
+        """Like read_bytes, but keep one entry per page (for splitting merged PDFs).
+
+        ``"\\n".join(pages).strip()`` equals what read_bytes returns.
+        """
+        try:
+            if not data:
+                print("[ERROR] Empty PDF data.")
+                return []
+            with self.memory.stage("pdf.read"), fitz.open(stream=data, filetype="pdf") as doc:
+                return [s.strip("\n") for s in self._extract_pages(doc, data, self._profile(profile))]
+        except Exception as e:
+            print(f"[ERROR] Failed to read PDF from bytes: {e}")
+            return []
+
+    def read_layout_bytes(self, data: bytes) -> Optional[SpatialIndex]:
+        """Build a word-level spatial index (one entry per word with its bbox).
+
+        Strategies use it for anchor lookups ("value right of / below label")
+        when it is installed with ``utils.spatial_index.layout_scope``.
+        """
+        try:
+            if not data:
+                return None
+            with self.memory.stage("pdf.layout"), fitz.open(stream=data, filetype="pdf") as doc:
+                return build_index([page.get_text("words") for page in doc])
+        except Exception as e:
+            print(f"[ERROR] Failed to index PDF layout: {e}")
+            return None
+
+    def is_image_only_bytes(self, data: bytes) -> bool:
+        """Cheap pre-check: True when the PDF has no text layer (scanned EDO).
+
+        Only page resources are inspected, so this is far cheaper than read_bytes
+        and lets callers route scans to an OCR lane before any text decoding.
+        """
+        if not data:
+            return False
+        try:
+            with self.memory.stage("pdf.inspect"), fitz.open(stream=data, filetype="pdf") as doc:
+                return fitz_document_is_image_only(doc)
+        except Exception as e:
+            print(f"[ERROR] Failed to inspect PDF bytes: {e}")
+            return False
+
+    def close(self) -> None:
+        """Shut down the page worker pool if this reader created it."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
     # ---------------- internal helpers ----------------
 
+    def _profile(self, profile: str | ExtractionProfile | None) -> ExtractionProfile:
+        return self.profile if profile is None else get_profile(profile)
+
+    def _extract(self, doc: "fitz.Document", source: Union[str, bytes], profile: ExtractionProfile) -> str:
+        return self._join_pages(self._extract_pages(doc, source, profile))
+
+    def _extract_pages(self, doc: "fitz.Document", source: Union[str, bytes], profile: ExtractionProfile) -> List[str]:
+        page_count = doc.page_count
+        if profile.max_pages is not None:
+            page_count = min(page_count, profile.max_pages)
+        if self.parallel_page_threshold <= 0 or page_count < self.parallel_page_threshold:
+            return self._pages_from_doc(doc, profile)
+        if self._owns_executor and (self._max_workers or os.cpu_count() or 1) <= 1:
+            return self._pages_from_doc(doc, profile)
+
+        ranges = [
+            (start, min(start + self.pages_per_chunk, page_count))
+            for start in range(0, page_count, self.pages_per_chunk)
+        ]
+        spooled: Optional[str] = None
+        try:
+            if isinstance(source, bytes):
+                # Workers open the PDF from disk: the bytes are written once
+                # instead of being pickled into every chunk's job.
+                spooled = _spool(source)
+                source = spooled
+            executor = self._get_executor()
+            futures = [executor.submit(_extract_page_range, source, start, stop, profile) for start, stop in ranges]
+            buf: List[str] = []
+            for future in futures:
+                buf.extend(future.result())
+        except Exception as e:
+            print(f"[WARN] Parallel page extraction failed, reading sequentially: {e}")
+            return self._pages_from_doc(doc, profile)
+        finally:
+            if spooled is not None:
+                _unlink(spooled)
+        return buf
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
     @staticmethod
-    def _extract_text_from_doc(doc: "fitz.Document") -> str:
+    def _extract_text_from_doc(doc: "fitz.Document", profile: Optional[ExtractionProfile] = None) -> str:
         """Extract text from a fitz.Document, one page at a time."""
+        return PDFReader._join_pages(PDFReader._pages_from_doc(doc, profile or get_profile(None)))
+
+    @staticmethod
+    def _pages_from_doc(doc: "fitz.Document", profile: ExtractionProfile) -> List[str]:
         buf: List[str] = []
-        for page in doc:
-            # 也可用 page.get_text("text")；默认等价
-            buf.append(page.get_text())
+        for index, page in enumerate(doc):
+            if profile.max_pages is not None and index >= profile.max_pages:
+                break
+            buf.append(profile.page_text(page))
+        return buf
+
+    @staticmethod
+    def _join_pages(buf: List[str]) -> str:
         # 去掉单页末尾换行再合并，保持原有返回习惯
         return "\n".join(s.strip("\n") for s in buf).strip()
+
+
+def _spool(data: bytes) -> str:
+    with tempfile.NamedTemporaryFile(prefix="edo_pages_", suffix=".pdf", delete=False) as handle:
+        handle.write(data)
+    return handle.name
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _extract_page_range(source: Union[str, bytes], start: int, stop: int, profile: ExtractionProfile) -> List[str]:
+    """Worker entry point: open ``source`` privately and extract pages [start, stop)."""
+    if isinstance(source, bytes):
+        doc = fitz.open(stream=source, filetype="pdf")
+    else:
+        doc = fitz.open(source)
+    with doc:
+        return [profile.page_text(doc[index]) for index in range(start, stop)]
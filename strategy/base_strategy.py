@@ -2,9 +2,18 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from functools import wraps
-from typing import Dict, List
+from typing import AbstractSet, Callable, Dict, List
 
+from utils.parsed_document import ParsedDocument
 from utils.port_utils import PortExtractor
+from utils.regex_utils import RegexUtils
+from utils.strategy_profile import NO_TIER, PROFILER
+from .pattern_table import PatternTable
+
+# Profiled by naming convention: ``_extract_<field>`` is timed as that field,
+# and a ``_<field>_from_<tier>`` step that returns a value names the tier.
+_FIELD_METHOD_RX = RegexUtils.compile(r"_extract_(?P<field>[a-z]+)", flags=0)
+_TIER_METHOD_RX = RegexUtils.compile(r"_(?P<field>[a-z]+)_from_(?P<tier>[a-z_]+)", flags=0)
 
 
 class BaseStrategy(ABC):
@@ -12,21 +21,37 @@ class BaseStrategy(ABC):
 
     name: str = "base"
     keywords: List[str] = []
+    # How StrategyFactory resolves keyword hits: "any" keyword or "all" of them.
+    keyword_mode: str = "any"
+    # Scored selection only: per-keyword weight overrides, and phrases that
+    # argue against this carrier (e.g. a partner line named as agent).
+    keyword_weights: Dict[str, float] = {}
+    negative_keywords: List[str] = []
     PORT_FIELD: str = "Port of Discharge"
     PORT_FIELD_ALIASES: List[str] = ["Port of Discharge", "port", "\u505c\u9760\u7801\u5934"]
+    # Regex flags of the ``_*_PATTERNS`` tables, by attribute name (default I|M).
+    PATTERN_FLAGS: Dict[str, int] = {}
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
+        # ``_*_PATTERNS`` string lists become compiled tables once per class.
+        for attr, value in list(cls.__dict__.items()):
+            if attr.endswith("_PATTERNS") and isinstance(value, (list, tuple)) and all(isinstance(p, str) for p in value):
+                setattr(cls, attr, PatternTable(value, cls.PATTERN_FLAGS.get(attr, RegexUtils.DEFAULT_FLAGS)))
+        _profile_lookups(cls)
+
         extract_impl = cls.__dict__.get("extract")
         if not extract_impl or getattr(extract_impl, "_port_wrapped", False):
             return
 
         @wraps(extract_impl)
         def wrapped_extract(self, text: str) -> List[Dict[str, str]]:
-            records = extract_impl(self, text)
-            if not isinstance(records, list):
-                return records
-            port_value = PortExtractor.extract(text)
+            text = ParsedDocument.of(text)
+            with PROFILER.strategy(self.name):
+                records = extract_impl(self, text)
+                if not isinstance(records, list):
+                    return records
+                port_value = PortExtractor.extract(text)
             normalized_port = port_value or ""
             alias_candidates = []
             if cls.PORT_FIELD:
@@ -51,6 +76,31 @@ class BaseStrategy(ABC):
         wrapped_extract._port_wrapped = True  # type: ignore[attr-defined]
         cls.extract = wrapped_extract  # type: ignore[assignment]
 
+    @classmethod
+    def pattern_tables(cls) -> Dict[str, PatternTable]:
+        """Every compiled pattern table of the strategy, carrier template included."""
+        tables: Dict[str, PatternTable] = {}
+        for klass in reversed(cls.__mro__):
+            for attr, value in vars(klass).items():
+                if isinstance(value, PatternTable):
+                    tables[attr] = value
+        template = getattr(cls, "template", None)
+        if template is not None and hasattr(template, "pattern_tables"):
+            tables.update({f"template.{key}": table for key, table in template.pattern_tables().items()})
+        return tables
+
+    @classmethod
+    def pattern_stats(cls) -> Dict[str, Dict[str, int]]:
+        """Hits per pattern, per table, since the process started (or the last reset)."""
+        return {name: table.stats() for name, table in cls.pattern_tables().items()}
+
+    def matches_keywords(self, found: AbstractSet[str]) -> bool:
+        """Keyword-only equivalent of ``match`` given the upper-cased keywords found in a document."""
+        wanted = [keyword.upper() for keyword in self.keywords]
+        if self.keyword_mode == "all":
+            return bool(wanted) and all(keyword in found for keyword in wanted)
+        return any(keyword in found for keyword in wanted)
+
     @abstractmethod
     def match(self, text: str) -> bool:
         raise NotImplementedError
@@ -58,3 +108,45 @@ class BaseStrategy(ABC):
     @abstractmethod
     def extract(self, text: str) -> List[Dict[str, str]]:
         raise NotImplementedError
+
+
+def _profile_lookups(cls: type) -> None:
+    for attr, value in list(cls.__dict__.items()):
+        func = value.__func__ if isinstance(value, staticmethod) else value
+        if not callable(func) or getattr(func, "_profiled", False):
+            continue
+        field_match = _FIELD_METHOD_RX.fullmatch(attr)
+        tier_match = _TIER_METHOD_RX.fullmatch(attr)
+        if field_match:
+            wrapped = _timed_field(func, field_match.group("field"))
+        elif tier_match:
+            wrapped = _marked_tier(func, tier_match.group("tier"))
+        else:
+            continue
+        wrapped._profiled = True  # type: ignore[attr-defined]
+        setattr(cls, attr, staticmethod(wrapped) if isinstance(value, staticmethod) else wrapped)
+
+
+def _timed_field(func: Callable, field: str) -> Callable:
+    @wraps(func)
+    def timed(*args, **kwargs):
+        if not PROFILER.enabled:
+            return func(*args, **kwargs)
+        with PROFILER.field(field) as timer:
+            value = func(*args, **kwargs)
+            if value and timer.tier == NO_TIER:
+                timer.tier = "extract"
+            return value
+
+    return timed
+
+
+def _marked_tier(func: Callable, tier: str) -> Callable:
+    @wraps(func)
+    def marked(*args, **kwargs):
+        value = func(*args, **kwargs)
+        if value and PROFILER.enabled:
+            PROFILER.mark_tier(tier)
+        return value
+
+    return marked
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Pattern, Sequence, Tuple, Union
+
+from utils.parsed_document import ParsedDocument
+from utils.port_utils import PortExtractor
+from utils.regex_utils import RegexUtils
+from utils.spatial_index import current_layout
+from utils.strategy_profile import PROFILER
+from .pattern_table import PatternTable
+
+# Declarative description of how a carrier's fields are read, and the engine
+# that runs it. A carrier lists, per field, the lookups to try in order; the
+# first one yielding a non-empty value wins:
+#
+#   Layout     spatial-index lookup next to a label (only when a layout is set)
+#   Patterns   the first of several regexes that matches (``value`` group)
+#   Between    text between two labels, or the first ``value`` match inside it
+#   Following  lines under the line holding an anchor (optionally above it)
+#   Nearby     a value on its own line near a bare label line such as "PIN"
+#   After      the first ``pattern`` match within ``max_chars`` of an anchor
+#
+# Multi-line results (yard addresses) are trimmed by the field's LineBlock.
+# Fields with a record ``key`` are written into every container's record by
+# ``CarrierTemplate.records``, which also adds the carrier and the port.
+# Everything is compiled once, when the strategy class is defined; prefix
+# lists become a single anchored alternation. Anchor positions come from the
+# document's shared AnchorIndex.
+
+_DEFAULT_FLAGS = RegexUtils.IGNORECASE | RegexUtils.MULTILINE
+_CONTAINER_LINE_RX = RegexUtils.compile(r"[A-Z]{4}\d{7}", flags=0)
+
+
+def _prefix_rx(prefixes: Sequence[str]) -> Optional[Pattern]:
+    if not prefixes:
+        return None
+    return RegexUtils.compile("|".join(RegexUtils.escape(prefix.upper()) for prefix in prefixes), flags=0)
+
+
+@dataclass(frozen=True)
+class LineBlock:
+    """How a multi-line value is cut: lines are taken until a stop line.
+
+    ``skip_prefixes`` / ``skip_exact`` lines are dropped without ending the
+    block; ``stop_prefixes`` and lines containing ``date_pattern`` end it. A
+    blank line ends the block once something was collected, or always with
+    ``blank_ends``.
+    """
+
+    stop_prefixes: Tuple[str, ...] = ()
+    skip_prefixes: Tuple[str, ...] = ()
+    skip_exact: Tuple[str, ...] = ()
+    date_pattern: Optional[str] = None
+    blank_ends: bool = False
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_stop_rx", _prefix_rx(self.stop_prefixes))
+        object.__setattr__(self, "_skip_rx", _prefix_rx(self.skip_prefixes))
+        object.__setattr__(self, "_skip_set", frozenset(value.upper() for value in self.skip_exact))
+        date_rx = RegexUtils.compile(self.date_pattern, flags=0) if self.date_pattern else None
+        object.__setattr__(self, "_date_rx", date_rx)
+
+    def is_skipped(self, upper: str) -> bool:
+        return upper in self._skip_set or (self._skip_rx is not None and self._skip_rx.match(upper) is not None)
+
+    def is_stop(self, upper: str) -> bool:
+        return self._stop_rx is not None and self._stop_rx.match(upper) is not None
+
+    def has_date(self, line: str) -> bool:
+        return self._date_rx is not None and self._date_rx.search(line) is not None
+
+    def clean(self, block: Optional[str]) -> str:
+        """Leading run of value lines from ``block``."""
+        cleaned: List[str] = []
+        for raw in (block or "").splitlines():
+            stripped = raw.strip()
+            if not stripped:
+                if cleaned or self.blank_ends:
+                    break
+                continue
+            upper = stripped.upper()
+            if self.is_skipped(upper):
+                continue
+            if self.is_stop(upper) or self.has_date(stripped):
+                break
+            cleaned.append(stripped)
+        return "\n".join(cleaned).strip()
+
+
+@dataclass(frozen=True)
+class Layout:
+    """``SpatialIndex.below`` / ``right_of`` lookup; skipped without a layout."""
+
+    method: str
+    anchor: str
+    options: Dict[str, object] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Patterns:
+    patterns: Tuple[str, ...]
+    flags: int = _DEFAULT_FLAGS
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "table", PatternTable(self.patterns, self.flags))
+
+    def first(self, text: str) -> str:
+        """Value of the first pattern that matches (not the first non-empty one)."""
+        return self.table.first(text)
+
+
+@dataclass(frozen=True)
+class Between:
+    prefix: str
+    suffix: str
+    value: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Following:
+    """Up to ``max_lines`` lines after the first line containing ``anchor``.
+
+    With ``look_back`` and nothing found below, up to that many lines above
+    the anchor line are tried instead (container numbers skipped).
+    """
+
+    anchor: str
+    max_lines: int = 6
+    block: Optional[LineBlock] = None
+    look_back: int = 0
+
+
+@dataclass(frozen=True)
+class Nearby:
+    """Value on its own line near the first line that is exactly ``label``.
+
+    ``ahead`` / ``behind`` are how many lines to look at below / above it;
+    ``*_skip`` prefixes are passed over, ``*_stop`` prefixes end the search.
+    """
+
+    label: str
+    value: str
+    ahead: int = 0
+    ahead_skip: Tuple[str, ...] = ()
+    ahead_stop: Tuple[str, ...] = ()
+    behind: int = 0
+    behind_skip: Tuple[str, ...] = ()
+    behind_stop: Tuple[str, ...] = ()
+    exclude: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_value_rx", RegexUtils.compile(self.value, flags=0))
+        object.__setattr__(self, "_exclude_rx", RegexUtils.compile(self.exclude, flags=0) if self.exclude else None)
+        for name in ("ahead_skip", "ahead_stop", "behind_skip", "behind_stop"):
+            object.__setattr__(self, f"_{name}_rx", _prefix_rx(getattr(self, name)))
+
+
+@dataclass(frozen=True)
+class After:
+    anchor: str
+    pattern: str
+    max_chars: int = 200
+
+
+Lookup = Union[Layout, Patterns, Between, Following, Nearby, After]
+
+
+@dataclass(frozen=True)
+class FieldTemplate:
+    """Lookups of one field; ``key`` is its record key and ``finish`` tidies the value found."""
+
+    lookups: Tuple[Lookup, ...]
+    block: Optional[LineBlock] = None
+    key: Optional[str] = None
+    finish: Optional[Callable[[str], str]] = None
+
+
+class CarrierTemplate:
+    """Compiled field templates of one carrier; ``extract`` reads every field.
+
+    All lookups share the document's cached views (upper-cased text, lines),
+    so each field costs only the lookups it actually needs.
+    """
+
+    def __init__(self, **fields: FieldTemplate):
+        self.fields: Dict[str, FieldTemplate] = dict(fields)
+
+    def pattern_tables(self) -> Dict[str, PatternTable]:
+        """Compiled ``Patterns`` lookups keyed ``field[index]``."""
+        return {
+            f"{name}[{index}]": lookup.table
+            for name, spec in self.fields.items()
+            for index, lookup in enumerate(spec.lookups)
+            if isinstance(lookup, Patterns)
+        }
+
+    def extract(self, text: str) -> Dict[str, str]:
+        document = ParsedDocument.of(text)
+        return {name: self.extract_field(document, name) for name in self.fields}
+
+    def records(
+        self,
+        text: str,
+        carrier: str,
+        pairs: Optional[Sequence[Tuple[str, Dict[str, str]]]] = None,
+    ) -> List[Dict[str, str]]:
+        """One record per container: carrier, container, every keyed field, then the port.
+
+        Each field is read once per document and shared by all records.
+        ``pairs`` of ``(container, values)`` replace the container scan, and
+        their values win over the template's (a PIN printed per container);
+        a field every pair supplies is not looked up at all.
+        """
+        document = ParsedDocument.of(text)
+        if not pairs:
+            pairs = [(container, {}) for container in RegexUtils.iso_container_candidates(document)]
+        if not pairs:
+            return []
+        keyed = [(name, spec) for name, spec in self.fields.items() if spec.key is not None]
+        shared = {
+            spec.key: self.value(document, name)
+            for name, spec in keyed
+            if any(spec.key not in values for _, values in pairs)
+        }
+        port = PortExtractor.extract(document)
+
+        results: List[Dict[str, str]] = []
+        for container, values in pairs:
+            record = {"Shipping Line": carrier, "\u67dc\u53f7": container}
+            for _, spec in keyed:
+                record[spec.key] = values[spec.key] if spec.key in values else shared[spec.key]
+            record["Port of Discharge"] = port
+            record["\u505c\u9760\u7801\u5934"] = port
+            results.append(record)
+        return results
+
+    def value(self, text: str, name: str) -> str:
+        """``extract_field`` passed through the field's ``finish``."""
+        value = self.extract_field(text, name)
+        finish = self.fields[name].finish
+        return finish(value) if finish is not None else value
+
+    def extract_field(self, text: str, name: str) -> str:
+        document = ParsedDocument.of(text)
+        # Layout lookups depend on the active layout, so it is part of the key.
+        return document.derived((self, name, current_layout()), lambda: self._extract_field(document, name))
+
+    def _extract_field(self, document: ParsedDocument, name: str) -> str:
+        spec = self.fields[name]
+        with PROFILER.field(name) as timer:
+            for index, lookup in enumerate(spec.lookups):
+                value = _run(lookup, document, spec.block)
+                if value:
+                    timer.tier = f"{index}:{type(lookup).__name__}"
+                    return value
+        return ""
+
+
+# ---------------- internal helpers ----------------
+
+
+def _clean(block: Optional[LineBlock], value: Optional[str]) -> str:
+    return block.clean(value) if block is not None else (value or "")
+
+
+def _run(lookup: Lookup, document: ParsedDocument, block: Optional[LineBlock]) -> str:
+    if isinstance(lookup, Patterns):
+        return _clean(block, lookup.first(document))
+    if isinstance(lookup, After):
+        return (RegexUtils.after(document, lookup.anchor, lookup.pattern, lookup.max_chars) or "").strip()
+    if isinstance(lookup, Between):
+        between = RegexUtils.extract_between(document, lookup.prefix, lookup.suffix)
+        if lookup.value is not None:
+            return RegexUtils.find_first(between or "", lookup.value) or ""
+        return _clean(block, between)
+    if isinstance(lookup, Following):
+        return _following(lookup, document, lookup.block or block)
+    if isinstance(lookup, Nearby):
+        return _nearby(lookup, document)
+    if isinstance(lookup, Layout):
+        layout = current_layout()
+        if layout is None:
+            return ""
+        return _clean(block, getattr(layout, lookup.method)(lookup.anchor, **lookup.options))
+    raise TypeError(f"Unknown template lookup: {lookup!r}")
+
+
+def _following(lookup: Following, document: ParsedDocument, block: Optional[LineBlock]) -> str:
+    block = block or LineBlock()
+    idx = document.anchors.first(lookup.anchor)
+    if idx is None:
+        return ""
+
+    lines = document.lines
+    collected: List[str] = []
+    for raw in lines[document.line_at(idx) + 1:]:
+        stripped = raw.strip()
+        if not stripped:
+            break
+        upper = stripped.upper()
+        if block.is_skipped(upper):
+            continue
+        if block.is_stop(upper) or block.has_date(stripped):
+            break
+        collected.append(stripped)
+        if len(collected) >= lookup.max_lines:
+            break
+    if collected or not lookup.look_back:
+        return "\n".join(collected).strip()
+
+    pos = document.anchors.first_line(lookup.anchor)
+    collected_rev: List[str] = []
+    for look_back in range(pos - 1, max(pos - 1 - lookup.look_back, -1), -1):
+        candidate = lines[look_back].strip()
+        if not candidate:
+            if collected_rev:
+                break
+            continue
+        if block.is_stop(candidate.upper()):
+            if collected_rev:
+                break
+            continue
+        if block.has_date(candidate):
+            break
+        if _CONTAINER_LINE_RX.fullmatch(candidate):
+            continue
+        collected_rev.append(candidate)
+    collected_rev.reverse()
+    return "\n".join(collected_rev).strip()
+
+
+def _nearby(lookup: Nearby, document: ParsedDocument) -> str:
+    label = lookup.label.upper()
+    lines = document.lines
+    stripped = document.stripped_lines
+    candidates = (hit.line for hit in document.anchors.hits(label))
+    idx = next((i for i in candidates if stripped[i].upper() == label), None)
+    if idx is None:
+        return ""
+    windows = (
+        (range(idx + 1, min(idx + 1 + lookup.ahead, len(lines))), lookup._ahead_skip_rx, lookup._ahead_stop_rx),
+        (range(idx - 1, max(idx - 1 - lookup.behind, -1), -1), lookup._behind_skip_rx, lookup._behind_stop_rx),
+    )
+    for positions, skip_rx, stop_rx in windows:
+        for position in positions:
+            candidate = lines[position].strip()
+            if not candidate:
+                continue
+            upper = candidate.upper()
+            if skip_rx is not None and skip_rx.match(upper):
+                continue
+            if stop_rx is not None and stop_rx.match(upper):
+                break
+            if lookup._value_rx.fullmatch(candidate) and not (
+                lookup._exclude_rx is not None and lookup._exclude_rx.fullmatch(candidate)
+            ):
+                return candidate
+    return ""
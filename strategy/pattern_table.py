@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterator, Optional, Pattern, Sequence, Tuple
+
+from utils.parsed_document import ParsedDocument
+from utils.regex_guard import current_guard
+from utils.regex_utils import RegexUtils
+
+try:  # Python 3.11+
+    from re import _constants as _sre_constants, _parser as _sre_parse
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants as _sre_constants
+    import sre_parse as _sre_parse
+
+_ZERO_WIDTH = (_sre_constants.AT, _sre_constants.ASSERT, _sre_constants.ASSERT_NOT)
+
+
+class PatternTable(tuple):
+    """An ordered list of regexes compiled once, with a hit counter per pattern.
+
+    Strategies declare tables as ``_*_PATTERNS`` lists of strings;
+    ``BaseStrategy.__init_subclass__`` swaps each list for a PatternTable, so
+    ``first`` / ``matches`` never go back to the ``re`` module cache. It is
+    still a tuple of the source strings, so older code that iterates a table
+    and compiles each entry itself keeps working. Counters are best-effort
+    telemetry (not locked).
+
+    Most patterns open with a fixed label ("EMPTY RETURN ", "PIN", ...). On a
+    ParsedDocument such a pattern is not searched over the whole text: it is
+    only tried at the label's offsets from the document's shared AnchorIndex,
+    which yields the same (leftmost) match as ``search``. The table order
+    still decides which pattern wins.
+    """
+
+    def __new__(cls, patterns: Sequence[str], flags: int = RegexUtils.DEFAULT_FLAGS):
+        return super().__new__(cls, patterns)
+
+    def __init__(self, patterns: Sequence[str], flags: int = RegexUtils.DEFAULT_FLAGS):
+        self.flags = flags
+        self.compiled: Tuple[Pattern, ...] = tuple(RegexUtils.compile(pattern, flags) for pattern in self)
+        self.hits = [0] * len(self)
+        # Upper-cased literal every match starts with ("" when there is none).
+        self.prefixes: Tuple[str, ...] = tuple(_literal_prefix(pattern, flags) for pattern in self)
+
+    def matches(self, text: str) -> Iterator[re.Match]:
+        """Match of every pattern that matches ``text``, in table order."""
+        source = text or ""
+        for index in range(len(self)):
+            match = self._search(index, source)
+            if match:
+                self.hits[index] += 1
+                yield match
+
+    def first_match(self, text: str) -> Optional[re.Match]:
+        """Match of the first pattern (in table order) that matches ``text``."""
+        return next(self.matches(text), None)
+
+    def first(self, text: str) -> str:
+        """Value of the first pattern that matches: ``value`` group, else group 1, else the match."""
+        match = self.first_match(text)
+        if match is None:
+            return ""
+        if "value" in match.groupdict():
+            return (match.group("value") or "").strip()
+        if match.groups():
+            return match.group(1).strip()
+        return match.group(0).strip()
+
+    def stats(self) -> Dict[str, int]:
+        return dict(zip(self, self.hits))
+
+    def reset(self) -> None:
+        self.hits = [0] * len(self)
+
+    def __repr__(self) -> str:
+        return f"<PatternTable {len(self)} patterns, {sum(self.hits)} hits>"
+
+    # ---------------- internal helpers ----------------
+
+    def _search(self, index: int, source: str) -> Optional[re.Match]:
+        rx = self.compiled[index]
+        prefix = self.prefixes[index]
+        guard = current_guard()
+        # Offsets in the upper-cased text are only offsets in ``source`` when
+        # the document is caseless-aligned; anything else takes a plain search.
+        if not prefix or not isinstance(source, ParsedDocument) or not source.caseless_aligned:
+            return guard.search(rx, source) if guard else rx.search(source)
+        for offset in source.anchors.offsets(prefix):
+            if guard:
+                match = rx.match(source, offset, offset + guard.window)
+            else:
+                match = rx.match(source, offset)
+            if match:
+                return match
+        return None
+
+
+def _literal_prefix(pattern: str, flags: int) -> str:
+    """Plain ASCII text every match of ``pattern`` starts with, upper-cased.
+
+    Zero-width items before it (``\\b``, look-behinds) are skipped: they do
+    not move the match start. Case-sensitive prefixes are upper-cased too,
+    the offsets found for them are a superset that ``match`` then checks.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except re.error:
+        return ""
+    prefix = []
+    for op, av in parsed:
+        if op is _sre_constants.LITERAL and av < 128:
+            prefix.append(chr(av))
+        elif op in _ZERO_WIDTH and not prefix:
+            continue
+        else:
+            break
+    return "".join(prefix).upper()
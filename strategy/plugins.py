@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import importlib
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from strategy.base_strategy import BaseStrategy
+
+# Third-party carriers register under this group. Each entry point must
+# resolve to a StrategyManifestEntry (or a list of them) defined in a module
+# that is cheap to import; the strategy module itself stays unloaded.
+ENTRY_POINT_GROUP = "edo_parser.strategies"
+MANIFEST_MODULE = "strategy.strategy_shippingline.manifest"
+
+
+@dataclass(frozen=True)
+class StrategyManifestEntry:
+    """What StrategyFactory needs to match a carrier without importing it."""
+
+    name: str
+    target: str  # "package.module:ClassName"
+    keywords: Tuple[str, ...]
+    keyword_mode: str = "any"
+    negative_keywords: Tuple[str, ...] = ()
+    keyword_weights: Dict[str, float] = field(default_factory=dict)
+
+
+class LazyStrategy:
+    """Registry slot for one carrier: manifest data now, the strategy on first use.
+
+    Exposes the keyword attributes of BaseStrategy (so keyword matching and
+    scored selection work on the manifest alone); ``load()`` imports the module
+    and instantiates the strategy, once.
+    """
+
+    def __init__(self, entry: StrategyManifestEntry, instance: Optional[BaseStrategy] = None):
+        self.entry = entry
+        self.name = entry.name
+        self.keywords = list(entry.keywords)
+        self.keyword_mode = entry.keyword_mode
+        self.negative_keywords = list(entry.negative_keywords)
+        self.keyword_weights = dict(entry.keyword_weights)
+        self._instance: Optional[BaseStrategy] = instance
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def load(self) -> BaseStrategy:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = instantiate(self.entry.target)
+        return self._instance
+
+    def matches_keywords(self, found) -> bool:
+        return BaseStrategy.matches_keywords(self, found)  # type: ignore[arg-type]
+
+    def match(self, text: str) -> bool:
+        return self.load().match(text)
+
+    def extract(self, text: str):
+        return self.load().extract(text)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "lazy"
+        return f"<LazyStrategy {self.name} ({self.entry.target}, {state})>"
+
+
+def builtin_manifest(module: Optional[ModuleType] = None) -> List[StrategyManifestEntry]:
+    """Built-in carriers in first-match precedence order (from ``module``, e.g. a fresh copy)."""
+    if module is None:
+        module = importlib.import_module(MANIFEST_MODULE)
+    return list(module.BUILTIN_STRATEGIES)
+
+
+def plugin_manifest(known: Iterable[str] = ()) -> List[StrategyManifestEntry]:
+    """Carriers advertised by installed distributions under ENTRY_POINT_GROUP.
+
+    Scanning installed distributions is the slow part of plugin discovery
+    (tens of ms in a large environment), so callers defer it until needed.
+    """
+    names = set(known)
+    entries: List[StrategyManifestEntry] = []
+    for entry in _entry_point_manifest():
+        if entry.name in names:
+            print(f"[WARN] Strategy plugin '{entry.name}' ignored: name already registered.")
+            continue
+        names.add(entry.name)
+        entries.append(entry)
+    return entries
+
+
+def load_manifest(*, include_entry_points: bool = True) -> List[StrategyManifestEntry]:
+    """Built-in carriers followed by installed plugins."""
+    entries = builtin_manifest()
+    if include_entry_points:
+        entries.extend(plugin_manifest(entry.name for entry in entries))
+    return entries
+
+
+def verify_manifest(entries: Iterable[StrategyManifestEntry]) -> List[str]:
+    """Import every entry and report manifest fields that drifted from the class."""
+    problems: List[str] = []
+    for entry in entries:
+        try:
+            strategy = instantiate(entry.target)
+        except Exception as exc:
+            problems.append(f"{entry.name}: cannot load {entry.target}: {exc}")
+            continue
+        problems.extend(manifest_drift(entry, strategy))
+    return problems
+
+
+def manifest_drift(entry: StrategyManifestEntry, strategy: BaseStrategy) -> List[str]:
+    """Fields where ``entry`` no longer says what the strategy class says."""
+    expected = {
+        "name": strategy.name,
+        "keywords": tuple(strategy.keywords),
+        "keyword_mode": strategy.keyword_mode,
+        "negative_keywords": tuple(strategy.negative_keywords),
+        "keyword_weights": dict(strategy.keyword_weights),
+    }
+    return [
+        f"{entry.name}: manifest {attr}={getattr(entry, attr)!r}, class has {value!r}"
+        for attr, value in expected.items()
+        if getattr(entry, attr) != value
+    ]
+
+
+def instantiate(target: str, module: Optional[ModuleType] = None) -> BaseStrategy:
+    """Strategy for ``"package.module:ClassName"``, from ``module`` when given (e.g. a fresh copy)."""
+    module_name, _, class_name = target.partition(":")
+    if module is None:
+        module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+
+def fresh_module(module_name: str) -> ModuleType:
+    """Execute the current source of ``module_name`` as a new module object.
+
+    The module already in ``sys.modules`` is left untouched, so code still
+    running on it (and instances of its classes) keeps its own globals.
+    Dependencies are taken from ``sys.modules`` as usual; nothing else is
+    re-imported. Source is compiled directly, not from a possibly stale
+    ``.pyc``.
+    """
+    parent_name, _, _ = module_name.rpartition(".")
+    path = importlib.import_module(parent_name).__path__ if parent_name else None
+    spec = importlib.machinery.PathFinder.find_spec(module_name, path)
+    if spec is None or spec.loader is None or not spec.origin:
+        raise ImportError(f"Cannot locate source of {module_name}")
+    module = importlib.util.module_from_spec(spec)
+    source = spec.loader.get_source(module_name)
+    exec(compile(source, spec.origin, "exec"), module.__dict__)
+    return module
+
+
+def publish_module(module: ModuleType) -> None:
+    """Make ``module`` what later imports of its name get."""
+    sys.modules[module.__name__] = module
+    parent_name, _, child = module.__name__.rpartition(".")
+    parent = sys.modules.get(parent_name)
+    if parent is not None:
+        setattr(parent, child, module)
+
+
+def source_path(module_name: str) -> Optional[str]:
+    """Path of the module's source file, without importing it."""
+    module = sys.modules.get(module_name)
+    spec = getattr(module, "__spec__", None)
+    if spec is None:
+        parent_name, _, _ = module_name.rpartition(".")
+        try:
+            path = importlib.import_module(parent_name).__path__ if parent_name else None
+        except ImportError:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(module_name, path)
+    origin = getattr(spec, "origin", None)
+    return origin if origin and os.path.isfile(origin) else None
+
+
+# ---------------- internal helpers ----------------
+
+
+def _entry_point_manifest() -> List[StrategyManifestEntry]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover - Python < 3.8
+        return []
+
+    try:
+        points: Any = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:  # pragma: no cover - Python < 3.10 API
+        points = entry_points().get(ENTRY_POINT_GROUP, [])
+
+    entries: List[StrategyManifestEntry] = []
+    for point in points:
+        try:
+            loaded = point.load()
+        except Exception as exc:
+            print(f"[WARN] Failed to load strategy plugin '{point.name}': {exc}")
+            continue
+        for entry in loaded if isinstance(loaded, (list, tuple)) else [loaded]:
+            if isinstance(entry, StrategyManifestEntry):
+                entries.append(entry)
+            else:
+                print(f"[WARN] Strategy plugin '{point.name}' is not a StrategyManifestEntry; skipped.")
+    return entries
@@ -1,19 +1,44 @@
-from .strategy_anl import ANLStrategy  # noqa: F401
-from .strategy_bal import BALStrategy  # noqa: F401
-from .strategy_cma import CMAStrategy  # noqa: F401
-from .strategy_cosco import COSCOStrategy  # noqa: F401
-from .strategy_evergreen import EvergreenStrategy  # noqa: F401
-from .strategy_hamburg_sud import HamburgSudStrategy  # noqa: F401
-from .strategy_hapag_lloyd import HapagLloydStrategy  # noqa: F401
-from .strategy_hmm import HMMStrategy  # noqa: F401
-from .strategy_maersk import MAERSKStrategy  # noqa: F401
-from .strategy_msc import MSCStrategy  # noqa: F401
-from .strategy_nautical import NauticalStrategy  # noqa: F401
-from .strategy_one import ONEStrategy  # noqa: F401
-from .strategy_oocl import OOCLStrategy  # noqa: F401
-from .strategy_pil import PILStrategy  # noqa: F401
-from .strategy_quay import QUAYStrategy  # noqa: F401
-from .strategy_swire import SWIREStrategy  # noqa: F401
-from .strategy_ts_lines import TSLINEStrategy  # noqa: F401
-from .strategy_yangming import YANGMINGStrategy  # noqa: F401
-from .strategy_zim import ZIMStrategy  # noqa: F401
+"""Carrier strategies, imported on first attribute access (PEP 562).
+
+``from strategy.strategy_shippingline import ANLStrategy`` still works, but
+importing the package no longer imports every carrier module.
+"""
+
+import importlib
+
+_MODULES = {
+    "ANLStrategy": "strategy_anl",
+    "BALStrategy": "strategy_bal",
+    "CMAStrategy": "strategy_cma",
+    "COSCOStrategy": "strategy_cosco",
+    "EvergreenStrategy": "strategy_evergreen",
+    "HamburgSudStrategy": "strategy_hamburg_sud",
+    "HapagLloydStrategy": "strategy_hapag_lloyd",
+    "HMMStrategy": "strategy_hmm",
+    "MAERSKStrategy": "strategy_maersk",
+    "MSCStrategy": "strategy_msc",
+    "NauticalStrategy": "strategy_nautical",
+    "ONEStrategy": "strategy_one",
+    "OOCLStrategy": "strategy_oocl",
+    "PILStrategy": "strategy_pil",
+    "QUAYStrategy": "strategy_quay",
+    "SWIREStrategy": "strategy_swire",
+    "TSLINEStrategy": "strategy_ts_lines",
+    "YANGMINGStrategy": "strategy_yangming",
+    "ZIMStrategy": "strategy_zim",
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
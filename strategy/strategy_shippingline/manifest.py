@@ -0,0 +1,107 @@
+"""Cheap keyword manifest of the built-in carrier strategies.
+
+Importing this module does not import any strategy: StrategyFactory matches
+on these keywords and imports a carrier module only when it is selected.
+Keep each entry in sync with its class: ``python -m benchmarks.golden`` fails
+and StrategyFactory.reload refuses to publish when they drift
+(``strategy.plugins.verify_manifest``). Order is the first-match precedence.
+"""
+
+from strategy.plugins import StrategyManifestEntry
+
+_PACKAGE = "strategy.strategy_shippingline"
+
+BUILTIN_STRATEGIES = [
+    StrategyManifestEntry(
+        "ANL",
+        f"{_PACKAGE}.strategy_anl:ANLStrategy",
+        ("ANL", "CMA-CGM GROUP AGENCIES"),
+    ),
+    StrategyManifestEntry(
+        "BAL",
+        f"{_PACKAGE}.strategy_bal:BALStrategy",
+        ("BAL SHIPPING", "BAL TRANSPORT", "BAL TRANSPORT AGENCY"),
+    ),
+    StrategyManifestEntry(
+        "COSCO",
+        f"{_PACKAGE}.strategy_cosco:COSCOStrategy",
+        ("COSCO SHIPPING", "COSCO SHIPPING LINES", "COSCO CONTAINER LINES"),
+    ),
+    StrategyManifestEntry(
+        "EVERGREEN LINE",
+        f"{_PACKAGE}.strategy_evergreen:EvergreenStrategy",
+        ("EVERGREEN LINE", "EVERGREEN MARINE", "EVERGREEN SHIPPING", "EVERGREEN"),
+    ),
+    StrategyManifestEntry(
+        "HAMBURG SUD",
+        f"{_PACKAGE}.strategy_hamburg_sud:HamburgSudStrategy",
+        ("HAMBURG SUD", "HAMBURG SÜD"),
+    ),
+    StrategyManifestEntry(
+        "HAPAG LLOYD",
+        f"{_PACKAGE}.strategy_hapag_lloyd:HapagLloydStrategy",
+        ("HAPAG-LLOYD", "HAPAG LLOYD", "HAPAG LIOYD", "HAPAG LLOYD (AUSTRALIA)"),
+    ),
+    StrategyManifestEntry(
+        "HMM",
+        f"{_PACKAGE}.strategy_hmm:HMMStrategy",
+        ("HMM", "HYUNDAI MERCHANT MARINE", "HYUNDAI MERCHANT", "HMM AUSTRALIA"),
+    ),
+    StrategyManifestEntry(
+        "ONE",
+        f"{_PACKAGE}.strategy_one:ONEStrategy",
+        ("OCEAN NETWORK EXPRESS",),
+        keyword_mode="all",
+    ),
+    StrategyManifestEntry(
+        "OOCL",
+        f"{_PACKAGE}.strategy_oocl:OOCLStrategy",
+        ("AGENT OOCL", "OOCL", "ORIENT OVERSEAS"),
+        negative_keywords=("COSCO SHIPPING LINES",),
+    ),
+    StrategyManifestEntry(
+        "MAERSK",
+        f"{_PACKAGE}.strategy_maersk:MAERSKStrategy",
+        ("MAERSK", "MAERSK A/S", "AP MOLLER"),
+    ),
+    StrategyManifestEntry(
+        "MSC",
+        f"{_PACKAGE}.strategy_msc:MSCStrategy",
+        ("MEDITERRANEAN SHIPPING COMPANY", "MSC (AUST)", "MSC AUSTRALIA", "MSC"),
+    ),
+    StrategyManifestEntry(
+        "NAUTICAL",
+        f"{_PACKAGE}.strategy_nautical:NauticalStrategy",
+        ("NAUTICAL SHIPPING", "NAUTICAL SHIPPING PTY", "NAUTICAL SHIP", "NAUTICAL"),
+    ),
+    StrategyManifestEntry(
+        "PIL",
+        f"{_PACKAGE}.strategy_pil:PILStrategy",
+        ("PACIFIC INTERNATIONAL LINES", "PIL AUSTRALIA", "PILSHIP.COM.AU"),
+    ),
+    StrategyManifestEntry(
+        "QUAY",
+        f"{_PACKAGE}.strategy_quay:QUAYStrategy",
+        ("QUAY SHIPPING", "QUAY-SHIPPING", "QUAY SHIPPING AUSTRALIA"),
+    ),
+    StrategyManifestEntry(
+        "SWIRE",
+        f"{_PACKAGE}.strategy_swire:SWIREStrategy",
+        ("SWIRE", "SWIRE SHIPPING"),
+    ),
+    StrategyManifestEntry(
+        "TS LINES",
+        f"{_PACKAGE}.strategy_ts_lines:TSLINEStrategy",
+        ("T.S. LINES", "TS LINES", "TSL - IMPORT DELIVERY ORDER"),
+    ),
+    StrategyManifestEntry(
+        "YANG MING",
+        f"{_PACKAGE}.strategy_yangming:YANGMINGStrategy",
+        ("YANG MING", "YM LINE", "YM (AUSTRALIA)"),
+    ),
+    StrategyManifestEntry(
+        "ZIM",
+        f"{_PACKAGE}.strategy_zim:ZIMStrategy",
+        ("ZIM INTEGRATED SHIPPING", "ZIM INTEGRATED", "ZIM"),
+    ),
+]
@@ -6,6 +6,8 @@ from utils.text_utils import TextUtils
 from ..base_strategy import BaseStrategy
 
 
+_BL_NUMBER_RX = RegexUtils.compile(r"[0-9]{7,}", flags=0)
+
 class HapagLloydStrategy(BaseStrategy):
     """Extraction strategy for Hapag-Lloyd delivery orders."""
 
@@ -37,7 +39,7 @@ class HapagLloydStrategy(BaseStrategy):
         cleaned: List[str] = []
         for line in lines:
             upper = line.upper()
-            if upper.startswith("HL") and RegexUtils.search(r"[0-9]{7,}", line):
+            if upper.startswith("HL") and _BL_NUMBER_RX.search(line):
                 continue
             if "TURN-IN-REFERENCE" in upper:
                 continue
@@ -2,6 +2,7 @@ from typing import Dict, List
 from utils.port_utils import PortExtractor
 
 from utils.regex_utils import RegexUtils
+from utils.spatial_index import current_layout
 from utils.text_utils import TextUtils
 from ..base_strategy import BaseStrategy
 
@@ -27,8 +28,22 @@ class HMMStrategy(BaseStrategy):
                 return candidate
         return ""
 
+    @staticmethod
+    def _yard_from_layout() -> str:
+        """Facility code and name from the cells under their column headers."""
+        layout = current_layout()
+        if layout is None:
+            return ""
+        cells = [layout.below("*Facility"), layout.below("EQ Return Facility Name")]
+        parts = [cell.replace("...", "").strip(" .") for cell in cells]
+        return TextUtils.collapse_spaces(" ".join(part for part in parts if part))
+
     @staticmethod
     def _extract_yard(text: str) -> str:
+        yard = HMMStrategy._yard_from_layout()
+        if yard:
+            return yard
+
         block = RegexUtils.extract_between(text, "Location", "Notice") or ""
         lines = [line.strip(" :") for line in block.splitlines() if line.strip()]
 
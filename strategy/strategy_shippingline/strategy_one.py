@@ -11,6 +11,7 @@ class ONEStrategy(BaseStrategy):
 
     name = "ONE"
     keywords = ["OCEAN NETWORK EXPRESS"]
+    keyword_mode = "all"
 
     _PIN_PATTERNS: List[str] = [
         r"\bPIN(?: NUMBER)?\s*[:\-]?\s*(?P<value>[A-Z0-9]{4,12})",
@@ -21,6 +22,9 @@ class ONEStrategy(BaseStrategy):
         r"PLACE OF EMPTY RETURN\s*[:\-]?\s*(?P<value>[\sA-Z0-9'&,./()-]{3,120})",
     ]
 
+    _PIN_VALUE_RX = RegexUtils.compile(r"[A-Z0-9]{4,12}", flags=0)
+    _TEL_RX = RegexUtils.compile(r"\(TEL.*?$", flags=RegexUtils.IGNORECASE)
+
     _YARD_STOP_PREFIXES: List[str] = [
         "SEAL",
         "TOTAL",
@@ -35,37 +39,23 @@ class ONEStrategy(BaseStrategy):
         t = (text or "").upper()
         return all(keyword.upper() in t for keyword in self.keywords)
 
-    @staticmethod
-    def _match_first(text: str, patterns: List[str], flags: int = RegexUtils.IGNORECASE | RegexUtils.MULTILINE) -> str:
-        source = text or ""
-        for pattern in patterns:
-            rx = RegexUtils.compile(pattern, flags)
-            match = rx.search(source)
-            if not match:
-                continue
-            groups = match.groupdict()
-            if "value" in groups:
-                return groups["value"].strip()
-            if match.groups():
-                return match.group(1).strip()
-            return match.group(0).strip()
-        return ""
-
     def _extract_pin(self, text: str) -> str:
-        pin = self._match_first(text, self._PIN_PATTERNS, flags=RegexUtils.IGNORECASE | RegexUtils.MULTILINE)
+        pin = self._PIN_PATTERNS.first(text)
         if pin:
             return pin
+        return self._pin_from_lines(text)
 
+    def _pin_from_lines(self, text: str) -> str:
         lines = (text or "").splitlines()
         for idx, raw in enumerate(lines):
             if "PIN" not in raw.upper():
                 continue
             candidate = raw.split(":", 1)[-1].strip()
-            if RegexUtils.fullmatch(r"[A-Z0-9]{4,12}", candidate, flags=0):
+            if self._PIN_VALUE_RX.fullmatch(candidate):
                 return candidate
             if idx + 1 < len(lines):
                 candidate_next = lines[idx + 1].strip()
-                if RegexUtils.fullmatch(r"[A-Z0-9]{4,12}", candidate_next, flags=0):
+                if self._PIN_VALUE_RX.fullmatch(candidate_next):
                     return candidate_next
         return ""
 
@@ -114,7 +104,7 @@ class ONEStrategy(BaseStrategy):
         address = " ".join(address_parts).strip()
 
         if address:
-            address = RegexUtils.sub(r"\(TEL.*?$", "", address, flags=RegexUtils.IGNORECASE).strip()
+            address = self._TEL_RX.sub("", address).strip()
 
         if location:
             if address and address in location:
@@ -62,7 +62,9 @@ class PILStrategy(BaseStrategy):
         pin = self._match_first(text)
         if pin:
             return pin
+        return self._pin_from_lines(text)
 
+    def _pin_from_lines(self, text: str) -> str:
         lines = [(line or "").strip() for line in (text or "").splitlines()]
         for idx, raw in enumerate(lines):
             if not raw:
@@ -79,10 +81,7 @@ class PILStrategy(BaseStrategy):
         return ""
 
     def _match_first(self, text: str) -> str:
-        for pattern in self._PIN_PATTERNS:
-            m = RegexUtils.search(pattern, text or "", flags=RegexUtils.IGNORECASE | RegexUtils.MULTILINE)
-            if not m:
-                continue
+        for m in self._PIN_PATTERNS.matches(text):
             groups = m.groupdict()
             candidate = (groups.get("value") or m.group(0)).strip().upper()
             if self._PIN_RX.fullmatch(candidate):
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from edo_parser.core.document_reader import DocumentContent, DocumentReadError, DocumentReader
+from edo_parser.infrastructure.content_sniffer import (
+    EMAIL,
+    HEADER_BYTES,
+    JPEG,
+    OLE,
+    PDF,
+    PNG,
+    ZIP,
+    sniff_bytes,
+    sniff_content_type,
+)
+from edo_parser.readers.factory import DocumentReaderFactory
+
+
+def _write(tmp_path: Path, name: str, data: bytes) -> Path:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+@pytest.mark.parametrize(
+    "name, data, expected",
+    [
+        ("scan.pdf", b"\x89PNG\r\n\x1a\n" + b"\x00" * 32, PNG),
+        ("order.txt", b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n", PDF),
+        ("photo.pdf", b"\xff\xd8\xff\xe0" + b"\x00" * 16, JPEG),
+        ("bundle.pdf", b"PK\x03\x04" + b"\x00" * 16, ZIP),
+        ("mail.pdf", b"Received: from mx.example.com\r\nFrom: a@example.com\r\n", EMAIL),
+        ("legacy.pdf", b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\x00" * 16, OLE),
+    ],
+)
+def test_header_wins_over_a_wrong_suffix(tmp_path, name, data, expected):
+    assert sniff_content_type(_write(tmp_path, name, data)) == expected
+
+
+def test_truncated_pdf_is_still_a_pdf(tmp_path):
+    assert sniff_content_type(_write(tmp_path, "cut.bin", b"%PDF-")) == PDF
+
+
+def test_truncated_signature_is_unknown(tmp_path):
+    assert sniff_content_type(_write(tmp_path, "cut.pdf", b"%PD")) is None
+    assert sniff_content_type(_write(tmp_path, "cut.png", b"\x89PNG")) is None
+
+
+def test_junk_before_the_pdf_header_is_tolerated():
+    assert sniff_bytes(b"\x00" * 100 + b"%PDF-1.4\n") == PDF
+    assert sniff_bytes(b"\x00" * HEADER_BYTES + b"%PDF-1.4\n") is None
+
+
+def test_suffix_decides_only_for_empty_or_missing_files(tmp_path):
+    assert sniff_content_type(_write(tmp_path, "empty.pdf", b"")) == PDF
+    assert sniff_content_type(tmp_path / "missing.msg") == OLE
+    assert sniff_content_type(_write(tmp_path, "empty.docx", b"")) is None
+    assert sniff_content_type(_write(tmp_path, "text.pdf", b"plain text, not a pdf")) is None
+
+
+class _PdfOnlyReader(DocumentReader):
+    content_types = (PDF,)
+
+    def supports(self, source: Path) -> bool:
+        return False
+
+    def read(self, source: Path) -> DocumentContent:
+        return DocumentContent(text="pdf", source=source)
+
+
+def test_factory_dispatches_on_content_not_suffix(tmp_path):
+    factory = DocumentReaderFactory([_PdfOnlyReader()])
+    renamed = _write(tmp_path, "order.dat", b"%PDF-1.4\n")
+    assert factory.read(renamed).text == "pdf"
+
+    mislabeled = _write(tmp_path, "scan.pdf", b"\x89PNG\r\n\x1a\n")
+    with pytest.raises(DocumentReadError):
+        factory.get_reader(mislabeled)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import tracemalloc
+
+import pytest
+
+from utils.memory_profile import MemoryProfiler
+
+_MB = 1024 * 1024
+
+
+@pytest.fixture
+def profiler():
+    profiler = MemoryProfiler(enabled=True, top=5)
+    profiler.start()
+    yield profiler
+    profiler.stop()
+
+
+def test_disabled_profiler_is_a_no_op():
+    profiler = MemoryProfiler()
+    profiler.start()
+    assert not tracemalloc.is_tracing()
+    with profiler.document("a.pdf") as record:
+        with profiler.stage("read"):
+            pass
+    assert record is None
+    assert profiler.report() == {}
+
+
+def test_stage_and_document_peaks_cover_freed_allocations(profiler):
+    with profiler.document("a.pdf") as record:
+        with profiler.stage("read"):
+            buffer = bytearray(2 * _MB)
+            del buffer
+        with profiler.stage("parse"):
+            small = bytearray(_MB // 4)
+            del small
+
+    assert record.stages["read"] >= 2 * _MB
+    assert _MB // 4 <= record.stages["parse"] < 2 * _MB
+    assert record.peak_bytes >= record.stages["read"]
+    report = profiler.report()
+    assert report["max_document_peak_bytes"] == record.peak_bytes
+    assert report["stage_peak_bytes"]["read"] >= 2 * _MB
+    assert [doc["name"] for doc in report["documents"]] == ["a.pdf"]
+
+
+def test_top_sites_name_what_was_alive_at_the_high_water_mark(profiler):
+    kept = []
+    with profiler.document("a.pdf") as record:
+        with profiler.stage("read"):
+            kept.append(bytearray(_MB))
+        kept.clear()
+    assert any("test_memory_profile.py" in site for site in record.top_sites)
+
+
+def test_stop_leaves_tracing_started_by_someone_else():
+    tracemalloc.start()
+    try:
+        profiler = MemoryProfiler(enabled=True)
+        profiler.start()
+        profiler.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pickle
+import re
+
+import pytest
+
+from utils import regex_guard
+from utils.regex_guard import RegexGuard, current_guard, guard_scope
+from utils.regex_utils import RegexUtils
+
+PIN_RX = re.compile(r"PIN:\s*(\d{6})")
+
+
+@pytest.fixture
+def slow_clock(monkeypatch):
+    """Every perf_counter call advances 10 ms, so budgets run out deterministically."""
+    ticks = iter(range(10**6))
+    monkeypatch.setattr(regex_guard.time, "perf_counter", lambda: next(ticks) * 0.010)
+
+
+def test_windowed_search_matches_a_plain_search():
+    guard = RegexGuard(window=64, overlap=16)
+    for offset in range(40, 200, 7):
+        text = "x" * offset + "PIN: 123456" + "y" * 50
+        expected = PIN_RX.search(text)
+        found = guard.search(PIN_RX, text)
+        assert found is not None and found.span() == expected.span()
+        assert found.group(1) == "123456"
+
+
+def test_search_starts_at_the_given_offset():
+    text = "PIN: 111111 ... PIN: 222222"
+    guard = RegexGuard(window=64, overlap=16)
+    assert guard.search(PIN_RX, text, start=5).group(1) == "222222"
+    assert guard.search(PIN_RX, text, end=10) is None
+
+
+def test_exhausted_budget_gives_up_and_is_reported(slow_clock):
+    guard = RegexGuard(budget_ms=25, window=64, overlap=16)
+    text = "x" * 10_000 + "PIN: 123456"
+    assert guard.search(PIN_RX, text) is None
+
+    usage = guard.report()["patterns"][PIN_RX.pattern]
+    assert usage["exhausted"] == 1
+    assert usage["near_budget"] == 1
+    assert usage["max_ms"] >= 25
+
+
+def test_a_match_inside_the_budget_is_still_found(slow_clock):
+    guard = RegexGuard(budget_ms=25, window=64, overlap=16)
+    assert guard.search(PIN_RX, "x" * 60 + "PIN: 123456").group(1) == "123456"
+    assert guard.report()["patterns"][PIN_RX.pattern]["exhausted"] == 0
+
+
+def test_report_lists_only_patterns_near_the_budget():
+    guard = RegexGuard(budget_ms=10_000)
+    guard.search(PIN_RX, "PIN: 123456")
+    report = guard.report()
+    assert report["calls"] == 1
+    assert report["patterns"] == {}
+
+
+def test_pickled_guard_keeps_limits_but_not_telemetry(slow_clock):
+    guard = RegexGuard(budget_ms=5, window=128, overlap=32, near_ratio=0.25)
+    guard.search(PIN_RX, "x" * 1000)
+    copy = pickle.loads(pickle.dumps(guard))
+    assert (copy.budget_ms, copy.window, copy.overlap, copy.near_ratio) == (5, 128, 32, 0.25)
+    assert copy.report()["calls"] == 0
+
+
+def test_overlap_must_be_smaller_than_the_window():
+    with pytest.raises(ValueError):
+        RegexGuard(window=16, overlap=16)
+
+
+def test_guard_scope_routes_regex_utils_searches():
+    guard = RegexGuard()
+    with guard_scope(guard):
+        assert current_guard() is guard
+        assert RegexUtils.find_first("PIN: 654321", PIN_RX) == "PIN: 654321"
+        assert RegexUtils.extract_between("FROM <a> TO", "FROM", "TO") == "<a>"
+    assert current_guard() is None
+    assert guard.report()["calls"] == 2
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import pytest
+
+from extractor import segmenter
+from extractor.segmenter import DocumentSegment, DocumentSegmenter, merge_records, parse_segments
+from utils.spatial_index import SpatialIndex, WordBox
+
+
+def _no_carrier(page: str) -> Optional[str]:
+    return None
+
+
+def _carrier_on_first_line(page: str) -> Optional[str]:
+    first = page.splitlines()[0] if page else ""
+    return first if first in ("ALPHA", "BETA") else None
+
+
+def _bounds(segments: List[DocumentSegment]):
+    return [(segment.start_page, segment.stop_page) for segment in segments]
+
+
+def _split(pages: List[str], carrier_of=_no_carrier):
+    return _bounds(DocumentSegmenter(carrier_of).split(pages))
+
+
+def test_single_and_empty_documents_are_one_segment():
+    assert _split([]) == [(0, 0)]
+    assert _split(["only page"]) == [(0, 1)]
+
+
+def test_page_counter_restart_opens_a_segment():
+    pages = ["Order A\nPage 1 of 2", "Order A\nPage 2 of 2", "Order B\nPAGE: 1 OF 1"]
+    assert _split(pages) == [(0, 2), (2, 3)]
+
+
+def test_page_after_the_last_counted_page_opens_a_segment():
+    pages = ["Order A\nPage 1/1", "Order B without counter"]
+    assert _split(pages) == [(0, 1), (1, 2)]
+
+
+def test_counter_continuity_overrides_a_carrier_change():
+    pages = ["ALPHA\nPage 1 of 3", "BETA\nPage 2 of 3", "BETA\nterms and conditions"]
+    assert _split(pages, _carrier_on_first_line) == [(0, 3)]
+
+
+def test_carrier_change_without_counters_opens_a_segment():
+    pages = ["ALPHA\norder one", "ALPHA\nmore of order one", "BETA\norder two"]
+    assert _split(pages, _carrier_on_first_line) == [(0, 2), (2, 3)]
+
+
+def test_pages_without_a_clear_carrier_join_the_segment():
+    pages = ["ALPHA\norder one", "annex", "ALPHA\nstill order one"]
+    assert _split(pages, _carrier_on_first_line) == [(0, 3)]
+
+
+def test_repeated_header_splits_only_without_counters():
+    first = "DELIVERY ORDER\nB/L 1111\nDate 01/02/2025\nbody"
+    second = "DELIVERY ORDER\nB/L 2222\nDate 03/04/2025\nbody"
+    assert _split([first, "continued", second]) == [(0, 2), (2, 3)]
+    counted = [first + "\nPage 1 of 2", second + "\nPage 2 of 2"]
+    assert _split(counted) == [(0, 2)]
+
+
+def test_weak_keyword_hits_do_not_name_a_carrier():
+    header = "HAPAG-LLOYD (AUSTRALIA) PTY LTD\nDELIVERY ORDER\nB/L NO 123"
+    assert segmenter._carrier_from_keywords(header) == "HAPAG LLOYD"
+    partner = (
+        "DELIVERY ORDER\nB/L NO 123\nCONSIGNEE ACME\nPORT MELBOURNE\nVESSEL XYZ\n"
+        "NOTIFY: HAPAG-LLOYD AGENCY\nMSC CONTAINER"
+    )
+    assert segmenter._carrier_from_keywords(partner) is None
+    prefix = "DELIVERY ORDER\nB/L NO 123\nCONSIGNEE ACME\nPORT MELBOURNE\nContainers: ZIMU1234567"
+    assert segmenter._carrier_from_keywords(prefix) is None
+
+
+def test_single_kept_segment_gets_its_own_layout(monkeypatch):
+    calls: List[SpatialIndex] = []
+
+    def fake_parse_segment(text, layout, *args) -> List[Dict[str, str]]:
+        calls.append(layout)
+        return []
+
+    monkeypatch.setattr(segmenter, "parse_segment", fake_parse_segment)
+    layout = SpatialIndex([WordBox(page, 0, 0, 10, 10, f"W{page}") for page in range(3)])
+    segments = [DocumentSegment(0, 1, ""), DocumentSegment(1, 3, "order text")]
+    parse_segments(segments, layout=layout)
+
+    (seen,) = calls
+    assert seen.pages == [1, 2]
+
+
+@pytest.mark.parametrize("field", ["柜号", "CTN NUMBER"])
+def test_merge_records_keeps_first_value_and_fills_blanks(field):
+    merged = merge_records(
+        [
+            [{field: "abcu1234567", "PIN": "111", "YARD": ""}],
+            [{field: "ABCU1234567 ", "PIN": "222", "YARD": "PATRICK"}, {field: "", "PIN": "333"}],
+        ]
+    )
+    assert merged == [{field: "abcu1234567", "PIN": "111", "YARD": "PATRICK"}, {field: "", "PIN": "333"}]
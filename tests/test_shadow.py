@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import tracemalloc
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Dict, List
+
+import pytest
+
+from extractor import shadow
+from extractor.shadow import ShadowRunner
+from strategy.base_strategy import BaseStrategy
+
+DOCUMENT = "ECHO LINES DELIVERY ORDER PIN: 123456"
+PRIMARY = [{"PIN": "123456"}]
+
+
+class EchoStrategy(BaseStrategy):
+    name = "ECHO"
+    keywords = ["ECHO LINES"]
+    PORT_FIELD = ""
+    PORT_FIELD_ALIASES: List[str] = []
+    extracts = 0
+
+    def match(self, text: str) -> bool:
+        return "ECHO LINES" in text
+
+    def extract(self, text: str) -> List[Dict[str, str]]:
+        type(self).extracts += 1
+        return [{"PIN": text.rsplit(" ", 1)[-1]}]
+
+
+class BrokenStrategy(EchoStrategy):
+    def extract(self, text: str) -> List[Dict[str, str]]:
+        raise RuntimeError("candidate bug")
+
+
+class PendingExecutor(Executor):
+    """Accepts work and never runs it, so queued samples stay pending."""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        return Future()
+
+
+@pytest.fixture
+def runner():
+    runner = ShadowRunner(executor=ThreadPoolExecutor(max_workers=1))
+    yield runner
+    runner.close()
+
+
+def _carrier(runner: ShadowRunner) -> Dict:
+    assert runner.drain(timeout=10)
+    return runner.report()["carriers"]["ECHO"]
+
+
+def test_identical_candidate_is_timed_and_counted(runner):
+    runner.add("ECHO", f"{__name__}:EchoStrategy", sample_rate=1.0)
+    assert runner.submit("ECHO", DOCUMENT, PRIMARY, 0.002)
+    stats = _carrier(runner)
+    assert (stats["sampled"], stats["completed"], stats["identical"], stats["timed"]) == (1, 1, 1, 1)
+    assert stats["primary_mean_ms"] == 2.0
+    assert stats["speedup"] is not None
+
+
+def test_mismatched_fields_are_reported_with_examples(runner):
+    runner.add("ECHO", f"{__name__}:EchoStrategy", sample_rate=1.0)
+    runner.submit("ECHO", DOCUMENT, [{"PIN": "999999", "YARD": "PATRICK"}], 0.001)
+    stats = _carrier(runner)
+    assert stats["mismatched"] == 1
+    assert stats["fields"] == {"PIN": 1, "YARD": 1}
+    assert stats["examples"] == [{"PIN": ["999999", "123456"], "YARD": ["PATRICK", "<missing>"]}]
+
+
+def test_untimed_primary_is_compared_without_latency(runner):
+    runner.add("ECHO", f"{__name__}:EchoStrategy", sample_rate=1.0)
+    runner.submit("ECHO", DOCUMENT, PRIMARY, None)
+    stats = _carrier(runner)
+    assert (stats["completed"], stats["timed"], stats["speedup"]) == (1, 0, None)
+
+
+def test_candidate_errors_are_counted(runner):
+    runner.add("ECHO", f"{__name__}:BrokenStrategy", sample_rate=1.0)
+    runner.submit("ECHO", DOCUMENT, PRIMARY, 0.001)
+    stats = _carrier(runner)
+    assert (stats["errors"], stats["completed"]) == (1, 0)
+    assert stats["last_error"] == "RuntimeError: candidate bug"
+
+
+def test_sampling_is_by_content():
+    runner = ShadowRunner(executor=PendingExecutor(), max_pending=1000)
+    runner.add("ECHO", f"{__name__}:EchoStrategy", sample_rate=0.3)
+    documents = [f"{DOCUMENT} {index}" for index in range(200)]
+    first = [runner.submit("ECHO", doc, PRIMARY, 0.001) for doc in documents]
+    assert first == [runner.submit("ECHO", doc, PRIMARY, 0.001) for doc in documents]
+    assert 30 < sum(first) < 90
+
+
+def test_full_queue_drops_samples():
+    runner = ShadowRunner(executor=PendingExecutor(), max_pending=2)
+    runner.add("ECHO", f"{__name__}:EchoStrategy", sample_rate=1.0)
+    results = [runner.submit("ECHO", f"{DOCUMENT} {index}", PRIMARY, 0.001) for index in range(4)]
+    assert results == [True, True, False, False]
+    report = runner.report()
+    assert report["pending"] == 2
+    assert (report["carriers"]["ECHO"]["sampled"], report["carriers"]["ECHO"]["dropped"]) == (2, 2)
+
+
+def test_unknown_carrier_and_forked_copies_do_not_submit(monkeypatch):
+    runner = ShadowRunner(executor=PendingExecutor())
+    runner.add("ECHO", f"{__name__}:EchoStrategy", sample_rate=1.0)
+    assert not runner.submit("OTHER", DOCUMENT, PRIMARY, 0.001)
+    monkeypatch.setattr(shadow.os, "getpid", lambda: -1)
+    assert not runner.submit("ECHO", DOCUMENT, PRIMARY, 0.001)
+
+
+def test_add_rejects_bad_rates_and_targets():
+    runner = ShadowRunner(executor=PendingExecutor())
+    with pytest.raises(ValueError):
+        runner.add("ECHO", f"{__name__}:EchoStrategy", sample_rate=0)
+    with pytest.raises(AttributeError):
+        runner.add("ECHO", f"{__name__}:MissingStrategy")
+
+
+def test_worker_warms_a_new_candidate_up_once(monkeypatch):
+    monkeypatch.setattr(shadow, "_WORKER_STRATEGIES", {})
+    EchoStrategy.extracts = 0
+    target = f"{__name__}:EchoStrategy"
+    records, seconds = shadow._run_shadow(target, DOCUMENT, None)
+    assert records == PRIMARY and seconds >= 0
+    assert EchoStrategy.extracts == 2
+    shadow._run_shadow(target, DOCUMENT, None)
+    assert EchoStrategy.extracts == 3
+
+
+def test_worker_stops_inherited_allocation_tracing(monkeypatch):
+    monkeypatch.setattr(shadow.os, "nice", lambda increment: 0)
+    tracemalloc.start()
+    try:
+        shadow._init_worker()
+        assert not tracemalloc.is_tracing()
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
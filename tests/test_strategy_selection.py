@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import pytest
+
+from extractor.strategy_factory import StrategyFactory
+from extractor.strategy_selection import StrategyScorer, StrategySelection
+from utils.keyword_automaton import KeywordHit
+
+
+class FakeStrategy:
+    keyword_mode = "any"
+
+    def __init__(self, name: str, keywords: Sequence[str], *, records=None, negative=(), mode="any"):
+        self.name = name
+        self.keywords = list(keywords)
+        self.negative_keywords = list(negative)
+        self.keyword_mode = mode
+        self._records = records or []
+        self.calls = 0
+
+    def extract(self, text) -> List[Dict[str, str]]:
+        self.calls += 1
+        return self._records
+
+
+FALLBACK = FakeStrategy("GENERIC", [])
+
+
+def _hits(text: str, keywords: Sequence[str]) -> List[KeywordHit]:
+    hits = []
+    for keyword in keywords:
+        start = text.find(keyword)
+        while start >= 0:
+            hits.append(KeywordHit(start, keyword))
+            start = text.find(keyword, start + 1)
+    return hits
+
+
+def _select(text: str, *strategies: FakeStrategy, scorer: StrategyScorer | None = None) -> StrategySelection:
+    keywords = {keyword for strategy in strategies for keyword in strategy.keywords + strategy.negative_keywords}
+    return (scorer or StrategyScorer()).select(strategies, _hits(text, keywords), text, FALLBACK)
+
+
+def test_no_keyword_falls_back_with_zero_confidence():
+    selection = _select("DELIVERY ORDER", FakeStrategy("ALPHA", ["ALPHA LINES"]))
+    assert selection.strategy is FALLBACK
+    assert selection.confidence == 0.0
+    assert not selection.is_confident(0.01)
+
+
+def test_header_hit_outweighs_the_same_keyword_further_down():
+    scorer = StrategyScorer(header_min_chars=20, header_fraction=0.1)
+    body = "X" * 200
+    alpha, beta = FakeStrategy("ALPHA", ["ALPHA LINES"]), FakeStrategy("BETA", ["BETA LINES"])
+    selection = _select(f"BETA LINES\n{body}\nALPHA LINES", alpha, beta, scorer=scorer)
+    assert selection.strategy is beta
+    assert selection.runner_up is alpha
+    assert selection.scores["BETA"] > selection.scores["ALPHA"]
+
+
+def test_embedded_hit_weighs_less_than_a_standalone_one():
+    zim, hmm = FakeStrategy("ZIM", ["ZIM"]), FakeStrategy("HMM", ["HMM"])
+    selection = _select("CONTAINER ZIMU1234567 CARRIER HMM", zim, hmm)
+    assert selection.strategy is hmm
+
+
+def test_all_mode_needs_every_keyword_and_negatives_subtract():
+    one = FakeStrategy("ONE", ["OCEAN NETWORK", "EXPRESS"], mode="all")
+    assert _select("OCEAN NETWORK", one).strategy is FALLBACK
+    assert _select("OCEAN NETWORK EXPRESS", one).strategy is one
+
+    oocl = FakeStrategy("OOCL", ["OOCL"], negative=["COSCO SHIPPING LINES"])
+    assert _select("OOCL AGENT FOR COSCO SHIPPING LINES", oocl).strategy is FALLBACK
+
+
+def test_confidence_is_damped_for_a_weak_sole_winner():
+    selection = _select("ISSUED BY ZIM", FakeStrategy("ZIM", ["ZIM"]))
+    assert 0.0 < selection.confidence < 0.5
+    strong = _select("ZIM INTEGRATED SHIPPING SERVICES", FakeStrategy("ZIM", ["ZIM INTEGRATED SHIPPING", "ZIM"]))
+    assert strong.confidence == 1.0
+
+
+@pytest.fixture
+def below_threshold(monkeypatch):
+    filled = [{"柜号": "ABCU1234567", "PIN": "123", "还柜场": "PATRICK"}]
+    best = FakeStrategy("BEST", ["BEST"], records=[{"柜号": "ABCU1234567"}])
+    runner = FakeStrategy("RUNNER", ["RUNNER"], records=filled)
+    selection = StrategySelection(strategy=best, confidence=0.2, runner_up=runner, scores={"BEST": 1.0, "RUNNER": 0.8})
+    monkeypatch.setattr(StrategyFactory, "select", classmethod(lambda cls, text: selection))
+    return best, runner
+
+
+def test_below_threshold_the_runner_up_wins_with_more_fields(below_threshold):
+    best, runner = below_threshold
+    chosen = StrategyFactory.choose("text", min_confidence=0.5)
+    assert chosen.strategy is runner
+    assert chosen.runner_up is best
+    assert chosen.records == runner._records
+    assert (best.calls, runner.calls) == (1, 1)
+
+
+def test_above_threshold_nothing_is_extracted(below_threshold):
+    best, runner = below_threshold
+    chosen = StrategyFactory.choose("text", min_confidence=0.1)
+    assert chosen.strategy is best
+    assert chosen.records is None
+    assert (best.calls, runner.calls) == (0, 0)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+
+from extractor.segmenter import parse_segment
+from extractor.strategy_factory import StrategyFactory
+from extractor.template_cache import LayoutFingerprint, TemplateCache
+
+LABELS = "DELIVERY ORDER\nVESSEL: {vessel}\nVOYAGE: {voyage}\nCONTAINER NUMBER\nRELEASE PIN: {pin}\n"
+
+
+def _document(carrier: str, vessel: str = "SEA STAR", voyage: str = "123N", pin: str = "445566") -> str:
+    # The carrier line carries a digit, so it is not a label: every carrier shares the layout.
+    return LABELS.format(vessel=vessel, voyage=voyage, pin=pin) + f"ISSUED 2025 BY {carrier}\n"
+
+
+def test_fingerprint_ignores_values_but_not_labels():
+    first = LayoutFingerprint.of(_document("ACME", voyage="001S", pin="111"))
+    assert first is not None
+    assert LayoutFingerprint.of(_document("ACME", voyage="982W", pin="9999")) == first
+    assert LayoutFingerprint.of(_document("ACME") + "EMPTY RETURN DEPOT\n") != first
+    assert LayoutFingerprint.of(_document("OTHER")) == first
+
+
+def test_too_few_labels_is_never_cached():
+    cache = TemplateCache(None)
+    assert cache.lookup("hello 123\nworld 456") == (None, None)
+    assert not cache.learn("hello 123\nworld 456", "MSC")
+    assert len(cache) == 0
+
+
+def test_miss_then_hit_for_the_same_layout():
+    cache = TemplateCache(None)
+    fingerprint, name = cache.lookup(_document("ACME"))
+    assert name is None
+    assert cache.learn(_document("ACME"), "MSC", fingerprint=fingerprint)
+    assert cache.lookup(_document("ACME", pin="000111")) == (fingerprint, "MSC")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_collision_is_refused_and_relearned():
+    msc = _document("MEDITERRANEAN SHIPPING COMPANY")
+    zim = _document("ZIM INTEGRATED SHIPPING SERVICES")
+    cache = TemplateCache(None)
+    cache.learn(msc, "MSC")
+
+    fingerprint, known = cache.lookup(zim)
+    assert known == "MSC"
+    assert StrategyFactory.remembered(known, zim) is None
+    assert StrategyFactory.remembered(known, msc).name == "MSC"
+
+    parse_segment(zim, template_cache=cache)
+    assert cache.lookup(zim) == (fingerprint, "ZIM")
+
+
+def test_relearning_the_same_strategy_does_not_rewrite(tmp_path):
+    path = tmp_path / "templates.json"
+    cache = TemplateCache(path)
+    assert cache.learn(_document("ACME"), "MSC")
+    path.write_text(path.read_text(encoding="utf-8") + " ", encoding="utf-8")
+    assert not cache.learn(_document("ACME", pin="1"), "MSC")
+    assert path.read_text(encoding="utf-8").endswith(" ")
+
+
+def test_entries_survive_a_reload_and_corrupt_files_start_empty(tmp_path):
+    path = tmp_path / "templates.json"
+    TemplateCache(path).learn(_document("ACME"), "MSC")
+    assert TemplateCache(path).lookup(_document("ACME"))[1] == "MSC"
+
+    path.write_text("{not json", encoding="utf-8")
+    assert len(TemplateCache(path)) == 0
+    path.write_text(json.dumps({"version": 2, "entries": {"abc": {"strategy": "MSC"}}}), encoding="utf-8")
+    assert len(TemplateCache(path)) == 0
+
+
+def test_oldest_layout_is_evicted_and_forget_drops_by_strategy():
+    cache = TemplateCache(None, max_entries=2)
+    layouts = [_document("ACME") + f"{label}\n" for label in ("ALPHA DEPOT", "BETA DEPOT", "GAMMA DEPOT")]
+    for layout, name in zip(layouts, ("MSC", "ZIM", "MSC")):
+        cache.learn(layout, name)
+    assert len(cache) == 2
+    assert cache.lookup(layouts[0])[1] is None
+    assert cache.forget(["MSC"]) == 1
+    assert cache.lookup(layouts[1])[1] == "ZIM"
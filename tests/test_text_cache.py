@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from edo_parser.core.document_reader import DocumentContent, DocumentReader
+from edo_parser.infrastructure.content_sniffer import PDF
+from edo_parser.infrastructure.pdf_text_extractor import PdfTextExtractor
+from edo_parser.infrastructure.text_cache import TextCache
+from edo_parser.readers.cached_reader import CachingDocumentReader
+from edo_parser.readers.factory import DocumentReaderFactory
+
+
+class CountingReader(DocumentReader):
+    content_types = (PDF,)
+    cache_namespace = "counting"
+
+    def __init__(self):
+        self.reads = 0
+
+    def supports(self, source: Path) -> bool:
+        return True
+
+    def read(self, source: Path) -> DocumentContent:
+        self.reads += 1
+        return DocumentContent(text=f"text of {Path(source).name}", source=Path(source))
+
+
+class CountingBackend:
+    backend_id = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def extract_text(self, source: Path) -> str:
+        self.calls += 1
+        return "DELIVERY ORDER CONTAINER ABCU1234567"
+
+
+def _pdf(tmp_path: Path, name: str, body: bytes = b"") -> Path:
+    path = tmp_path / name
+    path.write_bytes(b"%PDF-1.4\n" + body)
+    return path
+
+
+def test_round_trip_is_keyed_by_namespace(tmp_path):
+    cache = TextCache(tmp_path / "cache")
+    cache.put("ab" * 32, "pymupdf", "hello")
+    assert cache.get("ab" * 32, "pymupdf") == "hello"
+    assert cache.get("ab" * 32, "pypdf2") is None
+
+
+def test_corrupt_entry_is_a_miss_and_discarded(tmp_path):
+    cache = TextCache(tmp_path / "cache")
+    key = "cd" * 32
+    cache.put(key, "ns", "hello")
+    (entry,) = (tmp_path / "cache").glob("*/*/*.txt.z")
+    entry.write_bytes(b"not zlib at all")
+    assert cache.get(key, "ns") is None
+    assert not entry.exists()
+    assert cache.size_bytes() == 0
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    texts = {f"{index:02d}" * 32: os.urandom(400).hex() for index in range(4)}
+    cache = TextCache(tmp_path / "cache", max_bytes=3000, compression_level=0)
+    keys = list(texts)
+    for age, key in enumerate(keys[:3]):
+        cache.put(key, "ns", texts[key])
+        (entry,) = (tmp_path / "cache").glob(f"*/*/{key}.txt.z")
+        os.utime(entry, (1000 + age, 1000 + age))
+    # Reading the oldest entry makes it the most recently used one.
+    assert cache.get(keys[0], "ns") == texts[keys[0]]
+    cache.put(keys[3], "ns", texts[keys[3]])
+
+    assert cache.size_bytes() <= 3000
+    assert cache.get(keys[1], "ns") is None
+    assert cache.get(keys[0], "ns") == texts[keys[0]]
+    assert cache.get(keys[3], "ns") == texts[keys[3]]
+
+
+def test_entry_larger_than_the_cap_is_not_stored(tmp_path):
+    cache = TextCache(tmp_path / "cache", max_bytes=10, compression_level=0)
+    cache.put("ef" * 32, "ns", "x" * 100)
+    assert cache.get("ef" * 32, "ns") is None
+    assert cache.size_bytes() == 0
+
+
+def test_caching_reader_hits_on_same_content_under_another_name(tmp_path):
+    inner = CountingReader()
+    reader = CachingDocumentReader(inner, TextCache(tmp_path / "cache"))
+    first = _pdf(tmp_path, "a.pdf", b"same bytes")
+    renamed = _pdf(tmp_path, "b.pdf", b"same bytes")
+
+    assert reader.read(first).text == "text of a.pdf"
+    assert reader.read(renamed).text == "text of a.pdf"
+    assert (inner.reads, reader.hits, reader.misses) == (1, 1, 1)
+
+
+def test_factory_wraps_readers_only_with_a_text_cache(tmp_path):
+    path = _pdf(tmp_path, "a.pdf")
+    inner = CountingReader()
+    assert DocumentReaderFactory([inner]).get_reader(path) is inner
+
+    factory = DocumentReaderFactory([inner], text_cache=TextCache(tmp_path / "cache"))
+    factory.read(path)
+    factory.read(path)
+    assert isinstance(factory.get_reader(path), CachingDocumentReader)
+    assert inner.reads == 1
+
+
+def test_extractor_cache_skips_the_backend_on_a_hit(tmp_path):
+    backend = CountingBackend()
+    extractor = PdfTextExtractor(backend, cache=TextCache(tmp_path / "cache"))
+    path = _pdf(tmp_path, "a.pdf")
+
+    assert extractor.extract_text(path) == extractor.extract_text(path)
+    assert backend.calls == 1
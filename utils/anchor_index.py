@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from utils.keyword_automaton import KeywordAutomaton
+
+if TYPE_CHECKING:
+    from utils.parsed_document import ParsedDocument
+
+# Labels most strategies (and PortExtractor) look for; they are located in a
+# single automaton pass when the index is built. Other anchors are found on
+# first use and cached alongside.
+DEFAULT_ANCHORS: Tuple[str, ...] = (
+    "PIN",
+    "INTERIM PIN",
+    "PIN CODE",
+    "EMPTY RETURN",
+    "EMPTY RETURN LOCATION",
+    "PLACE OF EMPTY RETURN",
+    "RETURN LOCATION",
+    "RETURN DEPOT",
+    "DEPOT",
+    "PICKUP DEPOT",
+    "EMPTY CONTAINER",
+    "EMPTY CONTAINER RETURN DEPOT",
+    "EMPTY CONTAINER TO BE RETURNED TO",
+    "PORT OF DISCHARGE",
+    "REMARKS",
+    "TURN-IN-REF",
+    "PAGE",
+    "TYPE",
+    "CARGO",
+    "STATUS",
+)
+
+_DEFAULT_AUTOMATON = KeywordAutomaton(DEFAULT_ANCHORS)
+
+
+class AnchorHit(NamedTuple):
+    offset: int
+    line: int
+
+
+class AnchorIndex:
+    """Every occurrence of the common anchors in one upper-cased document.
+
+    Offsets are positions in the upper-cased text and ``line`` is the index
+    into the document's lines. ``ParsedDocument.anchors`` builds one per
+    document on first use, so ``RegexUtils.after`` / ``extract_between``,
+    ``TextUtils.find_first_index``, the carrier templates and PortExtractor
+    all share the same scan instead of each searching the text again.
+    """
+
+    def __init__(self, upper: "ParsedDocument"):
+        self._document = upper
+        self._offsets: Dict[str, List[int]] = {anchor: [] for anchor in _DEFAULT_AUTOMATON.keywords}
+        for hit in _DEFAULT_AUTOMATON.scan(upper):
+            self._offsets[hit.keyword].append(hit.position)
+        self._pattern_lines: Dict[Pattern, Tuple[int, ...]] = {}
+        self._lock = threading.Lock()
+
+    def offsets(self, anchor: str) -> List[int]:
+        """Start offsets of every (possibly overlapping) occurrence of ``anchor``."""
+        key = anchor.upper()
+        found = self._offsets.get(key)
+        if found is None:
+            found = _find_all(self._document, key)
+            with self._lock:
+                self._offsets.setdefault(key, found)
+        return found
+
+    def hits(self, anchor: str) -> List[AnchorHit]:
+        return [AnchorHit(offset, self._document.line_at(offset)) for offset in self.offsets(anchor)]
+
+    def first(self, anchor: str, start: int = 0) -> Optional[int]:
+        """Offset of the first occurrence at or after ``start``."""
+        found = self.offsets(anchor)
+        i = bisect_left(found, start)
+        return found[i] if i < len(found) else None
+
+    def last(self, anchor: str, start: int = 0) -> Optional[int]:
+        found = self.offsets(anchor)
+        return found[-1] if found and found[-1] >= start else None
+
+    def first_line(self, anchor: str) -> Optional[int]:
+        """Index of the first line that contains ``anchor``."""
+        offset = self.first(anchor)
+        return None if offset is None else self._document.line_at(offset)
+
+    def lines_matching(self, pattern: Pattern) -> Tuple[int, ...]:
+        """Sorted indexes of the lines where ``pattern`` matches the upper-cased text."""
+        lines = self._pattern_lines.get(pattern)
+        if lines is None:
+            document = self._document
+            lines = tuple(sorted({document.line_at(match.start()) for match in pattern.finditer(document)}))
+            with self._lock:
+                self._pattern_lines.setdefault(pattern, lines)
+        return lines
+
+
+def _find_all(text: str, needle: str) -> List[int]:
+    found: List[int] = []
+    if not needle:
+        return found
+    position = text.find(needle)
+    while position >= 0:
+        found.append(position)
+        position = text.find(needle, position + 1)
+    return found
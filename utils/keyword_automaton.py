@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Pattern, Set, Tuple
+
+
+class KeywordHit(NamedTuple):
+    position: int
+    keyword: str
+
+
+class KeywordAutomaton:
+    """Finds every occurrence of many keywords in one pass over the text.
+
+    The keywords are folded into a trie, and the trie is compiled into a single
+    zero-width regex, ``(?=(...))``. ``finditer`` then visits each text position
+    once inside the C regex engine and reports the longest keyword starting
+    there; shorter keywords starting at the same position are exactly its
+    prefixes, which are precomputed. The scan cost therefore depends on the
+    text length, not on how many keywords (or carriers) are registered.
+
+    Matching is case-sensitive on the normalized (upper-cased) keywords, so
+    callers scan upper-cased text.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        ordered: List[str] = []
+        for keyword in keywords:
+            normalized = (keyword or "").upper()
+            if normalized and normalized not in ordered:
+                ordered.append(normalized)
+        self._keywords: Tuple[str, ...] = tuple(ordered)
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(other for other in ordered if keyword.startswith(other)) for keyword in ordered
+        }
+        self._rx: Pattern | None = re.compile(f"(?=({_trie_pattern(ordered)}))") if ordered else None
+
+    @property
+    def keywords(self) -> Tuple[str, ...]:
+        return self._keywords
+
+    def scan(self, text: str) -> List[KeywordHit]:
+        """Every ``(position, keyword)`` occurrence, ordered by position, longest first."""
+        if self._rx is None or not text:
+            return []
+        hits: List[KeywordHit] = []
+        for match in self._rx.finditer(text):
+            position = match.start()
+            longest = match.group(1)
+            for keyword in sorted(self._prefixes[longest], key=len, reverse=True):
+                hits.append(KeywordHit(position, keyword))
+        return hits
+
+    def found(self, text: str) -> Set[str]:
+        """Keywords that occur anywhere in ``text``."""
+        return {hit.keyword for hit in self.scan(text)}
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex for a set of literals with shared prefixes factored out (longest branch first)."""
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: Dict) -> str:
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # A keyword ends here; longer continuations are tried first (greedy).
+        return f"(?:{body})?"
+    return body
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass(eq=False)
+class _Frame:
+    name: str
+    baseline: int
+    peak: int = 0
+    snapshot: Optional[tracemalloc.Snapshot] = None
+    high_water: int = 0
+    high_snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+@dataclass
+class DocumentMemory:
+    """Peak traced bytes for one document, per stage, plus its top allocation sites.
+
+    ``top_sites`` compares the document's start against the moment (at a stage
+    boundary) when it held the most memory, so it lists what was alive then.
+    """
+
+    name: str
+    peak_bytes: int = 0
+    stages: Dict[str, int] = field(default_factory=dict)
+    top_sites: List[str] = field(default_factory=list)
+
+
+class MemoryProfiler:
+    """Opt-in tracemalloc profiling of documents and the stages inside them.
+
+    Usage::
+
+        profiler = MemoryProfiler(enabled=True)
+        profiler.start()
+        with profiler.document("a.pdf"):
+            with profiler.stage("read"):
+                ...
+        report = profiler.report()
+
+    Peaks are measured above the traced memory at entry, so they show what a
+    document (or stage) adds on top of what was already alive. When disabled
+    every call is a cheap no-op, so callers never need to branch.
+    """
+
+    def __init__(self, enabled: bool = False, *, frames: int = 10, top: int = 10):
+        self.enabled = enabled
+        self._frames = frames
+        self._top = top
+        self._started_here = False
+        self._stack: List[_Frame] = []
+        self._current: Optional[DocumentMemory] = None
+        self._document_frame: Optional[_Frame] = None
+        self._stage_peaks: Dict[str, int] = {}
+        self.documents: List[DocumentMemory] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+            self._started_here = True
+
+    def stop(self) -> None:
+        if self._started_here:
+            tracemalloc.stop()
+            self._started_here = False
+
+    @contextmanager
+    def document(self, name: str) -> Iterator[Optional[DocumentMemory]]:
+        if not self._active():
+            yield None
+            return
+        with self._lock:
+            record = DocumentMemory(name=name)
+            self._current = record
+            frame = self._push(name, snapshot=True)
+            self._document_frame = frame
+        try:
+            yield record
+        finally:
+            with self._lock:
+                self._pop(frame)
+                record.peak_bytes = frame.peak
+                record.top_sites = self._top_sites(frame)
+                self.documents.append(record)
+                self._current = None
+                self._document_frame = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self._active():
+            yield
+            return
+        with self._lock:
+            frame = self._push(name)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pop(frame)
+                if self._current is not None:
+                    self._current.stages[name] = max(self._current.stages.get(name, 0), frame.peak)
+                    self._remember_high_water()
+                self._stage_peaks[name] = max(self._stage_peaks.get(name, 0), frame.peak)
+
+    def report(self) -> Dict[str, Any]:
+        """Summary for the run report; empty when profiling was not enabled."""
+        if not self.enabled:
+            return {}
+        with self._lock:
+            documents = list(self.documents)
+            stage_peaks = dict(self._stage_peaks)
+        return {
+            "max_document_peak_bytes": max((doc.peak_bytes for doc in documents), default=0),
+            "stage_peak_bytes": stage_peaks,
+            "documents": [
+                {
+                    "name": doc.name,
+                    "peak_bytes": doc.peak_bytes,
+                    "stages": dict(doc.stages),
+                    "top_sites": list(doc.top_sites),
+                }
+                for doc in documents
+            ],
+        }
+
+    # ---------------- internal helpers ----------------
+
+    def _active(self) -> bool:
+        return self.enabled and tracemalloc.is_tracing()
+
+    def _fold(self) -> None:
+        """Charge the peak since the last reset to every open frame, then reset it."""
+        _, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            frame.peak = max(frame.peak, peak - frame.baseline)
+        tracemalloc.reset_peak()
+
+    def _push(self, name: str, *, snapshot: bool = False) -> _Frame:
+        self._fold()
+        current, _ = tracemalloc.get_traced_memory()
+        frame = _Frame(name=name, baseline=current)
+        if snapshot:
+            frame.snapshot = self._snapshot()
+        self._stack.append(frame)
+        return frame
+
+    def _pop(self, frame: _Frame) -> None:
+        self._fold()
+        if frame in self._stack:
+            self._stack.remove(frame)
+
+    def _remember_high_water(self) -> None:
+        frame = self._document_frame
+        if frame is None or self._top <= 0:
+            return
+        current, _ = tracemalloc.get_traced_memory()
+        if current > frame.high_water:
+            frame.high_water = current
+            frame.high_snapshot = self._snapshot()
+
+    def _top_sites(self, frame: _Frame) -> List[str]:
+        if frame.snapshot is None or self._top <= 0:
+            return []
+        after = frame.high_snapshot or self._snapshot()
+        diffs = after.compare_to(frame.snapshot, "lineno")
+        return [str(stat) for stat in diffs[: self._top] if stat.size_diff > 0]
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+        )
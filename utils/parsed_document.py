@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from utils.anchor_index import AnchorIndex
+
+# Characters that fold into ASCII letters differently under upper() and
+# lower() (long s, dotless i, Kelvin sign, dotted capital I).
+_CASE_FOLD_TRAPS = frozenset("\u017f\u0131\u212a\u0130")
+
+T = TypeVar("T")
+
+
+class ParsedDocument(str):
+    """Document text plus views that every strategy used to recompute.
+
+    It *is* the text (a ``str`` subclass), so it can be handed to any code that
+    expects a plain string. ``upper()`` and ``splitlines()`` are served from
+    caches, and the upper-cased view is itself a ParsedDocument whose
+    ``upper()`` is a no-op, so ``match(text.upper())`` followed by another
+    ``.upper()`` inside the strategy costs nothing. Build one per document with
+    ``ParsedDocument.of(text)`` and pass it through match, extract and port
+    extraction.
+
+    ``derived`` memoizes fields computed from the text (port, containers,
+    template fields), so the BaseStrategy wrapper and the strategy itself
+    share one run of each extractor.
+    """
+
+    @classmethod
+    def of(cls, text: "str | None") -> "ParsedDocument":
+        if isinstance(text, ParsedDocument):
+            return text
+        return cls(text or "")
+
+    @property
+    def text(self) -> str:
+        """The original text as a plain ``str``."""
+        return str.__str__(self)
+
+    @cached_property
+    def upper_text(self) -> "ParsedDocument":
+        upper = str.upper(self)
+        if upper == self:
+            return self
+        doc = ParsedDocument(upper)
+        doc.__dict__["upper_text"] = doc
+        return doc
+
+    @cached_property
+    def caseless_aligned(self) -> bool:
+        """True when offsets in the upper-cased text are offsets in this text and
+        case-insensitive matching of ASCII labels agrees with upper-case matching."""
+        if self.isascii():
+            return True
+        if len(str.upper(self)) != len(self) or len(str.lower(self)) != len(self):
+            return False
+        return _CASE_FOLD_TRAPS.isdisjoint(self)
+
+    @cached_property
+    def anchors(self) -> "AnchorIndex":
+        """Anchor occurrences of the upper-cased text, shared with ``upper()``."""
+        if self.upper_text is not self:
+            return self.upper_text.anchors
+        from utils.anchor_index import AnchorIndex
+
+        return AnchorIndex(self)
+
+    @cached_property
+    def lines(self) -> Tuple[str, ...]:
+        return tuple(str.splitlines(self))
+
+    @cached_property
+    def stripped_lines(self) -> Tuple[str, ...]:
+        return tuple(line.strip() for line in self.lines)
+
+    @cached_property
+    def upper_lines(self) -> Tuple[str, ...]:
+        """Stripped, upper-cased lines (aligned with ``lines``)."""
+        if self.upper_text is self:
+            return self.stripped_lines
+        return self.upper_text.stripped_lines
+
+    @cached_property
+    def line_offsets(self) -> Tuple[int, ...]:
+        """Character offset at which each line starts."""
+        offsets: List[int] = []
+        position = 0
+        for chunk in str.splitlines(self, True):
+            offsets.append(position)
+            position += len(chunk)
+        return tuple(offsets)
+
+    def line_at(self, offset: int) -> int:
+        """Index of the line containing character ``offset``."""
+        return max(0, bisect_right(self.line_offsets, offset) - 1)
+
+    def derived(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """``compute()`` once per document and ``key``; later calls reuse the value."""
+        memo: Dict[Hashable, Any] = self.__dict__.setdefault("_derived", {})
+        try:
+            return memo[key]
+        except KeyError:
+            value = memo[key] = compute()
+            return value
+
+    # Cached overrides of the str methods strategies call most.
+
+    def upper(self) -> "ParsedDocument":  # type: ignore[override]
+        return self.upper_text
+
+    def splitlines(self, keepends: bool = False) -> List[str]:  # type: ignore[override]
+        if keepends:
+            return str.splitlines(self, True)
+        return list(self.lines)
+
+    def __reduce__(self):
+        return ParsedDocument, (self.text,)
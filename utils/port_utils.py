@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import ClassVar, Iterable, Sequence
+from typing import Callable, ClassVar, Dict, Iterable, Sequence
 
+from utils.parsed_document import ParsedDocument
 from utils.regex_utils import RegexUtils
 from utils.text_utils import TextUtils
 
@@ -15,6 +16,16 @@ class PortExtractor:
         r"(?P<value>[A-Z0-9 ,./()&'\\-]{3,80})",
         flags=RegexUtils.IGNORECASE,
     )
+    # Superset of what _INLINE_REGEX and the heading sets can match, on upper-cased text.
+    _HEADING_HINT_REGEX = RegexUtils.compile(
+        r"PORT|DEST|P[^A-Z0-9\n\r\v\f\x1c-\x1e\x85\u2028\u2029]*O[^A-Z0-9\n\r\v\f\x1c-\x1e\x85\u2028\u2029]*D",
+        flags=0,
+    )
+    _CONTAINER_RX = RegexUtils.compile(r"[A-Z]{4}\d{7}", flags=RegexUtils.IGNORECASE)
+    _REFERENCE_RX = RegexUtils.compile(r"[A-Z0-9]{6,}", flags=RegexUtils.IGNORECASE)
+    _NUMERIC_DATE_RX = RegexUtils.compile(r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}", flags=RegexUtils.IGNORECASE)
+    _MONTH_DATE_RX = RegexUtils.compile(r"[A-Z]{3}\s+\d{1,2}\s+\d{4}", flags=RegexUtils.IGNORECASE)
+    _PORT_WORD_RX = RegexUtils.compile(r"\bPORT\b", flags=RegexUtils.IGNORECASE)
     _ACCEPTED_HEADINGS: ClassVar[set[str]] = {
         "PORT OF DISCHARGE",
         "DISCHARGE PORT",
@@ -138,9 +149,18 @@ class PortExtractor:
     def extract(cls, text: str) -> str:
         if not text:
             return ""
+        if isinstance(text, ParsedDocument):
+            # Strategies and the BaseStrategy wrapper both ask; run once per document.
+            return text.derived((cls, "port"), lambda: cls._extract(text))
+        return cls._extract(ParsedDocument.of(text))
 
-        lines = [cls._sanitize_line(line) for line in text.splitlines()]
-        for idx, line in enumerate(lines):
+    @classmethod
+    def _extract(cls, document: ParsedDocument) -> str:
+        lines = _SanitizedLines(document.lines, cls._sanitize_line)
+        # Only lines mentioning a port heading can yield an inline value or
+        # start a heading scan; the document's anchor index lists them.
+        for idx in document.anchors.lines_matching(cls._HEADING_HINT_REGEX):
+            line = lines[idx]
             if not line:
                 continue
 
@@ -248,17 +268,17 @@ class PortExtractor:
             return ""
         if "/" in stripped and "PORT" not in upper:
             return ""
-        if RegexUtils.fullmatch(r"[A-Z]{4}\d{7}", stripped, flags=RegexUtils.IGNORECASE):
+        if cls._CONTAINER_RX.fullmatch(stripped):
             return ""
         if (
-            RegexUtils.fullmatch(r"[A-Z0-9]{6,}", stripped, flags=RegexUtils.IGNORECASE)
+            cls._REFERENCE_RX.fullmatch(stripped)
             and " " not in stripped
             and any(ch.isdigit() for ch in stripped)
         ):
             return ""
-        if RegexUtils.fullmatch(r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}", stripped, flags=RegexUtils.IGNORECASE):
+        if cls._NUMERIC_DATE_RX.fullmatch(stripped):
             return ""
-        if RegexUtils.fullmatch(r"[A-Z]{3}\s+\d{1,2}\s+\d{4}", stripped, flags=RegexUtils.IGNORECASE):
+        if cls._MONTH_DATE_RX.fullmatch(stripped):
             return ""
         digit_count = sum(1 for ch in stripped if ch.isdigit())
         if digit_count >= 4:
@@ -281,7 +301,7 @@ class PortExtractor:
         upper = value.upper()
         score = 0
 
-        if RegexUtils.search(r"\bPORT\b", upper, flags=RegexUtils.IGNORECASE):
+        if cls._PORT_WORD_RX.search(upper):
             score += 3
         elif "HARBOUR" in upper or "HARBOR" in upper:
             score += 3
@@ -314,3 +334,21 @@ class PortExtractor:
     def _normalize_heading(value: str) -> str:
         cleaned = "".join(ch if ch.isalnum() or ch.isspace() or ch in {"/"} else " " for ch in (value or "").upper())
         return TextUtils.collapse_spaces(cleaned).rstrip(":")
+
+
+class _SanitizedLines(Sequence[str]):
+    """Lines sanitized on first access; most lines are never looked at."""
+
+    def __init__(self, lines: Sequence[str], sanitize: Callable[[str], str]):
+        self._lines = lines
+        self._sanitize = sanitize
+        self._cache: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __getitem__(self, idx):  # type: ignore[override]
+        value = self._cache.get(idx)
+        if value is None:
+            value = self._cache[idx] = self._sanitize(self._lines[idx])
+        return value
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Pattern
+
+
+@dataclass
+class PatternUsage:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    near_budget: int = 0
+    exhausted: int = 0
+
+
+class RegexGuard:
+    """Bounded regex execution for text we do not trust (long OCR output).
+
+    ``search`` never hands the engine more than ``window`` characters at a
+    time: it walks the text in windows that overlap by ``overlap``
+    characters, starting at ``start`` (usually the keyword's offset), and
+    gives up once the call has used ``budget_ms``. ``re`` cannot be
+    interrupted mid-match, so the budget is checked between windows; the
+    window size is what bounds a single step. A match up to ``overlap``
+    characters long comes out as it would from a plain search, and a longer
+    one must fit in a window.
+
+    Every guarded call is recorded per pattern; ``report()`` lists the
+    patterns that used at least ``near_ratio`` of the budget or ran out of
+    it.
+    """
+
+    def __init__(
+        self,
+        budget_ms: float = 25.0,
+        *,
+        window: int = 2048,
+        overlap: int = 512,
+        near_ratio: float = 0.5,
+    ):
+        if not 0 <= overlap < window:
+            raise ValueError("overlap must be smaller than window")
+        self.budget_ms = budget_ms
+        self.window = window
+        self.overlap = overlap
+        self.near_ratio = near_ratio
+        self._usage: Dict[str, PatternUsage] = {}
+        self._lock = threading.Lock()
+
+    def search(self, rx: Pattern, text: str, start: int = 0, end: Optional[int] = None) -> Optional[re.Match]:
+        """``rx.search(text, start, end)`` in bounded windows, within the budget."""
+        text = text or ""
+        end = len(text) if end is None else min(end, len(text))
+        started = time.perf_counter()
+        deadline = started + self.budget_ms / 1000
+        step = self.window - self.overlap
+        pos = max(start, 0)
+        found: Optional[re.Match] = None
+        exhausted = False
+        while pos <= end:
+            stop = min(pos + self.window, end)
+            match = rx.search(text, pos, stop)
+            last = stop >= end
+            if match and (last or match.start() < stop - self.overlap):
+                # Re-run from the match start so a value cut by the window
+                # edge gets a full window.
+                found = rx.match(text, match.start(), min(match.start() + self.window, end)) or match
+                break
+            if last:
+                break
+            if time.perf_counter() > deadline:
+                exhausted = True
+                break
+            pos += step
+        self._record(rx, time.perf_counter() - started, exhausted)
+        return found
+
+    def report(self) -> Dict[str, Any]:
+        """Patterns that came near (or hit) the budget, slowest first."""
+        near = self.budget_ms * self.near_ratio / 1000
+        with self._lock:
+            items = sorted(self._usage.items(), key=lambda item: item[1].max_seconds, reverse=True)
+            return {
+                "budget_ms": self.budget_ms,
+                "calls": sum(usage.calls for _, usage in items),
+                "patterns": {
+                    pattern: {
+                        "calls": usage.calls,
+                        "total_ms": round(usage.seconds * 1000, 3),
+                        "max_ms": round(usage.max_seconds * 1000, 3),
+                        "near_budget": usage.near_budget,
+                        "exhausted": usage.exhausted,
+                    }
+                    for pattern, usage in items
+                    if usage.max_seconds >= near or usage.exhausted
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._usage.clear()
+
+    def __reduce__(self):
+        # Process-pool workers get a guard with the same limits; their
+        # telemetry stays in the worker.
+        return _rebuild, (self.budget_ms, self.window, self.overlap, self.near_ratio)
+
+    # ---------------- internal helpers ----------------
+
+    def _record(self, rx: Pattern, seconds: float, exhausted: bool) -> None:
+        with self._lock:
+            usage = self._usage.setdefault(rx.pattern, PatternUsage())
+            usage.calls += 1
+            usage.seconds += seconds
+            usage.max_seconds = max(usage.max_seconds, seconds)
+            if seconds * 1000 >= self.budget_ms * self.near_ratio:
+                usage.near_budget += 1
+            if exhausted:
+                usage.exhausted += 1
+
+
+def _rebuild(budget_ms: float, window: int, overlap: int, near_ratio: float) -> RegexGuard:
+    return RegexGuard(budget_ms, window=window, overlap=overlap, near_ratio=near_ratio)
+
+
+_CURRENT_GUARD: ContextVar[Optional[RegexGuard]] = ContextVar("edo_regex_guard", default=None)
+
+
+@contextmanager
+def guard_scope(guard: Optional[RegexGuard]) -> Iterator[Optional[RegexGuard]]:
+    """Route RegexUtils' unbounded searches through ``guard`` for the enclosed calls."""
+    token = _CURRENT_GUARD.set(guard)
+    try:
+        yield guard
+    finally:
+        _CURRENT_GUARD.reset(token)
+
+
+def current_guard() -> Optional[RegexGuard]:
+    return _CURRENT_GUARD.get()
@@ -1,6 +1,9 @@
 import re
 from typing import Iterator, List, Optional, Pattern
 
+from utils.parsed_document import ParsedDocument
+from utils.regex_guard import RegexGuard, current_guard
+
 RegexPattern = str | Pattern
 
 
@@ -57,10 +60,30 @@ class RegexUtils:
         rx = RegexUtils._ensure_pattern(pattern, flags)
         return rx.sub(repl, text or "")
 
+    @staticmethod
+    def guarded_search(
+        pattern: RegexPattern,
+        text: str,
+        *,
+        flags: int = 0,
+        start: int = 0,
+        end: Optional[int] = None,
+        guard: Optional[RegexGuard] = None,
+    ) -> Optional[re.Match]:
+        """``search`` in bounded windows from ``start`` (e.g. a keyword's offset), within a time budget.
+
+        Uses ``guard``, else the one active via ``guard_scope``, else a
+        default guard (see RegexGuard for the exact semantics).
+        """
+        rx = RegexUtils._ensure_pattern(pattern, flags)
+        guard = guard or current_guard() or _DEFAULT_GUARD
+        return guard.search(rx, text or "", start, end)
+
     @staticmethod
     def find_first(text: str, pattern: RegexPattern, *, flags: int | None = None) -> Optional[str]:
         rx = RegexUtils._ensure_pattern(pattern, RegexUtils.DEFAULT_FLAGS if flags is None else flags)
-        match = rx.search(text or "")
+        guard = current_guard()
+        match = guard.search(rx, text or "") if guard else rx.search(text or "")
         return match.group(0).strip() if match else None
 
     @staticmethod
@@ -77,23 +100,49 @@ class RegexUtils:
 
     @staticmethod
     def extract_between(text: str, prefix: str, suffix: str, greedy: bool = False) -> Optional[str]:
+        if _indexed(text, prefix) and _indexed(text, suffix):
+            anchors = text.anchors
+            start = anchors.first(prefix)
+            if start is None:
+                return None
+            start += len(prefix)
+            end = anchors.last(suffix, start) if greedy else anchors.first(suffix, start)
+            return text[start:end].strip() if end is not None else None
         pat = RegexUtils.escape(prefix) + (r"(.*)" if greedy else r"(.*?)") + RegexUtils.escape(suffix)
-        match = RegexUtils.search(pat, text or "", flags=RegexUtils.IGNORECASE | RegexUtils.DOTALL)
+        flags = RegexUtils.IGNORECASE | RegexUtils.DOTALL
+        if current_guard() is not None:
+            # ``(.*?)`` with no suffix in sight rescans to the end of the text
+            # for every prefix hit; guarded, each attempt sees one window.
+            match = RegexUtils.guarded_search(pat, text or "", flags=flags)
+        else:
+            match = RegexUtils.search(pat, text or "", flags=flags)
         return match.group(1).strip() if match else None
 
     @staticmethod
-    def after(text: str, anchor: str, pattern: str, max_chars: int = 200) -> Optional[str]:
-        i = (text or "").lower().find(anchor.lower())
+    def after(text: str, anchor: str, pattern: RegexPattern, max_chars: int = 200) -> Optional[str]:
+        if _indexed(text, anchor):
+            i = text.anchors.first(anchor)
+            i = -1 if i is None else i
+        else:
+            i = (text or "").lower().find(anchor.lower())
         if i < 0:
             return None
         window = (text or "")[i:i + max_chars]
-        match = RegexUtils.search(pattern, window, flags=RegexUtils.IGNORECASE)
+        if current_guard() is not None:
+            match = RegexUtils.guarded_search(pattern, window, flags=RegexUtils.IGNORECASE)
+        else:
+            match = RegexUtils.search(pattern, window, flags=RegexUtils.IGNORECASE)
         return match.group(0).strip() if match else None
 
     @staticmethod
     def iso_container_candidates(text: str) -> List[str]:
-        pat = r"\b([A-Z]{4})\s*([0-9]{7})\b"
-        rx = RegexUtils.compile(pat, flags=RegexUtils.IGNORECASE)
+        if isinstance(text, ParsedDocument):
+            return list(text.derived("containers", lambda: RegexUtils._iso_container_candidates(text)))
+        return RegexUtils._iso_container_candidates(text)
+
+    @staticmethod
+    def _iso_container_candidates(text: str) -> List[str]:
+        rx = _ISO_CONTAINER_RX
         out: List[str] = []
         for match in rx.finditer(text or ""):
             out.append((match.group(1) + match.group(2)).upper())
@@ -103,3 +152,12 @@ class RegexUtils:
                 seen.add(container)
                 dedup.append(container)
         return dedup
+
+
+_DEFAULT_GUARD = RegexGuard()
+_ISO_CONTAINER_RX = re.compile(r"\b([A-Z]{4})\s*([0-9]{7})\b", re.IGNORECASE)
+
+
+def _indexed(text: str, anchor: str) -> bool:
+    """Whether ``anchor`` can be looked up in the document's shared AnchorIndex."""
+    return isinstance(text, ParsedDocument) and bool(anchor) and anchor.isascii() and text.caseless_aligned
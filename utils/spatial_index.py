@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+LineKey = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class WordBox:
+    """One word with its bounding box, as reported by the PDF toolkit."""
+
+    page: int
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    text: str
+    block: int = 0
+    line: int = 0
+    word: int = 0
+
+    @property
+    def line_key(self) -> LineKey:
+        return self.page, self.block, self.line
+
+
+class SpatialIndex:
+    """Per-page grid index of words for layout-aware anchor lookups.
+
+    Words are bucketed into ``cell_size`` x ``cell_size`` cells so queries such
+    as "value right of / below this label" only touch nearby cells instead of
+    rescanning every line of the document.
+    """
+
+    def __init__(self, words: Iterable[WordBox], *, cell_size: float = 64.0):
+        self._words: List[WordBox] = list(words)
+        self._cell = cell_size
+        self._grid: Dict[Tuple[int, int, int], List[int]] = {}
+        self._lines: Dict[LineKey, List[WordBox]] = {}
+        self._by_text: Dict[str, List[int]] = {}
+        self._extent: Dict[int, Tuple[float, float]] = {}
+        for idx, word in enumerate(self._words):
+            for key in self._cells(word.page, word.x0, word.y0, word.x1, word.y1):
+                self._grid.setdefault(key, []).append(idx)
+            self._lines.setdefault(word.line_key, []).append(word)
+            self._by_text.setdefault(word.text.upper(), []).append(idx)
+            width, height = self._extent.get(word.page, (0.0, 0.0))
+            self._extent[word.page] = (max(width, word.x1), max(height, word.y1))
+        for line_words in self._lines.values():
+            line_words.sort(key=lambda w: w.x0)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    @property
+    def pages(self) -> List[int]:
+        return sorted(self._extent)
+
+    def for_pages(self, start: int, stop: int) -> "SpatialIndex":
+        """Sub-index restricted to pages [start, stop), e.g. one segment of a merged PDF."""
+        return SpatialIndex((w for w in self._words if start <= w.page < stop), cell_size=self._cell)
+
+    def find(self, anchor: str) -> List[WordBox]:
+        """Every occurrence of ``anchor`` (case-insensitive, consecutive words on one line).
+
+        Each hit is returned as a single box spanning the matched words, in
+        page / top-to-bottom / left-to-right order.
+        """
+        tokens = anchor.upper().split()
+        if not tokens:
+            return []
+        hits: List[WordBox] = []
+        for idx in self._by_text.get(tokens[0], []):
+            first = self._words[idx]
+            line_words = self._lines[first.line_key]
+            pos = line_words.index(first)
+            run = line_words[pos:pos + len(tokens)]
+            if [w.text.upper() for w in run] != tokens:
+                continue
+            hits.append(
+                WordBox(
+                    page=first.page,
+                    x0=min(w.x0 for w in run),
+                    y0=min(w.y0 for w in run),
+                    x1=max(w.x1 for w in run),
+                    y1=max(w.y1 for w in run),
+                    text=" ".join(w.text for w in run),
+                    block=first.block,
+                    line=first.line,
+                    word=first.word,
+                )
+            )
+        hits.sort(key=lambda w: (w.page, w.y0, w.x0))
+        return hits
+
+    def words_in(self, page: int, x0: float, y0: float, x1: float, y1: float) -> List[WordBox]:
+        """Words on ``page`` whose box intersects the rectangle."""
+        seen: set[int] = set()
+        out: List[WordBox] = []
+        for key in self._cells(page, x0, y0, x1, y1):
+            for idx in self._grid.get(key, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                word = self._words[idx]
+                if word.x1 >= x0 and word.x0 <= x1 and word.y1 >= y0 and word.y0 <= y1:
+                    out.append(word)
+        return out
+
+    def right_of(self, anchor: str, *, whole_block: bool = False, tolerance: float = 2.0) -> str:
+        """Text of the nearest word run to the right of ``anchor`` on the same row.
+
+        With ``whole_block`` the rest of that word's text block is returned as
+        well (one line per PDF line), which suits multi-line table cells.
+        """
+        for box in self.find(anchor):
+            width, _ = self._extent[box.page]
+            middle = (box.y0 + box.y1) / 2
+            candidates = [
+                w
+                for w in self.words_in(box.page, box.x1 + 0.1, box.y0 - tolerance, width, box.y1 + tolerance)
+                if w.x0 >= box.x1 and w.y0 - tolerance <= middle <= w.y1 + tolerance and w.line_key != box.line_key
+            ]
+            if not candidates:
+                continue
+            nearest = min(candidates, key=lambda w: w.x0)
+            if not whole_block:
+                line_words = self._lines[nearest.line_key]
+                return " ".join(w.text for w in line_words if w.x0 >= nearest.x0)
+            block_lines = sorted(
+                (key for key in self._lines if key[:2] == (nearest.page, nearest.block) and key[2] >= nearest.line),
+                key=lambda key: key[2],
+            )
+            return "\n".join(self._line_text(key) for key in block_lines)
+        return ""
+
+    def below(
+        self,
+        anchor: str,
+        *,
+        max_lines: int = 1,
+        max_gap: Optional[float] = None,
+        tolerance: float = 2.0,
+    ) -> str:
+        """Lines stacked under ``anchor`` whose words overlap its column.
+
+        Collection stops after ``max_lines`` lines or at the first vertical gap
+        wider than ``max_gap`` (default: twice the anchor height).
+        """
+        for box in self.find(anchor):
+            _, height = self._extent[box.page]
+            gap_limit = max_gap if max_gap is not None else 2 * (box.y1 - box.y0)
+            words = self.words_in(box.page, box.x0 - tolerance, box.y1, box.x1 + tolerance, height)
+            keys: Dict[LineKey, float] = {}
+            for word in words:
+                if word.y0 >= box.y1 - tolerance and word.line_key != box.line_key:
+                    keys[word.line_key] = min(keys.get(word.line_key, word.y0), word.y0)
+
+            collected: List[str] = []
+            bottom = box.y1
+            for key in sorted(keys, key=lambda k: keys[k]):
+                line_words = self._lines[key]
+                if keys[key] - bottom > gap_limit:
+                    break
+                collected.append(self._line_text(key))
+                bottom = max(w.y1 for w in line_words)
+                if len(collected) >= max_lines:
+                    break
+            if collected:
+                return "\n".join(collected)
+        return ""
+
+    # ---------------- internal helpers ----------------
+
+    def _line_text(self, key: LineKey) -> str:
+        return " ".join(w.text for w in self._lines[key])
+
+    def _cells(self, page: int, x0: float, y0: float, x1: float, y1: float) -> Iterator[Tuple[int, int, int]]:
+        for cx in range(int(x0 // self._cell), int(x1 // self._cell) + 1):
+            for cy in range(int(y0 // self._cell), int(y1 // self._cell) + 1):
+                yield page, cx, cy
+
+
+_CURRENT_LAYOUT: ContextVar[Optional[SpatialIndex]] = ContextVar("edo_current_layout", default=None)
+
+
+@contextmanager
+def layout_scope(layout: Optional[SpatialIndex]):
+    """Make ``layout`` visible to strategies (via current_layout) for the enclosed calls."""
+    token = _CURRENT_LAYOUT.set(layout)
+    try:
+        yield layout
+    finally:
+        _CURRENT_LAYOUT.reset(token)
+
+
+def current_layout() -> Optional[SpatialIndex]:
+    return _CURRENT_LAYOUT.get()
+
+
+def build_index(page_words: Sequence[Sequence[tuple]], *, cell_size: float = 64.0) -> SpatialIndex:
+    """Build an index from per-page ``(x0, y0, x1, y1, text, block, line, word)`` tuples."""
+    return SpatialIndex(
+        (
+            WordBox(page, w[0], w[1], w[2], w[3], w[4], w[5], w[6], w[7])
+            for page, words in enumerate(page_words)
+            for w in words
+        ),
+        cell_size=cell_size,
+    )
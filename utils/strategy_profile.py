@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+NO_TIER = "none"
+
+_current_strategy: ContextVar[Optional[str]] = ContextVar("current_strategy", default=None)
+_current_field: ContextVar[Optional["FieldTimer"]] = ContextVar("current_field", default=None)
+
+
+@dataclass
+class FieldStats:
+    calls: int = 0
+    seconds: float = 0.0
+    tiers: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class StrategyStats:
+    documents: int = 0
+    seconds: float = 0.0
+    fields: Dict[str, FieldStats] = field(default_factory=dict)
+
+
+class FieldTimer:
+    """Handed out by ``StrategyProfiler.field``; set ``tier`` to the lookup that produced the value."""
+
+    __slots__ = ("tier",)
+
+    def __init__(self) -> None:
+        self.tier = NO_TIER
+
+
+class StrategyProfiler:
+    """Opt-in timing of strategy extraction, per strategy and per field.
+
+    The BaseStrategy wrapper times every ``extract`` call under the strategy's
+    name and every ``_extract_<field>`` method as that field; carrier
+    templates time their fields the same way. Each field also records which
+    fallback tier produced it. ``report()`` aggregates over the run, most
+    expensive strategy first. When disabled every hook is a cheap no-op.
+
+    Worker processes have their own profiler; only in-process parsing is
+    aggregated here.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._stats: Dict[str, StrategyStats] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def strategy(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        token = _current_strategy.set(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_strategy.reset(token)
+            with self._lock:
+                stats = self._stats.setdefault(name, StrategyStats())
+                stats.documents += 1
+                stats.seconds += elapsed
+
+    @contextmanager
+    def field(self, name: str) -> Iterator[FieldTimer]:
+        timer = FieldTimer()
+        if not self.enabled:
+            yield timer
+            return
+        token = _current_field.set(timer)
+        started = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_field.reset(token)
+            self.record_field(name, timer.tier, elapsed)
+
+    def mark_tier(self, tier: str) -> None:
+        """Set the tier of the innermost field being timed; a no-op outside ``field``."""
+        timer = _current_field.get()
+        if timer is not None:
+            timer.tier = tier
+
+    def record_field(self, name: str, tier: str, seconds: float, strategy: Optional[str] = None) -> None:
+        strategy = strategy or _current_strategy.get() or "unknown"
+        with self._lock:
+            stats = self._stats.setdefault(strategy, StrategyStats())
+            entry = stats.fields.setdefault(name, FieldStats())
+            entry.calls += 1
+            entry.seconds += seconds
+            entry.tiers[tier] = entry.tiers.get(tier, 0) + 1
+
+    def report(self) -> Dict[str, Any]:
+        """Per-strategy totals (ms), slowest first, with per-field tier counts."""
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: item[1].seconds, reverse=True)
+            return {
+                name: {
+                    "documents": stats.documents,
+                    "total_ms": round(stats.seconds * 1000, 3),
+                    "mean_ms": round(stats.seconds * 1000 / stats.documents, 3) if stats.documents else 0.0,
+                    "fields": {
+                        field_name: {
+                            "calls": entry.calls,
+                            "total_ms": round(entry.seconds * 1000, 3),
+                            "tiers": dict(entry.tiers),
+                        }
+                        for field_name, entry in stats.fields.items()
+                    },
+                }
+                for name, stats in items
+            }
+
+    def dump(self, path: Path | str) -> Path:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(self.report(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return target
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+# Process-wide profiler used by BaseStrategy and the carrier templates.
+PROFILER = StrategyProfiler()
@@ -1,6 +1,8 @@
 import re
 from typing import Optional
 
+from utils.parsed_document import ParsedDocument
+
 class TextUtils:
     @staticmethod
     def collapse_spaces(s: str) -> str:
@@ -29,5 +31,8 @@ class TextUtils:
     @staticmethod
     def find_first_index(text: str, needle: str) -> Optional[int]:
         """返回 needle 首次出现的索引"""
+        if isinstance(text, ParsedDocument) and needle and text.upper_text is text and needle == needle.upper():
+            # 大写文档：直接查共享的锚点索引
+            return text.anchors.first(needle)
         i = (text or "").find(needle)
         return i if i >= 0 else None
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_SLOW_LANE = Path(".cache") / "slow_lane.json"
+
+
+class SlowLane:
+    """Image-only (scanned) Drive PDFs waiting for OCR, kept on disk.
+
+    The text workflow only detects scans; ``put`` records the file so an OCR
+    pass, in this process or a later one, can list them with ``pending`` and
+    drop each with ``done`` once it is read. Entries are keyed by Drive file
+    id, so a scan still sitting in the Input folder is not queued twice.
+    ``path=None`` keeps the queue in memory only.
+    """
+
+    def __init__(self, path: Path | str | None = DEFAULT_SLOW_LANE):
+        self._path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, str]] = self._load()
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def put(self, file_id: str, name: str) -> bool:
+        """Queue a scan; False when it was already queued."""
+        with self._lock:
+            if file_id in self._entries:
+                return False
+            self._entries[file_id] = {"id": file_id, "name": name, "queued_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            self._save()
+        return True
+
+    def pending(self) -> List[Dict[str, str]]:
+        """Queued scans, oldest first."""
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values()]
+
+    def done(self, file_id: str) -> bool:
+        """Drop a scan the OCR pass has handled; False when it was not queued."""
+        with self._lock:
+            if self._entries.pop(file_id, None) is None:
+                return False
+            self._save()
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------------- internal helpers ----------------
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if self._path is None or not self._path.exists():
+            return {}
+        try:
+            payload = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            print(f"[WARN] Unreadable slow lane {self._path}, starting empty: {exc}")
+            return {}
+        entries = payload.get("files") if isinstance(payload, dict) else None
+        return {entry["id"]: entry for entry in entries or [] if isinstance(entry, dict) and entry.get("id")}
+
+    def _save(self) -> None:
+        if self._path is None:
+            return
+        payload = {"files": list(self._entries.values())}
+        tmp_path: Optional[Path] = None
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self._path)
+        except OSError as exc:
+            # The entry stays queued in memory and in run_report["slow_lane_files"].
+            print(f"[WARN] Could not save the slow lane to {self._path}: {exc}")
@@ -1,56 +1,228 @@
 from __future__ import annotations
 
 import re
-from typing import List, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 from extractor.normalizer import Normalizer
-from extractor.strategy_factory import get_matching_strategy
+from extractor.segmenter import DocumentSegmenter, parse_segments
+from extractor.shadow import ShadowRunner
+from extractor.strategy_factory import StrategyFactory
+from extractor.template_cache import DEFAULT_TEMPLATE_CACHE, TemplateCache
 from google_base.GoogleDrive.DriveApp import DriveApp, DriveFile
 from reader.pdf_reader import PDFReader
+from utils.memory_profile import MemoryProfiler
+from utils.regex_guard import RegexGuard
+from utils.strategy_profile import PROFILER
+from workflow.slow_lane import DEFAULT_SLOW_LANE, SlowLane
 
 
 class WorkflowManager:
     """EDO workflow implemented purely with DriveApp (no local file handling)."""
 
-    def __init__(self, source: Optional[str] = None, *, verbose: bool = True):
+    # Seconds run() waits at the end for shadow strategies still running.
+    SHADOW_DRAIN_TIMEOUT = 30.0
+
+    def __init__(
+        self,
+        source: Optional[str] = None,
+        *,
+        verbose: bool = True,
+        parse_workers: int = 0,
+        layout_lookup: bool = False,
+        memory_profile: bool = False,
+        min_confidence: Optional[float] = None,
+        template_cache: bool = False,
+        strategy_profile: bool = False,
+        regex_budget_ms: Optional[float] = None,
+        hot_reload: bool = False,
+        shadow: Optional[Dict[str, str]] = None,
+        shadow_rate: float = 0.1,
+        slow_lane_path: Path | str | None = DEFAULT_SLOW_LANE,
+    ):
         """
         Args:
             source: Optional Google Drive folder (URL, gdrive://ID, or raw ID).
                 When omitted the default Input folder from GoogleConfig is used.
             verbose: Whether to print progress logs.
+            parse_workers: Worker processes used to parse the segments of
+                merged PDFs, and to extract the pages of large PDFs, in
+                parallel; 0 or 1 does both in-process.
+            layout_lookup: Also build a word-level spatial index per PDF so
+                strategies can look fields up by position next to their labels.
+            memory_profile: Trace allocations (tracemalloc) and record the peak
+                per document and per stage plus top allocation sites in
+                ``run_report["memory"]``. Slows the run noticeably.
+            min_confidence: Pick strategies by score instead of registry
+                order; documents scoring below this confidence are verified
+                by extracting with the runner-up too.
+            template_cache: Remember each layout's winning strategy
+                (``.cache/templates.json``) so repeat templates skip strategy
+                selection; a layout seen for the first time, or whose
+                remembered carrier's keywords are missing, is selected as usual.
+            strategy_profile: Time every strategy and field extraction and
+                count which fallback tier produced each field; the aggregate
+                lands in ``run_report["strategies"]``. Parsing done in
+                ``parse_workers`` processes is not included.
+            regex_budget_ms: Run unanchored regex searches in bounded windows
+                with this time budget per call, so one pathological document
+                cannot stall the run; patterns that came near the budget are
+                listed in ``run_report["regex"]``.
+            hot_reload: Before each file, reload carrier modules whose source
+                changed (StrategyFactory.reload_changed). Documents already
+                being parsed finish on the previous version; a module that
+                fails to load leaves the previous version in place.
+                ``parse_workers`` processes keep the version they started
+                with.
+            shadow: Carrier name -> candidate strategy
+                ("package.module:ClassName") to run as its shadow
+                (see StrategyFactory.set_shadow). The carrier's output is
+                what gets written; on ``shadow_rate`` of its documents the
+                candidate also runs in a background process, and agreement
+                and latency of both land in ``run_report["shadow"]``. The
+                shadows are installed only while run() runs and their
+                process is shut down by close(). Segments parsed in
+                ``parse_workers`` processes are not shadowed.
+            slow_lane_path: JSON file where image-only (scanned) PDFs are
+                queued for an OCR pass (see SlowLane); None keeps the queue
+                in memory only.
         """
-        self.reader = PDFReader()
+        self.memory = MemoryProfiler(enabled=memory_profile)
+        self.strategy_profile = strategy_profile
+        self.regex_guard = RegexGuard(regex_budget_ms) if regex_budget_ms else None
+        self.hot_reload = hot_reload
+        self.shadow: Optional[ShadowRunner] = ShadowRunner() if shadow else None
+        for carrier, target in (shadow or {}).items():
+            if StrategyFactory.named(carrier) is None:
+                raise ValueError(f"Unknown carrier '{carrier}'")
+            self.shadow.add(carrier, target, shadow_rate)
+        self._parse_executor: Optional[Executor] = (
+            ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 1 else None
+        )
+        # Page chunks of large PDFs run in the same pool (or in-process), so
+        # parse_workers bounds every worker process the workflow starts.
+        self.reader = PDFReader(
+            executor=self._parse_executor,
+            max_workers=max(parse_workers, 1),
+            memory_profiler=self.memory,
+        )
+        self.segmenter = DocumentSegmenter()
         self.drive_app = DriveApp()
         self.verbose = verbose
+        self.layout_lookup = layout_lookup
+        self.min_confidence = min_confidence
+        self.template_cache = TemplateCache(DEFAULT_TEMPLATE_CACHE) if template_cache else None
         self._source_folder_id = self._normalize_source(source)
+        # Image-only (scanned) PDFs are parked here for a separate OCR pass
+        # instead of being decoded and parsed alongside text PDFs.
+        self.slow_lane = SlowLane(slow_lane_path)
+        # Summary of the last run() (counts, optional memory profile).
+        self.run_report: Dict[str, Any] = {}
 
     def run(self) -> None:
         files = self._list_source_files()
         results = []
-        for drive_file in files:
-            data = self.drive_app.download_file_bytes(drive_file.id)
-            newName, result = self.process_file(drive_file, data)
-            if self.verbose:
-                if newName:
-                    print(f"[OK] {drive_file.name} -> {newName}")
-                    results.append(result)
-                else:
-                    print(f"[SKIP] {drive_file.name}")
-                    
+        self.run_report = {"files": len(files), "slow_lane": 0, "slow_lane_files": []}
+        self.memory.start()
+        if self.strategy_profile:
+            PROFILER.reset()
+            PROFILER.enabled = True
+        if self.regex_guard is not None:
+            self.regex_guard.reset()
+        previous_shadow = None
+        if self.shadow is not None:
+            self.shadow.reset()
+            previous_shadow = StrategyFactory.install_shadow(self.shadow)
+        try:
+            for drive_file in files:
+                if self.hot_reload:
+                    self._reload_strategies()
+                with self.memory.document(drive_file.name):
+                    with self.memory.stage("download"):
+                        data = self.drive_app.download_file_bytes(drive_file.id)
+                    if self.reader.is_image_only_bytes(data):
+                        self.slow_lane.put(drive_file.id, drive_file.name)
+                        self.run_report["slow_lane"] += 1
+                        self.run_report["slow_lane_files"].append({"id": drive_file.id, "name": drive_file.name})
+                        if self.verbose:
+                            print(f"[SLOW] {drive_file.name} has no text layer, queued for OCR")
+                        continue
+                    newName, result = self.process_file(drive_file, data)
+                if self.verbose:
+                    if newName:
+                        print(f"[OK] {drive_file.name} -> {newName}")
+                        results.append(result)
+                    else:
+                        print(f"[SKIP] {drive_file.name}")
+        finally:
+            if self.verbose and len(self.slow_lane):
+                print(f"[SLOW] {len(self.slow_lane)} scanned PDF(s) waiting for OCR in {self.slow_lane.path or 'memory'}")
+            if self.strategy_profile:
+                PROFILER.enabled = False
+                self.run_report["strategies"] = PROFILER.report()
+            if self.regex_guard is not None:
+                regex = self.regex_guard.report()
+                self.run_report["regex"] = regex
+                if self.verbose:
+                    for pattern, usage in regex["patterns"].items():
+                        if usage["exhausted"]:
+                            print(f"[WARN] regex budget exhausted {usage['exhausted']}x: {pattern[:60]}")
+            if self.shadow is not None:
+                StrategyFactory.install_shadow(previous_shadow)
+                self._report_shadow()
+            self.reader.close()
+            memory = self.memory.report()
+            self.memory.stop()
+            if memory:
+                self.run_report["memory"] = memory
+                if self.verbose:
+                    print(
+                        f"[MEM] max document peak {memory['max_document_peak_bytes'] / 1024:.0f} KiB; "
+                        + ", ".join(f"{k} {v / 1024:.0f} KiB" for k, v in memory["stage_peak_bytes"].items())
+                    )
+
         return results
 
+    def close(self) -> None:
+        """Shut down the worker pools (parse workers, PDF page workers, shadow workers)."""
+        self.reader.close()
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown()
+            self._parse_executor = None
+        if self.shadow is not None:
+            self.shadow.close()
+
+    def __enter__(self) -> "WorkflowManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def process_file(self, drive_file: DriveFile, data: bytes) -> Optional[str]:
         """Process a single Drive PDF and return the new remote name if moved."""
-        text = self.reader.read_bytes(data)
-        if not text:
+        pages = self.reader.read_pages_bytes(data)
+        if not "\n".join(pages).strip():
             return None
 
-        strategy = get_matching_strategy(text)
-        records = strategy.extract(text)
+        # Merged bundles are split per EDO; a single document yields one segment.
+        with self.memory.stage("segment"):
+            segments = self.segmenter.split(pages)
+        layout = self.reader.read_layout_bytes(data) if self.layout_lookup else None
+        with self.memory.stage("parse"):
+            records = parse_segments(
+                segments,
+                executor=self._parse_executor,
+                layout=layout,
+                min_confidence=self.min_confidence,
+                template_cache=self.template_cache,
+                regex_guard=self.regex_guard,
+            )
         if not records:
             return None
 
-        normalized = Normalizer.apply(records)
+        with self.memory.stage("normalize"):
+            normalized = Normalizer.apply(records)
         preview_link = self._build_perview_link(drive_file.id)
         for entry in normalized:
             entry["Perview Link"] = preview_link
@@ -64,7 +236,8 @@ class WorkflowManager:
             return None
 
         newName = f"{'_'.join(containers)}.pdf"
-        success = self._move_to_output(drive_file.id, newName)
+        with self.memory.stage("move"):
+            success = self._move_to_output(drive_file.id, newName)
         if success:
             return newName, normalized
 
@@ -76,6 +249,38 @@ class WorkflowManager:
 
     # ---------- helpers ----------
 
+    def _report_shadow(self) -> None:
+        # Shadow runs still queued finish off the per-file path, here.
+        if not self.shadow.drain(timeout=self.SHADOW_DRAIN_TIMEOUT) and self.verbose:
+            print("[WARN] shadow strategies still running; their results are not in the report")
+        shadow = self.shadow.report()
+        self.run_report["shadow"] = shadow
+        if self.verbose:
+            for carrier, stats in shadow["carriers"].items():
+                latency = (
+                    f"primary {stats['primary_mean_ms']} ms, shadow {stats['shadow_mean_ms']} ms CPU"
+                    if stats["timed"]
+                    else "latency not timed"
+                )
+                print(
+                    f"[SHADOW] {carrier} vs {stats['target']}: "
+                    f"{stats['identical']}/{stats['completed']} identical, {stats['errors']} errors, {latency}"
+                )
+
+    def _reload_strategies(self) -> None:
+        try:
+            reloaded = StrategyFactory.reload_changed()
+        except Exception as exc:
+            print(f"[ERROR] Strategy reload failed, keeping v{StrategyFactory.version()}: {exc}")
+            return
+        if reloaded is None:
+            return
+        version, names = reloaded
+        print(f"[OK] Strategies reloaded (v{version}): {', '.join(names) or 'manifest'}")
+        # Routes learned from the old code would hide the fix.
+        if names and self.template_cache is not None:
+            self.template_cache.forget(names)
+
     def _list_source_files(self) -> List[DriveFile]:
         if self._source_folder_id:
             return self.drive_app.list_files_in_folder(